@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+AdvancedCache microbenchmark: ops/sec at 1k, 100k and 1M entries.
+
+Each size is pre-filled to capacity, then 32 threads run a 90% get / 10% set
+mix over a key space twice the capacity, so half the sets evict. The
+sharded cache is compared with a reproduction of the previous design (one
+RLock, O(n) min() over access times on every eviction); the old design is
+only run up to --legacy-max entries because its evictions scan the whole
+cache.
+
+Usage: python benchmarks/advanced_cache.py [--sizes 1000,100000,1000000] [--threads 32]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.mkdtemp(prefix="hexstrike-bench-")
+os.environ.setdefault("HEXSTRIKE_PERSISTENT_CACHE", "0")
+os.environ.setdefault("HEXSTRIKE_DB_PATH", os.path.join(_tmp, "state.db"))
+os.environ.setdefault("HEXSTRIKE_PROXY_HISTORY_DB", os.path.join(_tmp, "proxy_history.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.INFO)
+
+from hexstrike_server import AdvancedCache  # noqa: E402
+
+
+class LegacyCache:
+    """The global-lock cache with O(n) LRU eviction that AdvancedCache replaced"""
+
+    def __init__(self, max_size: int, default_ttl: int = 3600):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.cache, self.access_times, self.ttl_times = {}, {}, {}
+        self.cache_lock = threading.RLock()
+
+    def get(self, key):
+        with self.cache_lock:
+            now = time.time()
+            if key in self.cache and self.ttl_times[key] > now:
+                self.access_times[key] = now
+                return self.cache[key]
+            return None
+
+    def set(self, key, value, ttl=None):
+        with self.cache_lock:
+            now = time.time()
+            if len(self.cache) >= self.max_size and key not in self.cache:
+                lru_key = min(self.access_times, key=self.access_times.get)
+                for table in (self.cache, self.access_times, self.ttl_times):
+                    del table[lru_key]
+            self.cache[key] = value
+            self.access_times[key] = now
+            self.ttl_times[key] = now + (ttl or self.default_ttl)
+
+
+def fill(cache, size: int):
+    for i in range(size):
+        cache.set(f"key-{i}", i)
+
+
+def run(cache, size: int, threads: int, ops_per_thread: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [f"key-{rng.randrange(2 * size)}" for _ in range(1024)]
+        barrier.wait()
+        for i in range(ops_per_thread):
+            key = keys[i & 1023]
+            if i % 10 == 0:
+                cache.set(key, i)
+            else:
+                cache.get(key)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops_per_thread / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--legacy-max", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'entries':>10}{'threads':>9}{'sharded ops/s':>16}{'legacy ops/s':>15}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        cache = AdvancedCache(max_size=size)
+        fill(cache, size)
+        sharded = run(cache, size, args.threads, args.ops)
+        legacy = "skipped"
+        if size <= args.legacy_max:
+            old = LegacyCache(size)
+            fill(old, size)
+            # Each legacy eviction scans every entry; fewer ops keep the run short
+            legacy = f"{run(old, size, args.threads, max(100, args.ops * 1000 // size)):,.0f}"
+        print(f"{size:>10,}{args.threads:>9}{sharded:>16,.0f}{legacy:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+HexStrikeDatabase throughput: add_vulnerability / get_vulnerabilities.
+
+Runs the same workload with 1, 8 and 32 threads against the current
+per-thread connections (WAL, synchronous=NORMAL, sized cache, mmap,
+statement cache) and against a reproduction of the previous
+connection-per-call setup in rollback-journal mode. Each thread inserts
+findings into its own project, then reads that project's list back.
+
+Usage: python benchmarks/database_connections.py [--threads 1,8,32] [--writes 200] [--reads 50]
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.INFO)
+
+from hexstrike_database import HexStrikeDatabase  # noqa: E402
+
+
+class LegacyDatabase(HexStrikeDatabase):
+    """Connection per call with default pragmas, as before connection reuse"""
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def run(db: HexStrikeDatabase, threads: int, writes: int, reads: int) -> dict:
+    projects = [db.create_project(f"bench-{threads}-{i}") for i in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    phase_done = threading.Barrier(threads + 1)
+
+    def worker(project_id):
+        barrier.wait()
+        for i in range(writes):
+            db.add_vulnerability(None, project_id, f"Finding {i}", severity="high",
+                                 location=f"https://example.com/{i}", discovered_by="bench")
+        phase_done.wait()
+        for _ in range(reads):
+            db.get_vulnerabilities(project_id=project_id)
+
+    workers = [threading.Thread(target=worker, args=(project_id,)) for project_id in projects]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    phase_done.wait()
+    write_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    read_seconds = time.perf_counter() - started
+    return {"writes": threads * writes / write_seconds, "reads": threads * reads / read_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", default="1,8,32")
+    parser.add_argument("--writes", type=int, default=200, help="add_vulnerability calls per thread")
+    parser.add_argument("--reads", type=int, default=50, help="get_vulnerabilities calls per thread")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="hexstrike-bench-")
+    print(f"{'setup':<10}{'threads':>8}{'writes/s':>12}{'reads/s':>12}")
+    for threads in (int(value) for value in args.threads.split(",")):
+        for name, cls in (("legacy", LegacyDatabase), ("current", HexStrikeDatabase)):
+            db = cls(os.path.join(directory, f"{name}-{threads}.db"))
+            result = run(db, threads, args.writes, args.reads)
+            print(f"{name:<10}{threads:>8}{result['writes']:>12,.0f}{result['reads']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
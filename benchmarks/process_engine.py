@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Process engine benchmark: thread count and latency under concurrent commands.
+
+Runs the same short command (five lines over ~0.5 s) from 50, 200 and 500
+concurrent callers, once through EnhancedCommandExecutor (shared asyncio
+process engine) and once through a reproduction of the previous executor
+(Popen plus stdout, stderr and progress threads per command). Reports the
+peak thread count of the process and p50/p99 command latency.
+
+Usage: python benchmarks/process_engine.py [--levels 50,200,500] [--command CMD]
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.mkdtemp(prefix="hexstrike-bench-")
+os.environ.setdefault("HEXSTRIKE_PERSISTENT_CACHE", "0")
+os.environ.setdefault("HEXSTRIKE_DB_PATH", os.path.join(_tmp, "state.db"))
+os.environ.setdefault("HEXSTRIKE_PROXY_HISTORY_DB", os.path.join(_tmp, "proxy_history.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.INFO)
+
+from hexstrike_server import EnhancedCommandExecutor  # noqa: E402
+
+DEFAULT_COMMAND = "for i in 1 2 3 4 5; do echo line $i; sleep 0.1; done"
+
+
+def legacy_execute(command: str, timeout: float = 300) -> dict:
+    """The thread-per-stream executor the asyncio engine replaced"""
+    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, bufsize=1)
+    output = {"stdout": "", "stderr": ""}
+
+    def read(stream, name):
+        for line in iter(stream.readline, ""):
+            output[name] += line
+
+    def progress():
+        while process.poll() is None:
+            time.sleep(0.8)
+
+    threads = [threading.Thread(target=read, args=(process.stdout, "stdout"), daemon=True),
+               threading.Thread(target=read, args=(process.stderr, "stderr"), daemon=True),
+               threading.Thread(target=progress, daemon=True)]
+    for thread in threads:
+        thread.start()
+    return_code = process.wait(timeout=timeout)
+    threads[0].join(timeout=1)
+    threads[1].join(timeout=1)
+    return {"return_code": return_code, **output}
+
+
+def engine_execute(command: str) -> dict:
+    return EnhancedCommandExecutor(command).execute()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_level(execute, command: str, concurrency: int) -> dict:
+    baseline = threading.active_count()
+    latencies, peak = [], {"threads": baseline}
+    barrier = threading.Barrier(concurrency + 1)
+    done = threading.Event()
+
+    def caller():
+        barrier.wait()
+        started = time.perf_counter()
+        execute(command)
+        latencies.append(time.perf_counter() - started)
+
+    def monitor():
+        while not done.is_set():
+            peak["threads"] = max(peak["threads"], threading.active_count())
+            time.sleep(0.01)
+
+    callers = [threading.Thread(target=caller) for _ in range(concurrency)]
+    for thread in callers:
+        thread.start()
+    watcher = threading.Thread(target=monitor)
+    watcher.start()
+    started = time.perf_counter()
+    barrier.wait()
+    for thread in callers:
+        thread.join()
+    wall = time.perf_counter() - started
+    done.set()
+    watcher.join()
+    # Callers and the monitor exist in both variants; report what the executor adds on top
+    return {"peak_threads": peak["threads"], "executor_threads": peak["threads"] - baseline - concurrency - 1,
+            "p50": percentile(latencies, 0.5), "p99": percentile(latencies, 0.99), "wall": wall}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", default="50,200,500")
+    parser.add_argument("--command", default=DEFAULT_COMMAND)
+    args = parser.parse_args()
+
+    engine_execute("true")  # start the engine loop outside the measurements
+    print(f"{'executor':<10}{'callers':>8}{'peak thr':>10}{'extra thr':>11}{'p50 s':>8}{'p99 s':>8}{'wall s':>8}")
+    for level in (int(value) for value in args.levels.split(",")):
+        for name, execute in (("threads", legacy_execute), ("asyncio", engine_execute)):
+            result = run_level(execute, args.command, level)
+            print(f"{name:<10}{level:>8}{result['peak_threads']:>10}{result['executor_threads']:>11}"
+                  f"{result['p50']:>8.3f}{result['p99']:>8.3f}{result['wall']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Spider crawl benchmark against a synthetic local site.
+
+A child process serves a tree of N HTML pages (each links to its children,
+its parent and the root, and every tenth page carries a form); the crawler
+runs against it in this process and reports pages/s and peak RSS.
+
+Usage: python benchmarks/spider.py [--pages 50000] [--concurrency 16]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="hexstrike-bench-")
+os.environ.setdefault("HEXSTRIKE_PERSISTENT_CACHE", "0")
+os.environ.setdefault("HEXSTRIKE_DB_PATH", os.path.join(_tmp, "state.db"))
+os.environ.setdefault("HEXSTRIKE_PROXY_HISTORY_DB", os.path.join(_tmp, "proxy_history.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.INFO)
+
+import asyncio  # noqa: E402
+
+import requests  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+from hexstrike_server import SpiderEngine, lxml_html  # noqa: E402
+
+FANOUT = 10
+FILLER = "<p>" + "lorem ipsum dolor sit amet " * 40 + "</p>"
+
+
+def render(page: int, total: int) -> str:
+    children = range(page * FANOUT + 1, min(page * FANOUT + FANOUT, total - 1) + 1)
+    links = "".join(f'<a href="/p/{child}?ref={page}">page {child}</a>' for child in children)
+    links += f'<a href="/p/{max(0, (page - 1) // FANOUT)}">up</a><a href="/">home</a>'
+    form = ""
+    if page % 10 == 0:
+        form = f'<form action="/search/{page}" method="post"><input name="q"><input type="hidden" name="t" value="{page}"></form>'
+    return f"<html><head><title>{page}</title></head><body>{links}{FILLER}{form}</body></html>"
+
+
+def serve(port: int, total: int):
+    async def handler(request):
+        raw = request.match_info.get("page", "0")
+        page = int(raw) if raw.isdigit() else -1
+        if not 0 <= page < total:
+            raise web.HTTPNotFound()
+        return web.Response(text=render(page, total), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    app.router.add_get("/p/{page}", handler)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, handle_signals=False, access_log=None)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port: int, timeout: float = 10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("benchmark server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--depth", type=int, default=10)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, args.pages), daemon=True)
+    server.start()
+    try:
+        wait_for(port)
+        engine = SpiderEngine({"User-Agent": "hexstrike-bench"}, requests.cookies.RequestsCookieJar(),
+                              concurrency=args.concurrency, per_host=args.concurrency)
+        result = asyncio.run(engine.crawl(f"http://127.0.0.1:{port}/", args.depth, args.pages))
+    finally:
+        server.terminate()
+        server.join()
+
+    stats = result["stats"]
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"parser: {'lxml' if lxml_html is not None else 'html.parser'}, concurrency: {args.concurrency}")
+    print(f"pages: {result['total_pages']}, forms: {len(result['forms'])}, errors: {stats['errors']}")
+    print(f"elapsed: {stats['elapsed_seconds']:.1f}s, {stats['pages_per_second']:.1f} pages/s, peak RSS {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,26 +14,48 @@ Version: 6.0.0
 
 import sqlite3
 import json
+import hashlib
+import base64
 import os
 import logging
 import shutil
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import gzip
+import glob
+import threading
+import queue
+import time
+import atexit
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterable
+from itertools import islice
 from contextlib import contextmanager
 from pathlib import Path
 
+# Optional: fcntl serializes backups across worker processes (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Default database path (relative to script directory)
 DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hexstrike_data.db")
 
+# Connection tuning (per-thread connections are reused for the life of the thread)
+SQLITE_BUSY_TIMEOUT = 5.0  # seconds to wait on a locked database
+SQLITE_CACHE_SIZE_KB = int(os.environ.get("HEXSTRIKE_DB_CACHE_KB", 16 * 1024))  # page cache per connection
+SQLITE_MMAP_SIZE = int(os.environ.get("HEXSTRIKE_DB_MMAP_BYTES", 256 * 1024 * 1024))
+SQLITE_CACHED_STATEMENTS = 256  # prepared statements kept per connection
+
 # Valid table names for stats query (whitelist for security)
-VALID_TABLES = {'users', 'projects', 'scans', 'vulnerabilities', 'settings', 'audit_log', 'schema_version'}
+VALID_TABLES = {'users', 'projects', 'scans', 'vulnerabilities', 'settings', 'audit_log', 'schema_version',
+                'tool_output'}
 
 # Current schema version - increment this when making schema changes
 # This allows the database to only reinitialize when there are actual schema changes
-CURRENT_SCHEMA_VERSION = 1
+CURRENT_SCHEMA_VERSION = 6
 
 # Vulnerability status constants
 VULN_STATUS_NEW = 'new'
@@ -42,6 +64,307 @@ VULN_STATUS_FALSE_POSITIVE = 'false_positive'
 VULN_STATUS_REMEDIATED = 'remediated'
 VULN_STATUSES_REQUIRING_VERIFICATION = {VULN_STATUS_CONFIRMED, VULN_STATUS_FALSE_POSITIVE, VULN_STATUS_REMEDIATED}
 
+# Default and maximum page sizes for keyset-paginated list methods
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Sort keys of the paginated list queries. Every column is ordered DESC and ends
+# in the primary key so a page boundary is a single row-value comparison; the
+# expressions must match the migration 4 indexes exactly for SQLite to use them.
+VULN_SORT_KEY = ('IFNULL(cvss_score, -1.0)', 'discovered_at', 'id')
+SCAN_SORT_KEY = ('created_at', 'id')
+AUDIT_SORT_KEY = ('created_at', 'id')
+
+# Sort keys of the API document lists (migration 6 indexes): scans newest first,
+# vulnerabilities most severe first, then oldest discovery first
+SEVERITY_RANK_SQL = ("CASE severity WHEN 'critical' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 "
+                     "WHEN 'low' THEN 3 WHEN 'info' THEN 4 ELSE 5 END")
+SEVERITY_RANKS = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'info': 4}
+SCAN_DOCUMENT_SORT_KEY = ("IFNULL(started_at, '')", 'external_id')
+VULN_DOCUMENT_SORT_KEY = (SEVERITY_RANK_SQL, "IFNULL(json_extract(data, '$.discoveredAt'), '')", 'external_id')
+DOCUMENT_FILTER = 'external_id IS NOT NULL'
+
+# Full-text search: indexed columns (in FTS table order) and their bm25 weights
+VULN_SEARCH_COLUMNS = ('title', 'description', 'proof_of_concept', 'cve_id', 'location')
+VULN_SEARCH_WEIGHTS = (10.0, 4.0, 2.0, 8.0, 6.0)
+TOOL_OUTPUT_SEARCH_COLUMNS = ('tool', 'command', 'content')
+TOOL_OUTPUT_SEARCH_WEIGHTS = (2.0, 4.0, 1.0)
+SEARCH_KINDS = ('vulnerabilities', 'tool_output')
+TOOL_OUTPUT_CHUNK_BYTES = 32 * 1024  # stored output is split into chunks of about this size
+SEARCH_SNIPPET_MARKERS = ('«', '»')
+SEARCH_SNIPPET_TOKENS = 16
+
+# Audit log group commit: events are queued and written in one transaction per
+# AUDIT_FLUSH_INTERVAL or AUDIT_FLUSH_BATCH events, whichever comes first
+AUDIT_QUEUE_SIZE = int(os.environ.get("HEXSTRIKE_AUDIT_QUEUE_SIZE", 10000))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("HEXSTRIKE_AUDIT_FLUSH_MS", 50)) / 1000
+AUDIT_FLUSH_BATCH = 500
+AUDIT_ENQUEUE_TIMEOUT = 2.0  # seconds a producer blocks on a full queue before writing inline
+AUDIT_WRITE_RETRIES = 3  # attempts at a batch that hit a locked/busy database
+AUDIT_RETRY_BACKOFF = 0.05  # seconds before the first retry, doubled each time
+
+# Online backups copy BACKUP_PAGES_PER_STEP pages at a time and pause between
+# steps so the server keeps its I/O; a backup restarted more than
+# BACKUP_MAX_RESTARTS times by concurrent writes is finished in a single step
+BACKUP_PAGES_PER_STEP = int(os.environ.get("HEXSTRIKE_BACKUP_PAGES_PER_STEP", 256))
+BACKUP_STEP_SLEEP = float(os.environ.get("HEXSTRIKE_BACKUP_STEP_SLEEP_MS", 10)) / 1000
+BACKUP_MAX_RESTARTS = 3
+BACKUP_COPY_CHUNK = 1024 * 1024  # bytes per read when compressing a backup
+BACKUP_GZIP_LEVEL = 6
+BACKUP_STATUS_INTERVAL = 1.0  # seconds between progress writes to the shared status file
+
+# Default number of rows per transaction for bulk operations
+BULK_BATCH_SIZE = 1000
+
+# Columns accepted by add_vulnerability / add_vulnerabilities_bulk
+VULN_INSERT_COLUMNS = ('scan_id', 'project_id', 'title', 'description', 'severity', 'cvss_score',
+                       'cve_id', 'cwe_id', 'location', 'proof_of_concept', 'discovered_by')
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque page cursor holding the sort key of the last row returned."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """Decode a page cursor; raises ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor: wrong sort key length")
+    if not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values):
+        raise ValueError("Invalid cursor: sort key values must be strings or numbers")
+    return values
+
+
+def chunk_text(text: str, chunk_bytes: int = TOOL_OUTPUT_CHUNK_BYTES) -> List[str]:
+    """Split text into chunks of roughly chunk_bytes, breaking at line ends where possible."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_bytes
+        if end < len(text):
+            newline = text.rfind('\n', start, end)
+            if newline > start:
+                end = newline + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query: every whitespace separated term must match.
+    
+    Terms are quoted so punctuation in hostnames, CVE IDs or tokens is matched
+    as a phrase rather than parsed as query syntax; a trailing * keeps prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*') and len(term) > 1
+        term = term.rstrip('*') if prefix else term
+        terms.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    if not terms:
+        raise ValueError("Empty search query")
+    return ' '.join(terms)
+
+
+def vulnerability_fingerprint(finding: Dict[str, Any]) -> str:
+    """
+    Stable identity of a finding, used to skip duplicates on re-ingestion.
+    
+    Two findings match when they share project, title, location, CVE and CWE;
+    an explicit 'fingerprint' key in the finding wins.
+    """
+    if finding.get('fingerprint'):
+        return finding['fingerprint']
+    parts = [str(finding.get(key) or '').strip().lower()
+             for key in ('project_id', 'title', 'location', 'cve_id', 'cwe_id')]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class AuditLogWriter:
+    """
+    Background writer that group-commits audit events.
+    
+    Producers enqueue rows into a bounded queue; a single thread drains it and
+    inserts each batch in one transaction. When the queue is full producers
+    block (backpressure) and, after AUDIT_ENQUEUE_TIMEOUT, write their event
+    inline so no audit record is dropped. A batch that hits a locked database
+    is retried with backoff; one that still fails is written row by row so a
+    single bad row only loses itself. Pending events are flushed on close and
+    at interpreter exit.
+    """
+    
+    INSERT_SQL = '''
+        INSERT INTO audit_log (user_id, action, resource_type, resource_id, details, ip_address, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    def __init__(self, db: 'HexStrikeDatabase', max_queue: int = AUDIT_QUEUE_SIZE,
+                 flush_interval: float = AUDIT_FLUSH_INTERVAL, batch_size: int = AUDIT_FLUSH_BATCH):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0, 'written': 0, 'batches': 0, 'write_errors': 0,
+            'write_retries': 0, 'row_fallbacks': 0, 'dropped': 0,
+            'backpressure_waits': 0, 'inline_writes': 0, 'max_queue_depth': 0,
+            'flush_seconds_total': 0.0, 'last_flush_ms': 0.0, 'max_flush_ms': 0.0,
+        }
+        self._closed = False
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='hexstrike-audit-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, row: tuple):
+        """Queue one audit row, blocking while the queue is full."""
+        if self._closed:
+            self._write_inline(row)
+            return
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['backpressure_waits'] += 1
+            try:
+                self._queue.put(row, timeout=AUDIT_ENQUEUE_TIMEOUT)
+            except queue.Full:
+                self._write_inline(row)
+                return
+        with self._stats_lock:
+            self._stats['enqueued'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+    
+    def _write_inline(self, row: tuple):
+        with self.db.get_connection() as conn:
+            conn.execute(self.INSERT_SQL, row)
+        with self._stats_lock:
+            self._stats['inline_writes'] += 1
+    
+    def _write_batch(self, rows: List[tuple]):
+        started = time.perf_counter()
+        try:
+            for attempt in range(AUDIT_WRITE_RETRIES + 1):
+                try:
+                    with self.db.get_connection() as conn:
+                        conn.executemany(self.INSERT_SQL, rows)
+                    break
+                except sqlite3.OperationalError as e:
+                    # Locked/busy databases usually clear; anything else goes row by row
+                    if attempt == AUDIT_WRITE_RETRIES or 'locked' not in str(e) and 'busy' not in str(e):
+                        self._write_rows(rows, e)
+                        return
+                    with self._stats_lock:
+                        self._stats['write_retries'] += 1
+                    time.sleep(AUDIT_RETRY_BACKOFF * (2 ** attempt))
+                except Exception as e:
+                    self._write_rows(rows, e)
+                    return
+        finally:
+            for _ in rows:
+                self._queue.task_done()
+        
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._stats['written'] += len(rows)
+            self._stats['batches'] += 1
+            self._stats['flush_seconds_total'] += elapsed
+            self._stats['last_flush_ms'] = round(elapsed * 1000, 3)
+            self._stats['max_flush_ms'] = max(self._stats['max_flush_ms'], self._stats['last_flush_ms'])
+    
+    def _write_rows(self, rows: List[tuple], error: Exception):
+        """Insert a failed batch one row at a time, dropping only rows that fail."""
+        logger.error(f"💥 Audit log batch of {len(rows)} events failed, writing row by row: {error}")
+        written = dropped = 0
+        for row in rows:
+            try:
+                with self.db.get_connection() as conn:
+                    conn.execute(self.INSERT_SQL, row)
+                written += 1
+            except Exception as e:
+                dropped += 1
+                logger.error(f"💥 Audit event {row[1]!r} dropped: {e}")
+        with self._stats_lock:
+            self._stats['write_errors'] += 1
+            self._stats['row_fallbacks'] += 1
+            self._stats['written'] += written
+            self._stats['dropped'] += dropped
+    
+    def _run(self):
+        while True:
+            row = self._queue.get()
+            if row is None:
+                self._queue.task_done()
+                break
+            
+            # Collect more events until the batch is full or the window closes
+            rows = [row]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    row = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is None:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                rows.append(row)
+            
+            self._write_batch(rows)
+            if stop:
+                break
+        self.db.close()
+    
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued event is committed.
+        
+        Returns:
+            False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self, timeout: float = 10.0):
+        """Flush pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.pid == os.getpid() and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                logger.warning("⚠️  Audit writer queue still full at shutdown")
+                return
+            self._thread.join(timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and flush latency metrics."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats['batches']
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['avg_batch_size'] = round(stats['written'] / batches, 1) if batches else 0
+        stats['avg_flush_ms'] = round(stats.pop('flush_seconds_total') * 1000 / batches, 3) if batches else 0
+        stats['running'] = self._thread.is_alive()
+        return stats
+
 
 class HexStrikeDatabase:
     """
@@ -62,6 +385,14 @@ class HexStrikeDatabase:
             db_path: Path to the SQLite database file. Defaults to hexstrike_data.db
         """
         self.db_path = db_path or DEFAULT_DB_PATH
+        self._local = threading.local()
+        self._audit_writer: Optional[AuditLogWriter] = None
+        self._audit_writer_lock = threading.Lock()
+        self._backup_lock = threading.Lock()
+        self._backup_lock_fd: Optional[int] = None
+        self._backup_status: Dict[str, Any] = {'state': 'idle'}
+        self._backup_status_written = 0.0
+        self._backup_schedule: Optional[threading.Event] = None
         self._ensure_db_directory()
         self._initialize_database()
         logger.info(f"🗄️  Database initialized at: {self.db_path}")
@@ -72,23 +403,54 @@ class HexStrikeDatabase:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir, exist_ok=True)
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and tune a new connection for the calling thread."""
+        conn = sqlite3.connect(self.db_path, timeout=SQLITE_BUSY_TIMEOUT,
+                               cached_statements=SQLITE_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed while a writer commits; NORMAL skips the fsync per commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """
         Context manager for database connections.
-        Ensures proper connection handling and cleanup.
+        
+        Each thread reuses one connection (reopened after a fork); it is closed
+        when the thread exits. The outermost block commits on success and rolls
+        back on error; nested blocks join the enclosing transaction.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            local.conn = self._open_connection()
+            local.pid = os.getpid()
+            local.depth = 0
+        
+        conn = local.conn
+        local.depth += 1
         try:
             yield conn
-            conn.commit()
+            if local.depth == 1:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if local.depth == 1:
+                conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
+            local.depth -= 1
+    
+    def close(self):
+        """Close the calling thread's connection (others close when their thread exits)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
             conn.close()
+            self._local.conn = None
     
     def _get_stored_schema_version(self, conn) -> int:
         """
@@ -331,6 +693,9 @@ class HexStrikeDatabase:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_vulns_severity ON vulnerabilities(severity)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_log(action)')
             
+            # Apply incremental migrations on top of the base schema
+            self._apply_migrations(cursor, max(stored_version, 1))
+            
             # Insert default settings if not exist
             self._insert_default_settings(cursor)
             
@@ -340,6 +705,149 @@ class HexStrikeDatabase:
             conn.commit()
             logger.info(f"✅ Database schema initialized successfully (version {CURRENT_SCHEMA_VERSION})")
     
+    def _add_column_if_missing(self, cursor, table: str, column: str, declaration: str):
+        """Add a column unless it already exists (ALTER TABLE has no IF NOT EXISTS)."""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+    
+    def _apply_migrations(self, cursor, from_version: int):
+        """
+        Apply schema migrations newer than from_version.
+        
+        Version 2 lets the API server keep its scans, vulnerabilities, agents and
+        tool usage here: frontend documents are stored as JSON next to the
+        queryable columns, keyed by their string IDs.
+        """
+        if from_version < 2:
+            logger.info("🔄 Applying schema migration 2 (API state documents)")
+            self._add_column_if_missing(cursor, 'scans', 'external_id', 'TEXT')
+            self._add_column_if_missing(cursor, 'scans', 'target', 'TEXT')
+            self._add_column_if_missing(cursor, 'scans', 'data', 'TEXT')
+            self._add_column_if_missing(cursor, 'vulnerabilities', 'external_id', 'TEXT')
+            self._add_column_if_missing(cursor, 'vulnerabilities', 'data', 'TEXT')
+            self._add_column_if_missing(cursor, 'agent_configs', 'external_id', 'TEXT')
+            self._add_column_if_missing(cursor, 'agent_configs', 'data', 'TEXT')
+            self._add_column_if_missing(cursor, 'tool_configs', 'usage_count', 'INTEGER DEFAULT 0')
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_scans_external_id ON scans(external_id)')
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_vulns_external_id ON vulnerabilities(external_id)')
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_agents_external_id ON agent_configs(external_id)')
+        
+        if from_version < 3:
+            logger.info("🔄 Applying schema migration 3 (vulnerability fingerprints)")
+            self._add_column_if_missing(cursor, 'vulnerabilities', 'fingerprint', 'TEXT')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_vulns_fingerprint ON vulnerabilities(fingerprint)')
+            cursor.execute('''
+                SELECT id, project_id, title, location, cve_id, cwe_id
+                FROM vulnerabilities WHERE fingerprint IS NULL
+            ''')
+            backfill = [(vulnerability_fingerprint(dict(row)), row['id']) for row in cursor.fetchall()]
+            cursor.executemany('UPDATE vulnerabilities SET fingerprint = ? WHERE id = ?', backfill)
+        
+        if from_version < 4:
+            logger.info("🔄 Applying schema migration 4 (keyset pagination indexes)")
+            vuln_order = ', '.join(f'{column} DESC' for column in VULN_SORT_KEY)
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vulns_order ON vulnerabilities({vuln_order})')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vulns_project_order ON vulnerabilities(project_id, {vuln_order})')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vulns_scan_order ON vulnerabilities(scan_id, {vuln_order})')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vulns_severity_order ON vulnerabilities(severity, {vuln_order})')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_scans_order ON scans(created_at DESC, id DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_scans_project_order ON scans(project_id, created_at DESC, id DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_order ON audit_log(created_at DESC, id DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_action_order ON audit_log(action, created_at DESC, id DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_audit_resource_order ON audit_log(resource_type, created_at DESC, id DESC)')
+            # The single-column indexes are prefixes of the ones above
+            cursor.execute('DROP INDEX IF EXISTS idx_scans_project')
+            cursor.execute('DROP INDEX IF EXISTS idx_vulns_scan')
+            cursor.execute('DROP INDEX IF EXISTS idx_vulns_severity')
+            cursor.execute('DROP INDEX IF EXISTS idx_audit_action')
+        
+        if from_version < 5:
+            logger.info("🔄 Applying schema migration 5 (full-text search)")
+            self._create_search_index(cursor)
+        
+        if from_version < 6:
+            logger.info("🔄 Applying schema migration 6 (API document list indexes)")
+            scan_order = ', '.join(SCAN_DOCUMENT_SORT_KEY)
+            vuln_order = ', '.join(VULN_DOCUMENT_SORT_KEY)
+            # Partial indexes: only API documents carry an external_id
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_scan_docs_order ON scans({scan_order}) WHERE {DOCUMENT_FILTER}')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_scan_docs_status_order ON scans(status, {scan_order}) WHERE {DOCUMENT_FILTER}')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vuln_docs_order ON vulnerabilities({vuln_order}) WHERE {DOCUMENT_FILTER}')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_vuln_docs_status_order ON vulnerabilities(status, {vuln_order}) WHERE {DOCUMENT_FILTER}')
+    
+    def _create_search_index(self, cursor):
+        """Create the FTS5 indexes and the triggers that keep them in sync."""
+        vuln_columns = ', '.join(VULN_SEARCH_COLUMNS)
+        new_values = ', '.join(f'new.{column}' for column in VULN_SEARCH_COLUMNS)
+        old_values = ', '.join(f'old.{column}' for column in VULN_SEARCH_COLUMNS)
+        changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in VULN_SEARCH_COLUMNS)
+        
+        # External content tables: the text lives only in the base tables
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS vulnerabilities_fts
+            USING fts5({vuln_columns}, content='vulnerabilities', content_rowid='id')
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS vulnerabilities_fts_insert AFTER INSERT ON vulnerabilities BEGIN
+                INSERT INTO vulnerabilities_fts(rowid, {vuln_columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS vulnerabilities_fts_delete AFTER DELETE ON vulnerabilities BEGIN
+                INSERT INTO vulnerabilities_fts(vulnerabilities_fts, rowid, {vuln_columns})
+                VALUES ('delete', old.id, {old_values});
+            END
+        ''')
+        # Status changes and document upserts with unchanged text do not touch the index
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS vulnerabilities_fts_update AFTER UPDATE ON vulnerabilities
+            WHEN {changed} BEGIN
+                INSERT INTO vulnerabilities_fts(vulnerabilities_fts, rowid, {vuln_columns})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO vulnerabilities_fts(rowid, {vuln_columns}) VALUES (new.id, {new_values});
+            END
+        ''')
+        cursor.execute("INSERT INTO vulnerabilities_fts(vulnerabilities_fts) VALUES ('rebuild')")
+        
+        # Tool stdout, stored in chunks so hits and snippets stay small
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tool_output (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scan_id INTEGER,
+                tool TEXT NOT NULL,
+                command TEXT,
+                chunk_index INTEGER DEFAULT 0,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (scan_id) REFERENCES scans(id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tool_output_scan ON tool_output(scan_id)')
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS tool_output_fts
+            USING fts5(tool, command, content, content='tool_output', content_rowid='id')
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tool_output_fts_insert AFTER INSERT ON tool_output BEGIN
+                INSERT INTO tool_output_fts(rowid, tool, command, content)
+                VALUES (new.id, new.tool, new.command, new.content);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tool_output_fts_delete AFTER DELETE ON tool_output BEGIN
+                INSERT INTO tool_output_fts(tool_output_fts, rowid, tool, command, content)
+                VALUES ('delete', old.id, old.tool, old.command, old.content);
+            END
+        ''')
+        
+        # Stored scan results become searchable output of their scan
+        cursor.execute("SELECT id, scan_type, results FROM scans WHERE results IS NOT NULL AND results != ''")
+        for row in cursor.fetchall():
+            cursor.executemany(
+                'INSERT INTO tool_output (scan_id, tool, command, chunk_index, content) VALUES (?, ?, NULL, ?, ?)',
+                [(row['id'], row['scan_type'], index, chunk) for index, chunk in enumerate(chunk_text(row['results']))])
+    
     def _insert_default_settings(self, cursor):
         """Insert default application settings."""
         default_settings = [
@@ -579,6 +1087,107 @@ class HexStrikeDatabase:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    # =========================================================================
+    # Keyset Pagination
+    # =========================================================================
+    
+    def _keyset_query(self, table: str, sort_key: tuple, filters: Dict[str, Any],
+                      limit: int = None, cursor: str = None, descending: bool = True,
+                      where: str = None) -> tuple:
+        """
+        Build a filtered query ordered by sort_key (all DESC, or all ASC), starting after cursor.
+        
+        Returns:
+            (sql, params) fetching at most limit rows
+        """
+        conditions = [where] if where else []
+        params = []
+        for column, value in filters.items():
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        if cursor:
+            values = decode_cursor(cursor, len(sort_key))
+            # The redundant bound on the leading column lets SQLite seek into
+            # expression indexes, which it does not do for row values alone
+            conditions.append(f"{sort_key[0]} {'<=' if descending else '>='} ?")
+            conditions.append(f"({', '.join(sort_key)}) {'<' if descending else '>'} ({', '.join('?' * len(sort_key))})")
+            params.append(values[0])
+            params.extend(values)
+        
+        query = f'SELECT * FROM {table}'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY ' + ', '.join(f"{column} {'DESC' if descending else 'ASC'}" for column in sort_key)
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+        return query, params
+    
+    def _keyset_page(self, table: str, sort_key: tuple, row_key, filters: Dict[str, Any],
+                     limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, descending: bool = True,
+                     where: str = None) -> Dict[str, Any]:
+        """
+        Fetch one page of a keyset-paginated list.
+        
+        Returns:
+            Dict with 'items' and 'next_cursor' (None on the last page)
+        """
+        limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        query, params = self._keyset_query(table, sort_key, filters, limit + 1, cursor, descending, where)
+        with self.get_connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(row_key(rows[-1]))
+        return {'items': rows, 'next_cursor': next_cursor}
+    
+    def explain_list_queries(self) -> Dict[str, List[str]]:
+        """EXPLAIN QUERY PLAN details of every paginated list query shape."""
+        shapes = {
+            'vulnerabilities': ('vulnerabilities', VULN_SORT_KEY, True, None,
+                                [{}, {'project_id': 1}, {'scan_id': 1}, {'severity': 'high'}]),
+            'scans': ('scans', SCAN_SORT_KEY, True, None, [{}, {'project_id': 1}]),
+            'audit_log': ('audit_log', AUDIT_SORT_KEY, True, None, [{}, {'action': 'x'}, {'resource_type': 'x'}]),
+            'scan_documents': ('scans', SCAN_DOCUMENT_SORT_KEY, True, DOCUMENT_FILTER, [{}, {'status': 'x'}]),
+            'vulnerability_documents': ('vulnerabilities', VULN_DOCUMENT_SORT_KEY, False, None,
+                                        [{}, {'severity': 'high'}, {'status': 'x'}, {'severity': 'high', 'status': 'x'}]),
+        }
+        plans = {}
+        with self.get_connection() as conn:
+            for shape, (table, sort_key, descending, where, filter_sets) in shapes.items():
+                for filters in filter_sets:
+                    query_filters, query_where = filters, where
+                    if shape == 'vulnerability_documents':
+                        query_filters, query_where = self._vulnerability_document_filters(**filters)
+                    for cursor in (None, encode_cursor([0] * len(sort_key))):
+                        query, params = self._keyset_query(table, sort_key, query_filters, DEFAULT_PAGE_SIZE,
+                                                           cursor, descending, query_where)
+                        name = f"{shape}[{','.join(filters) or 'all'}{'+cursor' if cursor else ''}]"
+                        plans[name] = [row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}', params)]
+        return plans
+    
+    def check_query_plans(self) -> List[str]:
+        """
+        Regression check for list queries.
+        
+        Returns:
+            Problems found: a full table scan, a cursor that does not seek,
+            or a temporary B-tree for sorting
+        """
+        problems = []
+        for name, details in self.explain_list_queries().items():
+            for detail in details:
+                if detail.startswith('SCAN') and 'INDEX' not in detail:
+                    problems.append(f'{name}: table scan ({detail})')
+                if name.endswith('+cursor]') and detail.startswith('SCAN'):
+                    problems.append(f'{name}: cursor does not seek ({detail})')
+                if 'TEMP B-TREE' in detail:
+                    problems.append(f'{name}: sort without index ({detail})')
+        return problems
+    
     # =========================================================================
     # Scan Management
     # =========================================================================
@@ -625,19 +1234,24 @@ class HexStrikeDatabase:
     def get_scan_history(self, project_id: int = None, limit: int = 50) -> List[Dict]:
         """Get scan history, optionally filtered by project."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if project_id:
-                cursor.execute('''
-                    SELECT * FROM scans WHERE project_id = ? 
-                    ORDER BY created_at DESC LIMIT ?
-                ''', (project_id, limit))
-            else:
-                cursor.execute('''
-                    SELECT * FROM scans ORDER BY created_at DESC LIMIT ?
-                ''', (limit,))
+            query, params = self._keyset_query('scans', SCAN_SORT_KEY, {'project_id': project_id}, limit)
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+    
+    def get_scan_history_page(self, project_id: int = None, limit: int = DEFAULT_PAGE_SIZE,
+                              cursor: str = None) -> Dict[str, Any]:
+        """
+        Get one page of scan history, newest first.
+        
+        Args:
+            project_id: Optional project filter
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
             
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Dict with 'items' and 'next_cursor'
+        """
+        return self._keyset_page('scans', SCAN_SORT_KEY, lambda row: [row['created_at'], row['id']],
+                                 {'project_id': project_id}, limit, cursor)
     
     # =========================================================================
     # Vulnerability Management
@@ -651,38 +1265,111 @@ class HexStrikeDatabase:
         """Add a new vulnerability and return its ID."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            fingerprint = vulnerability_fingerprint({'project_id': project_id, 'title': title, 'location': location,
+                                                     'cve_id': cve_id, 'cwe_id': cwe_id})
             cursor.execute('''
                 INSERT INTO vulnerabilities 
                 (scan_id, project_id, title, description, severity, cvss_score,
-                 cve_id, cwe_id, location, proof_of_concept, discovered_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 cve_id, cwe_id, location, proof_of_concept, discovered_by, fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (scan_id, project_id, title, description, severity, cvss_score,
-                  cve_id, cwe_id, location, proof_of_concept, discovered_by))
+                  cve_id, cwe_id, location, proof_of_concept, discovered_by, fingerprint))
             return cursor.lastrowid
     
+    def add_vulnerabilities_bulk(self, findings: Iterable[Dict[str, Any]], batch_size: int = BULK_BATCH_SIZE,
+                                 deduplicate: bool = True, return_ids: bool = False) -> Dict[str, Any]:
+        """
+        Insert many vulnerabilities, one transaction per batch.
+        
+        The iterable is consumed lazily, so a generator over a large tool output
+        never has to be materialized.
+        
+        Args:
+            findings: Dicts with add_vulnerability's keyword names ('title' required)
+            batch_size: Rows per executemany transaction
+            deduplicate: Skip findings whose fingerprint is already stored
+            return_ids: Also return the IDs of inserted rows (inserts row by row
+                        inside each batch transaction)
+            
+        Returns:
+            Dict with 'inserted', 'duplicates', 'batches' and optionally 'ids'
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        columns = ', '.join(VULN_INSERT_COLUMNS + ('fingerprint',))
+        placeholders = ', '.join('?' * (len(VULN_INSERT_COLUMNS) + 1))
+        if deduplicate:
+            query = f'''
+                INSERT INTO vulnerabilities ({columns})
+                SELECT {placeholders}
+                WHERE NOT EXISTS (SELECT 1 FROM vulnerabilities WHERE fingerprint = ?)
+            '''
+        else:
+            query = f'INSERT INTO vulnerabilities ({columns}) VALUES ({placeholders})'
+        
+        def to_row(finding: Dict[str, Any]) -> tuple:
+            finding = {'severity': 'medium', **finding}
+            fingerprint = vulnerability_fingerprint(finding)
+            row = tuple(finding.get(column) for column in VULN_INSERT_COLUMNS) + (fingerprint,)
+            return row + (fingerprint,) if deduplicate else row
+        
+        result = {'inserted': 0, 'duplicates': 0, 'batches': 0}
+        if return_ids:
+            result['ids'] = []
+        
+        iterator = iter(findings)
+        while True:
+            batch = [to_row(finding) for finding in islice(iterator, batch_size)]
+            if not batch:
+                break
+            with self.get_connection() as conn:
+                if return_ids:
+                    inserted = 0
+                    for row in batch:
+                        cursor = conn.execute(query, row)
+                        if cursor.rowcount > 0:
+                            result['ids'].append(cursor.lastrowid)
+                            inserted += 1
+                else:
+                    inserted = conn.executemany(query, batch).rowcount
+            result['inserted'] += inserted
+            result['duplicates'] += len(batch) - inserted
+            result['batches'] += 1
+        
+        logger.info(f"📥 Bulk inserted {result['inserted']} vulnerabilities "
+                    f"({result['duplicates']} duplicates skipped, {result['batches']} batches)")
+        return result
+    
     def get_vulnerabilities(self, project_id: int = None, scan_id: int = None,
                             severity: str = None) -> List[Dict]:
         """Get vulnerabilities with optional filters."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = 'SELECT * FROM vulnerabilities WHERE 1=1'
-            params = []
-            
-            if project_id:
-                query += ' AND project_id = ?'
-                params.append(project_id)
-            if scan_id:
-                query += ' AND scan_id = ?'
-                params.append(scan_id)
-            if severity:
-                query += ' AND severity = ?'
-                params.append(severity)
-            
-            query += ' ORDER BY cvss_score DESC, discovered_at DESC'
-            cursor.execute(query, params)
+            query, params = self._keyset_query('vulnerabilities', VULN_SORT_KEY, {
+                'project_id': project_id, 'scan_id': scan_id, 'severity': severity})
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+    
+    def get_vulnerabilities_page(self, project_id: int = None, scan_id: int = None, severity: str = None,
+                                 limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict[str, Any]:
+        """
+        Get one page of vulnerabilities, highest CVSS first.
+        
+        Args:
+            project_id: Optional project filter
+            scan_id: Optional scan filter
+            severity: Optional severity filter
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
             
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Dict with 'items' and 'next_cursor'
+        """
+        def row_key(row):
+            score = row['cvss_score'] if row['cvss_score'] is not None else -1.0
+            return [score, row['discovered_at'], row['id']]
+        
+        return self._keyset_page('vulnerabilities', VULN_SORT_KEY, row_key, {
+            'project_id': project_id, 'scan_id': scan_id, 'severity': severity}, limit, cursor)
     
     def update_vulnerability_status(self, vuln_id: int, status: str) -> bool:
         """
@@ -704,6 +1391,33 @@ class HexStrikeDatabase:
             ''', (status, verified_at, vuln_id))
             return cursor.rowcount > 0
     
+    def update_vulnerability_status_bulk(self, vuln_ids: Iterable[int], status: str,
+                                         batch_size: int = BULK_BATCH_SIZE) -> int:
+        """
+        Set the status of many vulnerabilities, one transaction per batch.
+        
+        Args:
+            vuln_ids: Vulnerability IDs (any iterable, consumed lazily)
+            status: One of: new, confirmed, false_positive, remediated
+            batch_size: Rows per executemany transaction
+            
+        Returns:
+            Number of vulnerabilities updated
+        """
+        verified_at = datetime.now().isoformat() if status in VULN_STATUSES_REQUIRING_VERIFICATION else None
+        updated = 0
+        iterator = iter(vuln_ids)
+        while True:
+            batch = [(status, verified_at, vuln_id) for vuln_id in islice(iterator, batch_size)]
+            if not batch:
+                break
+            with self.get_connection() as conn:
+                updated += conn.executemany('''
+                    UPDATE vulnerabilities SET status = ?, verified_at = ?
+                    WHERE id = ?
+                ''', batch).rowcount
+        return updated
+    
     # =========================================================================
     # Agent Configuration
     # =========================================================================
@@ -754,43 +1468,574 @@ class HexStrikeDatabase:
             
             return configs
     
+    # =========================================================================
+    # API State Documents (scans, vulnerabilities, agents, tool usage)
+    # =========================================================================
+    
+    def save_scan_documents(self, scans: List[Dict]) -> int:
+        """
+        Insert or update frontend scan documents in one transaction.
+        
+        Args:
+            scans: Scan dicts with at least 'id' and 'target'
+            
+        Returns:
+            Number of documents written
+        """
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO scans (external_id, target, scan_type, status, progress,
+                                   current_phase, tools_used, data, started_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(external_id) DO UPDATE SET
+                    target = excluded.target,
+                    scan_type = excluded.scan_type,
+                    status = excluded.status,
+                    progress = excluded.progress,
+                    current_phase = excluded.current_phase,
+                    tools_used = excluded.tools_used,
+                    data = excluded.data,
+                    completed_at = CASE WHEN excluded.status IN ('completed', 'failed')
+                                        THEN COALESCE(scans.completed_at, CURRENT_TIMESTAMP) END
+            ''', [(scan['id'], scan.get('target'), scan.get('type', 'standard'), scan.get('status', 'pending'),
+                   scan.get('progress', 0), scan.get('currentPhase'), json.dumps(scan.get('toolsUsed', [])),
+                   json.dumps(scan), scan.get('startTime')) for scan in scans])
+            return len(scans)
+    
+    def get_scan_documents(self, status: str = None) -> List[Dict]:
+        """Get stored frontend scan documents, optionally filtered by status."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if status:
+                cursor.execute('SELECT data FROM scans WHERE external_id IS NOT NULL AND status = ?', (status,))
+            else:
+                cursor.execute('SELECT data FROM scans WHERE external_id IS NOT NULL')
+            return [json.loads(row['data']) for row in cursor.fetchall() if row['data']]
+    
+    def get_scan_document(self, scan_id: str) -> Optional[Dict]:
+        """Get one frontend scan document by its string ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM scans WHERE external_id = ?', (scan_id,))
+            row = cursor.fetchone()
+            return json.loads(row['data']) if row and row['data'] else None
+    
+    def get_scan_documents_page(self, status: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                                cursor: str = None) -> Dict[str, Any]:
+        """
+        Get one page of frontend scan documents, newest start time first.
+        
+        Args:
+            status: Optional status filter
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
+            
+        Returns:
+            Dict with 'items' (documents), 'next_cursor' and 'total' (matching documents)
+        """
+        page = self._keyset_page('scans', SCAN_DOCUMENT_SORT_KEY,
+                                 lambda row: [row['started_at'] or '', row['external_id']],
+                                 {'status': status}, limit, cursor, where=DOCUMENT_FILTER)
+        page['items'] = [json.loads(row['data']) for row in page['items'] if row['data']]
+        page['total'] = self.count_scan_documents(status)
+        return page
+    
+    def count_scan_documents(self, status: str = None) -> int:
+        """Number of frontend scan documents, optionally with one status."""
+        return self._count_documents('scans', {'status': status})
+    
+    def update_scan_document(self, scan_id: str, apply) -> Optional[Dict]:
+        """
+        Change a frontend scan document in place, atomically across processes.
+        
+        Args:
+            scan_id: String ID of the scan
+            apply: Callable that modifies the document dict
+            
+        Returns:
+            The updated document, or None if it does not exist
+        """
+        return self._update_document('scans', scan_id, apply, self.save_scan_documents)
+    
+    def _update_document(self, table: str, doc_id: str, apply, save) -> Optional[Dict]:
+        """Read, modify and write one document inside a single write transaction."""
+        with self.get_connection() as conn:
+            if not conn.in_transaction:
+                # Take the write lock before reading so concurrent updates serialize
+                conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(f'SELECT data FROM {table} WHERE external_id = ?', (doc_id,)).fetchone()
+            if row is None or not row['data']:
+                return None
+            doc = json.loads(row['data'])
+            apply(doc)
+            save([doc])
+            return doc
+    
+    def _count_documents(self, table: str, filters: Dict[str, Any]) -> int:
+        """Number of API documents in a table matching equality filters."""
+        conditions = [DOCUMENT_FILTER]
+        params = []
+        for column, value in filters.items():
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        with self.get_connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {' AND '.join(conditions)}", params).fetchone()[0]
+    
+    def delete_scan_documents(self, scan_ids: List[str]) -> int:
+        """Delete frontend scan documents, and their stored tool output, by their string IDs."""
+        params = [(scan_id,) for scan_id in scan_ids]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM tool_output WHERE scan_id IN (SELECT id FROM scans WHERE external_id = ?)',
+                               params)
+            cursor.executemany('DELETE FROM scans WHERE external_id = ?', params)
+            return cursor.rowcount
+    
+    def save_vulnerability_documents(self, vulnerabilities: List[Dict]) -> int:
+        """
+        Insert or update frontend vulnerability documents in one transaction.
+        
+        Args:
+            vulnerabilities: Vulnerability dicts with at least 'id' and 'title'
+            
+        Returns:
+            Number of documents written
+        """
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO vulnerabilities (external_id, scan_id, title, description, severity, cvss_score,
+                                             cve_id, cwe_id, location, proof_of_concept, remediation,
+                                             status, discovered_by, data)
+                VALUES (?, (SELECT id FROM scans WHERE external_id = ?), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(external_id) DO UPDATE SET
+                    scan_id = excluded.scan_id,
+                    title = excluded.title,
+                    description = excluded.description,
+                    severity = excluded.severity,
+                    cvss_score = excluded.cvss_score,
+                    cve_id = excluded.cve_id,
+                    cwe_id = excluded.cwe_id,
+                    location = excluded.location,
+                    proof_of_concept = excluded.proof_of_concept,
+                    remediation = excluded.remediation,
+                    status = excluded.status,
+                    discovered_by = excluded.discovered_by,
+                    data = excluded.data,
+                    verified_at = CASE WHEN excluded.status IN ('confirmed', 'false_positive', 'remediated')
+                                       THEN COALESCE(vulnerabilities.verified_at, CURRENT_TIMESTAMP) END
+            ''', [(vuln['id'], vuln.get('scanId'), vuln.get('title', 'Untitled'), vuln.get('description'),
+                   vuln.get('severity', 'medium'), vuln.get('cvssScore', vuln.get('cvss')),
+                   vuln.get('cveId', vuln.get('cve')), vuln.get('cweId', vuln.get('cwe')),
+                   vuln.get('location', vuln.get('url')), vuln.get('proofOfConcept'), vuln.get('remediation'),
+                   vuln.get('status', VULN_STATUS_NEW), vuln.get('discoveredBy', vuln.get('tool')),
+                   json.dumps(vuln)) for vuln in vulnerabilities])
+            return len(vulnerabilities)
+    
+    def get_vulnerability_documents(self, severity: str = None, status: str = None) -> List[Dict]:
+        """Get stored frontend vulnerability documents with optional filters."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            query = 'SELECT data FROM vulnerabilities WHERE external_id IS NOT NULL'
+            params = []
+            
+            if severity:
+                query += ' AND severity = ?'
+                params.append(severity)
+            if status:
+                query += ' AND status = ?'
+                params.append(status)
+            
+            cursor.execute(query, params)
+            return [json.loads(row['data']) for row in cursor.fetchall() if row['data']]
+    
+    def get_vulnerability_document(self, vuln_id: str) -> Optional[Dict]:
+        """Get one frontend vulnerability document by its string ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM vulnerabilities WHERE external_id = ?', (vuln_id,))
+            row = cursor.fetchone()
+            return json.loads(row['data']) if row and row['data'] else None
+    
+    def get_vulnerability_documents_page(self, severity: str = None, status: str = None,
+                                         limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict[str, Any]:
+        """
+        Get one page of frontend vulnerability documents, most severe first.
+        
+        Args:
+            severity: Optional severity filter
+            status: Optional status filter
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
+            
+        Returns:
+            Dict with 'items' (documents), 'next_cursor' and 'total' (matching documents)
+        """
+        def row_key(row):
+            discovered_at = json.loads(row['data']).get('discoveredAt') if row['data'] else None
+            return [SEVERITY_RANKS.get(row['severity'], 5),
+                    discovered_at if discovered_at is not None else '', row['external_id']]
+        
+        filters, where = self._vulnerability_document_filters(severity, status)
+        page = self._keyset_page('vulnerabilities', VULN_DOCUMENT_SORT_KEY, row_key, filters, limit, cursor,
+                                 descending=False, where=where)
+        page['items'] = [json.loads(row['data']) for row in page['items'] if row['data']]
+        page['total'] = self.count_vulnerability_documents(severity, status)
+        return page
+    
+    def count_vulnerability_documents(self, severity: str = None, status: str = None) -> int:
+        """Number of frontend vulnerability documents with optional filters."""
+        return self._count_documents('vulnerabilities', {'severity': severity, 'status': status})
+    
+    def update_vulnerability_document(self, vuln_id: str, apply) -> Optional[Dict]:
+        """Change a frontend vulnerability document in place (see update_scan_document)."""
+        return self._update_document('vulnerabilities', vuln_id, apply, self.save_vulnerability_documents)
+    
+    def _vulnerability_document_filters(self, severity: str = None, status: str = None) -> tuple:
+        """
+        Filters and WHERE clause for the vulnerability document list.
+        
+        A known severity is turned into a range on the rank expression: SQLite
+        propagates severity = ? into the ORDER BY expression, after which no
+        index matches it and every page is sorted in a temporary B-tree.
+        """
+        if severity in SEVERITY_RANKS:
+            rank = SEVERITY_RANKS[severity]
+            return {'status': status}, f'{DOCUMENT_FILTER} AND {SEVERITY_RANK_SQL} BETWEEN {rank} AND {rank}'
+        return {'severity': severity, 'status': status}, DOCUMENT_FILTER
+    
+    def delete_vulnerability_documents(self, vuln_ids: List[str]) -> int:
+        """Delete frontend vulnerability documents by their string IDs."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM vulnerabilities WHERE external_id = ?', [(vuln_id,) for vuln_id in vuln_ids])
+            return cursor.rowcount
+    
+    def save_agent_documents(self, agents: List[Dict]) -> int:
+        """Insert or update frontend agent documents in one transaction."""
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO agent_configs (external_id, agent_name, agent_type, is_enabled, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(external_id) DO UPDATE SET
+                    agent_name = excluded.agent_name,
+                    agent_type = excluded.agent_type,
+                    is_enabled = excluded.is_enabled,
+                    data = excluded.data,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', [(agent['id'], agent.get('name', agent['id']), agent.get('type'),
+                   agent.get('status') == 'active', json.dumps(agent)) for agent in agents])
+            return len(agents)
+    
+    def get_agent_document(self, agent_id: str) -> Optional[Dict]:
+        """Get one frontend agent document by its string ID."""
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT data FROM agent_configs WHERE external_id = ?', (agent_id,)).fetchone()
+            return json.loads(row['data']) if row and row['data'] else None
+    
+    def update_agent_document(self, agent_id: str, apply) -> Optional[Dict]:
+        """Change a frontend agent document in place (see update_scan_document)."""
+        return self._update_document('agent_configs', agent_id, apply, self.save_agent_documents)
+    
+    def get_agent_documents(self) -> List[Dict]:
+        """Get stored frontend agent documents."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT data FROM agent_configs WHERE external_id IS NOT NULL')
+            return [json.loads(row['data']) for row in cursor.fetchall() if row['data']]
+    
+    def increment_tool_usage(self, counts: Dict[str, int]) -> int:
+        """
+        Add to the persisted usage counters of tools.
+        
+        Args:
+            counts: Mapping of tool ID to the number of new uses
+            
+        Returns:
+            Number of tools updated
+        """
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO tool_configs (tool_name, usage_count) VALUES (?, ?)
+                ON CONFLICT(tool_name) DO UPDATE SET
+                    usage_count = COALESCE(usage_count, 0) + excluded.usage_count,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', list(counts.items()))
+            return len(counts)
+    
+    def get_tool_usage(self) -> Dict[str, int]:
+        """Get persisted usage counters keyed by tool ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT tool_name, usage_count FROM tool_configs WHERE usage_count > 0')
+            return {row['tool_name']: row['usage_count'] for row in cursor.fetchall()}
+    
+    # =========================================================================
+    # Full-Text Search
+    # =========================================================================
+    
+    def add_tool_output(self, tool: str, output: str, command: str = None,
+                        scan_id: int = None) -> int:
+        """
+        Store tool output in searchable chunks.
+        
+        Args:
+            tool: Tool name
+            output: Captured stdout
+            command: Command line that produced the output
+            scan_id: Optional scan the output belongs to
+            
+        Returns:
+            Number of chunks stored
+        """
+        return self.add_tool_output_stream(tool, [output], command, scan_id)
+    
+    def add_tool_output_stream(self, tool: str, pieces: Iterable[str], command: str = None,
+                               scan_id: int = None) -> int:
+        """
+        Store tool output that arrives in pieces, without joining it in memory.
+        
+        Pieces are re-chunked at line ends like add_tool_output and written
+        BULK_BATCH_SIZE chunks per transaction.
+        
+        Args:
+            tool: Tool name
+            pieces: Consecutive slices of the output (any size)
+            command: Command line that produced the output
+            scan_id: Optional scan the output belongs to
+            
+        Returns:
+            Number of chunks stored
+        """
+        sql = 'INSERT INTO tool_output (scan_id, tool, command, chunk_index, content) VALUES (?, ?, ?, ?, ?)'
+        batch, index, carry = [], 0, ''
+        
+        def write(rows):
+            with self.get_connection() as conn:
+                conn.executemany(sql, rows)
+        
+        for piece in pieces:
+            chunks = chunk_text(carry + piece)
+            # The last chunk may continue in the next piece
+            carry = chunks.pop() if chunks else ''
+            for chunk in chunks:
+                batch.append((scan_id, tool, command, index, chunk))
+                index += 1
+            if len(batch) >= BULK_BATCH_SIZE:
+                write(batch)
+                batch = []
+        if carry:
+            batch.append((scan_id, tool, command, index, carry))
+            index += 1
+        if batch:
+            write(batch)
+        return index
+    
+    def prune_tool_output(self, max_age_days: float = None, max_bytes: int = None) -> int:
+        """
+        Apply retention to indexed command output.
+        
+        Only output not attached to a scan is pruned; scan output is deleted
+        together with its scan.
+        
+        Args:
+            max_age_days: Delete chunks older than this
+            max_bytes: Then delete the oldest chunks until the rest fit in this size
+            
+        Returns:
+            Number of chunks deleted
+        """
+        deleted = 0
+        with self.get_connection() as conn:
+            if max_age_days is not None:
+                deleted += conn.execute(
+                    "DELETE FROM tool_output WHERE scan_id IS NULL AND created_at < datetime('now', ?)",
+                    (f'-{float(max_age_days)} days',)).rowcount
+            if max_bytes is not None:
+                total = conn.execute('SELECT IFNULL(SUM(length(CAST(content AS BLOB))), 0) FROM tool_output '
+                                     'WHERE scan_id IS NULL').fetchone()[0]
+                excess, cutoff = total - max_bytes, None
+                if excess > 0:
+                    for row in conn.execute('SELECT id, length(CAST(content AS BLOB)) AS size FROM tool_output '
+                                            'WHERE scan_id IS NULL ORDER BY id'):
+                        excess -= row['size']
+                        if excess <= 0:
+                            cutoff = row['id']
+                            break
+                if cutoff is not None:
+                    deleted += conn.execute('DELETE FROM tool_output WHERE scan_id IS NULL AND id <= ?',
+                                            (cutoff,)).rowcount
+        if deleted:
+            logger.info(f"🗑️  Pruned {deleted} stored tool output chunk(s)")
+        return deleted
+    
+    def get_tool_output(self, chunk_id: int) -> Optional[Dict]:
+        """Get one stored output chunk by ID."""
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT * FROM tool_output WHERE id = ?', (chunk_id,)).fetchone()
+            return dict(row) if row else None
+    
+    def search(self, query: str, kinds: List[str] = None, limit: int = 20,
+               cursor: str = None, raw: bool = False) -> Dict[str, Any]:
+        """
+        Ranked full-text search over vulnerabilities and stored tool output.
+        
+        Each index returns only its best offset+limit hits (FTS5 can rank
+        without materialising every match); snippets are built for the
+        returned page only.
+        
+        Args:
+            query: Free text (every term must match), or FTS5 syntax if raw
+            kinds: Subset of SEARCH_KINDS to search (default all)
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
+            raw: Pass the query to FTS5 unchanged
+            
+        Returns:
+            Dict with 'items' (best bm25 score first) and 'next_cursor'
+            
+        Raises:
+            ValueError: For an empty or malformed query, unknown kind or bad cursor
+        """
+        kinds = list(kinds or SEARCH_KINDS)
+        unknown = set(kinds) - set(SEARCH_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown search kind(s): {', '.join(sorted(unknown))}")
+        match = query.strip() if raw else build_match_query(query)
+        if not match:
+            raise ValueError("Empty search query")
+        limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        offset = int(decode_cursor(cursor, 1)[0]) if cursor else 0
+        wanted = offset + limit + 1
+        
+        sources = {
+            'vulnerabilities': ('vulnerabilities_fts', VULN_SEARCH_WEIGHTS),
+            'tool_output': ('tool_output_fts', TOOL_OUTPUT_SEARCH_WEIGHTS),
+        }
+        try:
+            with self.get_connection() as conn:
+                hits = []
+                for kind in kinds:
+                    table, weights = sources[kind]
+                    rows = conn.execute(
+                        f'SELECT rowid, bm25({table}, {", ".join(map(str, weights))}) AS score FROM {table} '
+                        f'WHERE {table} MATCH ? ORDER BY score LIMIT ?', (match, wanted)).fetchall()
+                    hits.extend((row['score'], kind, row['rowid']) for row in rows)
+                hits.sort()
+                page = hits[offset:offset + limit]
+                items = [self._search_hit(conn, kind, rowid, score, match) for score, kind, rowid in page]
+        except sqlite3.OperationalError as e:
+            if 'fts5' in str(e) or 'syntax error' in str(e):
+                raise ValueError(f"Invalid search query: {e}")
+            raise
+        
+        next_cursor = encode_cursor([offset + limit]) if len(hits) > offset + limit else None
+        return {'items': [item for item in items if item], 'next_cursor': next_cursor}
+    
+    def _search_hit(self, conn, kind: str, rowid: int, score: float, match: str) -> Optional[Dict[str, Any]]:
+        """Load the row and snippet of one search hit."""
+        open_mark, close_mark = SEARCH_SNIPPET_MARKERS
+        if kind == 'vulnerabilities':
+            row = conn.execute('''
+                SELECT v.id, v.external_id, v.title, v.severity, v.cvss_score, v.cve_id, v.location,
+                       v.status, v.scan_id, v.discovered_at AS created_at,
+                       snippet(vulnerabilities_fts, -1, ?, ?, '…', ?) AS snippet
+                FROM vulnerabilities_fts JOIN vulnerabilities v ON v.id = vulnerabilities_fts.rowid
+                WHERE vulnerabilities_fts MATCH ? AND vulnerabilities_fts.rowid = ?
+            ''', (open_mark, close_mark, SEARCH_SNIPPET_TOKENS, match, rowid)).fetchone()
+        else:
+            row = conn.execute('''
+                SELECT t.id, t.scan_id, t.tool, t.command, t.chunk_index, t.created_at,
+                       snippet(tool_output_fts, 2, ?, ?, '…', ?) AS snippet
+                FROM tool_output_fts JOIN tool_output t ON t.id = tool_output_fts.rowid
+                WHERE tool_output_fts MATCH ? AND tool_output_fts.rowid = ?
+            ''', (open_mark, close_mark, SEARCH_SNIPPET_TOKENS, match, rowid)).fetchone()
+        if row is None:
+            return None
+        return {'kind': kind, 'score': round(-score, 4), **dict(row)}
+    
+    def optimize_search_index(self):
+        """Merge FTS5 index segments (run after large imports)."""
+        with self.get_connection() as conn:
+            conn.execute("INSERT INTO vulnerabilities_fts(vulnerabilities_fts) VALUES ('optimize')")
+            conn.execute("INSERT INTO tool_output_fts(tool_output_fts) VALUES ('optimize')")
+    
     # =========================================================================
     # Audit Logging
     # =========================================================================
     
+    def _get_audit_writer(self) -> AuditLogWriter:
+        """The audit writer of this process, started on first use."""
+        writer = self._audit_writer
+        if writer is None or writer.pid != os.getpid():
+            with self._audit_writer_lock:
+                writer = self._audit_writer
+                if writer is None or writer.pid != os.getpid():
+                    writer = self._audit_writer = AuditLogWriter(self)
+        return writer
+    
     def log_action(self, action: str, resource_type: str = None,
                    resource_id: int = None, details: str = None,
-                   user_id: int = None, ip_address: str = None) -> int:
-        """Log an action to the audit log."""
+                   user_id: int = None, ip_address: str = None,
+                   wait: bool = False) -> Optional[int]:
+        """
+        Log an action to the audit log.
+        
+        Events are group-committed by the background audit writer; the
+        timestamp is taken when the action is logged, not when it is written.
+        
+        Args:
+            wait: Insert synchronously and return the new row ID
+            
+        Returns:
+            The audit log row ID when wait is True, otherwise None
+        """
+        created_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        row = (user_id, action, resource_type, resource_id, details, ip_address, created_at)
+        if not wait:
+            self._get_audit_writer().submit(row)
+            return None
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO audit_log (user_id, action, resource_type, resource_id, details, ip_address)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, action, resource_type, resource_id, details, ip_address))
+            cursor.execute(AuditLogWriter.INSERT_SQL, row)
             return cursor.lastrowid
     
+    def flush_audit_log(self, timeout: float = None) -> bool:
+        """Wait until queued audit events are committed; False on timeout."""
+        writer = self._audit_writer
+        return writer.flush(timeout) if writer is not None else True
+    
+    def get_audit_writer_stats(self) -> Dict[str, Any]:
+        """Metrics of the background audit writer (empty if it has not started)."""
+        writer = self._audit_writer
+        return writer.get_stats() if writer is not None else {}
+    
     def get_audit_log(self, action: str = None, resource_type: str = None,
                       limit: int = 100) -> List[Dict]:
         """Get audit log entries."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = 'SELECT * FROM audit_log WHERE 1=1'
-            params = []
-            
-            if action:
-                query += ' AND action = ?'
-                params.append(action)
-            if resource_type:
-                query += ' AND resource_type = ?'
-                params.append(resource_type)
-            
-            query += ' ORDER BY created_at DESC LIMIT ?'
-            params.append(limit)
+            query, params = self._keyset_query('audit_log', AUDIT_SORT_KEY, {
+                'action': action, 'resource_type': resource_type}, limit)
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+    
+    def get_audit_log_page(self, action: str = None, resource_type: str = None,
+                           limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> Dict[str, Any]:
+        """
+        Get one page of audit log entries, newest first.
+        
+        Args:
+            action: Optional action filter
+            resource_type: Optional resource type filter
+            limit: Page size (at most MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
             
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        Returns:
+            Dict with 'items' and 'next_cursor'
+        """
+        return self._keyset_page('audit_log', AUDIT_SORT_KEY, lambda row: [row['created_at'], row['id']],
+                                 {'action': action, 'resource_type': resource_type}, limit, cursor)
     
     # =========================================================================
     # Database Maintenance
@@ -816,6 +2061,7 @@ class HexStrikeDatabase:
                 'database_size_bytes': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
                 'schema_version': self._get_stored_schema_version(conn),
                 'current_schema_version': CURRENT_SCHEMA_VERSION,
+                'audit_writer': self.get_audit_writer_stats(),
             }
             
             # Use the predefined whitelist of valid table names for security
@@ -832,27 +2078,290 @@ class HexStrikeDatabase:
     
     def vacuum(self):
         """Optimize the database by running VACUUM."""
+        self.optimize_search_index()
         with self.get_connection() as conn:
             conn.execute('VACUUM')
         logger.info("Database vacuumed successfully")
     
-    def backup(self, backup_path: str = None) -> str:
+    # =========================================================================
+    # Backups
+    # =========================================================================
+    
+    def backup(self, backup_path: str = None, compress: bool = False,
+               pages: int = BACKUP_PAGES_PER_STEP, step_sleep: float = BACKUP_STEP_SLEEP) -> str:
         """
-        Create a backup of the database.
+        Create a consistent backup of the live database.
+        
+        Uses the SQLite online backup API from a dedicated connection, copying
+        `pages` pages per step and sleeping `step_sleep` seconds between steps,
+        so readers and writers carry on while the backup runs. The file is
+        written under a temporary name and renamed when complete. A lock file
+        next to the database keeps backups from several worker processes from
+        overlapping, and progress is shared with them through a status file.
         
         Args:
-            backup_path: Path for the backup file. Defaults to timestamped backup.
+            backup_path: Path for the backup file. Defaults to a uniquely named
+                backup in the database directory.
+            compress: Gzip the backup (".gz" is appended to the path)
+            pages: Pages copied per step (-1 copies everything in one step)
+            step_sleep: Seconds to pause between steps
             
         Returns:
             Path to the backup file
+            
+        Raises:
+            RuntimeError: If another backup is already running, in this or another process
         """
+        if not self._lock_backups():
+            raise RuntimeError("A backup is already running")
+        
         if backup_path is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_path = f"{self.db_path}.backup_{timestamp}"
+            backup_path = self.resolve_backup_path()
+        if compress and not backup_path.endswith('.gz'):
+            backup_path += '.gz'
+        raw_path = backup_path[:-3] if compress else backup_path
+        partial_path = raw_path + '.partial'
         
-        shutil.copy2(self.db_path, backup_path)
-        logger.info(f"Database backup created: {backup_path}")
-        return backup_path
+        started = time.time()
+        status = {
+            'state': 'running', 'phase': 'copying', 'path': backup_path, 'compressed': compress,
+            'pages_total': 0, 'pages_remaining': 0, 'percent': 0.0, 'restarts': 0,
+            'started_at': datetime.fromtimestamp(started).isoformat(), 'finished_at': None,
+            'duration_seconds': None, 'size_bytes': None, 'error': None, 'pid': os.getpid(),
+        }
+        self._backup_status = status
+        self._publish_backup_status(force=True)
+        try:
+            self._copy_database(partial_path, status, pages, step_sleep)
+            if compress:
+                status.update(phase='compressing', percent=0.0)
+                total = os.path.getsize(partial_path) or 1
+                with open(partial_path, 'rb') as source, \
+                        gzip.open(backup_path + '.partial', 'wb', compresslevel=BACKUP_GZIP_LEVEL) as target:
+                    while True:
+                        chunk = source.read(BACKUP_COPY_CHUNK)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                        status['percent'] = round(100.0 * source.tell() / total, 1)
+                        self._publish_backup_status()
+                os.remove(partial_path)
+                partial_path = backup_path + '.partial'
+            os.replace(partial_path, backup_path)
+            status.update(state='completed', phase=None, size_bytes=os.path.getsize(backup_path))
+            logger.info(f"Database backup created: {backup_path}")
+            return backup_path
+        except Exception as e:
+            status.update(state='failed', error=str(e))
+            for leftover in {raw_path + '.partial', backup_path + '.partial'}:
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            logger.error(f"💥 Database backup failed: {e}")
+            raise
+        finally:
+            finished = time.time()
+            status.update(finished_at=datetime.fromtimestamp(finished).isoformat(), finished_epoch=finished,
+                          duration_seconds=round(finished - started, 3))
+            self._publish_backup_status(force=True)
+            self._unlock_backups()
+    
+    def resolve_backup_path(self, name: str = None, directory: str = None) -> str:
+        """
+        Path of a backup file confined to the backup directory.
+        
+        Args:
+            name: File name relative to directory. Defaults to a unique
+                timestamped name; absolute paths and names that resolve
+                outside the directory are rejected.
+            directory: Backup directory. Defaults to the database directory.
+            
+        Returns:
+            Absolute path of the backup file
+            
+        Raises:
+            ValueError: If name is absolute or escapes the directory
+        """
+        directory = os.path.realpath(directory or os.path.dirname(os.path.abspath(self.db_path)))
+        if not name:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            name = f"{os.path.basename(self.db_path)}.backup_{timestamp}_{os.getpid()}"
+        if os.path.isabs(name):
+            raise ValueError("Backup path must be relative to the backup directory")
+        path = os.path.realpath(os.path.join(directory, name))
+        if os.path.commonpath([directory, path]) != directory or path == directory:
+            raise ValueError("Backup path must stay inside the backup directory")
+        db_path = os.path.realpath(self.db_path)
+        if path in {db_path + suffix for suffix in ('', '-wal', '-shm', '-journal', '.backup.lock', '.backup.status')}:
+            raise ValueError("Backup path must not overwrite the database")
+        return path
+    
+    def _lock_backups(self) -> bool:
+        """Take the backup lock of this process and, where fcntl exists, of all processes."""
+        if not self._backup_lock.acquire(blocking=False):
+            return False
+        if fcntl is None:
+            return True
+        fd = os.open(self.db_path + '.backup.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            self._backup_lock.release()
+            return False
+        self._backup_lock_fd = fd
+        return True
+    
+    def _unlock_backups(self):
+        if self._backup_lock_fd is not None:
+            os.close(self._backup_lock_fd)  # closing the descriptor drops the flock
+            self._backup_lock_fd = None
+        self._backup_lock.release()
+    
+    def _backup_running_elsewhere(self) -> bool:
+        """True while another process holds the backup lock."""
+        if fcntl is None or not os.path.exists(self.db_path + '.backup.lock'):
+            return False
+        fd = os.open(self.db_path + '.backup.lock', os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except OSError:
+            return True
+        finally:
+            os.close(fd)
+    
+    def _publish_backup_status(self, force: bool = False):
+        """Write the backup status where other worker processes can read it (throttled)."""
+        now = time.monotonic()
+        if not force and now - self._backup_status_written < BACKUP_STATUS_INTERVAL:
+            return
+        self._backup_status_written = now
+        status_path = self.db_path + '.backup.status'
+        try:
+            with open(status_path + '.tmp', 'w') as f:
+                json.dump(self._backup_status, f)
+            os.replace(status_path + '.tmp', status_path)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write backup status: {e}")
+    
+    def _read_backup_status(self) -> Dict[str, Any]:
+        """Last backup status published by any process, or {}."""
+        try:
+            with open(self.db_path + '.backup.status') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _copy_database(self, target_path: str, status: Dict[str, Any], pages: int, step_sleep: float):
+        """Run the paged online backup into target_path, updating status after each step."""
+        class _Restarted(Exception):
+            pass
+        
+        throttled = pages > 0
+        
+        def progress(_status, remaining, total):
+            # The backup API starts over when another connection writes to the source
+            if remaining >= status['pages_remaining'] and status['pages_total']:
+                status['restarts'] += 1
+                if throttled and status['restarts'] > BACKUP_MAX_RESTARTS:
+                    raise _Restarted()
+            status.update(pages_total=total, pages_remaining=remaining,
+                          percent=round(100.0 * (total - remaining) / total, 1) if total else 100.0)
+            self._publish_backup_status()
+            if remaining and step_sleep > 0:
+                time.sleep(step_sleep)
+        
+        source = self._open_connection()
+        try:
+            target = sqlite3.connect(target_path)
+            try:
+                source.backup(target, pages=pages, progress=progress)
+                return
+            except _Restarted:
+                logger.warning("⚠️  Backup kept restarting under concurrent writes, finishing in one step")
+                throttled = False
+                source.backup(target, pages=-1, progress=progress)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    
+    def get_backup_status(self) -> Dict[str, Any]:
+        """Progress of the running backup, or the result of the last one, from any process."""
+        local = dict(self._backup_status)
+        if local['state'] == 'running':
+            return local
+        shared = self._read_backup_status()
+        if not shared or shared.get('started_at', '') < local.get('started_at', ''):
+            return local
+        if shared.get('state') == 'running' and not self._backup_running_elsewhere():
+            # The process running it exited before finishing
+            shared['state'] = 'interrupted'
+        return shared
+    
+    def rotate_backups(self, keep: int, directory: str = None) -> List[str]:
+        """
+        Delete all but the newest `keep` timestamped backups of this database.
+        
+        Args:
+            keep: Number of backups to keep
+            directory: Where the backups live. Defaults to the database directory.
+            
+        Returns:
+            Paths of the deleted backups
+        """
+        directory = directory or os.path.dirname(os.path.abspath(self.db_path))
+        pattern = os.path.join(directory, glob.escape(os.path.basename(self.db_path)) + '.backup_*')
+        backups = sorted((path for path in glob.glob(pattern) if not path.endswith('.partial')),
+                         key=os.path.getmtime, reverse=True)
+        removed = []
+        for path in backups[max(keep, 0):]:
+            os.remove(path)
+            removed.append(path)
+        if removed:
+            logger.info(f"🗑️  Rotated {len(removed)} old database backup(s)")
+        return removed
+    
+    def start_backup_schedule(self, interval: float, keep: int, directory: str = None,
+                              compress: bool = True) -> bool:
+        """
+        Back up every `interval` seconds from a background thread, keeping `keep` backups.
+        
+        Every worker process may start a schedule; a tick is skipped when
+        another process is mid-backup or finished one within the interval,
+        so the workers together take one backup per interval.
+        
+        Returns:
+            False if a schedule is already running
+        """
+        if self._backup_schedule is not None:
+            return False
+        stop = self._backup_schedule = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                last = self._read_backup_status()
+                if last.get('state') == 'completed' and time.time() - last.get('finished_epoch', 0) < interval * 0.9:
+                    continue
+                if self._backup_running_elsewhere():
+                    continue
+                try:
+                    self.backup(self.resolve_backup_path(directory=directory), compress=compress)
+                    self.rotate_backups(keep, directory)
+                except Exception as e:
+                    logger.error(f"💥 Scheduled backup failed: {e}")
+        
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        threading.Thread(target=run, name='hexstrike-backup-scheduler', daemon=True).start()
+        logger.info(f"🗄️  Scheduled database backups every {interval}s (keeping {keep})")
+        return True
+    
+    def stop_backup_schedule(self):
+        """Stop scheduled backups after the current one finishes."""
+        if self._backup_schedule is not None:
+            self._backup_schedule.set()
+            self._backup_schedule = None
 
 
 # Singleton instance for easy access
@@ -899,12 +2408,16 @@ if __name__ == "__main__":
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
     parser.add_argument("--vacuum", action="store_true", help="Optimize the database")
     parser.add_argument("--backup", type=str, help="Create a backup to the specified path")
+    parser.add_argument("--compress", action="store_true", help="Gzip the backup")
+    parser.add_argument("--keep", type=int, help="After --backup, keep only this many timestamped backups")
     parser.add_argument("--db-path", type=str, help="Custom database path")
     parser.add_argument("--list-settings", action="store_true", help="List all settings")
     parser.add_argument("--set", nargs=3, metavar=('CATEGORY', 'KEY', 'VALUE'),
                         help="Set a setting value")
     parser.add_argument("--get", nargs=2, metavar=('CATEGORY', 'KEY'),
                         help="Get a setting value")
+    parser.add_argument("--check-query-plans", action="store_true",
+                        help="Verify every list query is served by an index (exit 1 otherwise)")
     
     args = parser.parse_args()
     
@@ -930,8 +2443,11 @@ if __name__ == "__main__":
         print("✅ Database optimized")
     
     if args.backup:
-        backup_path = db.backup(args.backup)
-        print(f"✅ Backup created: {backup_path}")
+        backup_path = db.backup(args.backup, compress=args.compress)
+        status = db.get_backup_status()
+        print(f"✅ Backup created: {backup_path} ({status['size_bytes']} bytes in {status['duration_seconds']}s)")
+        if args.keep is not None:
+            db.rotate_backups(args.keep, os.path.dirname(os.path.abspath(backup_path)))
     
     if args.list_settings:
         settings = db.get_all_settings()
@@ -953,3 +2469,12 @@ if __name__ == "__main__":
         category, key = args.get
         value = db.get_setting(category, key)
         print(f"{category}.{key} = {value}")
+    
+    if args.check_query_plans:
+        problems = db.check_query_plans()
+        if problems:
+            print("❌ Query plan regressions:")
+            for problem in problems:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        print("✅ All list queries use an index")
@@ -31,16 +31,29 @@ import hashlib
 import pickle
 import base64
 import queue
-from concurrent.futures import ThreadPoolExecutor
+import atexit
+import copy
+import sqlite3
+import heapq
+import zlib
+import math
+import itertools
+import ipaddress
+import tempfile
+import uuid
+import codecs
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import shutil
 import venv
 import zipfile
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, copy_current_request_context
 from flask_cors import CORS
+from hexstrike_database import get_database, encode_cursor, decode_cursor, MAX_PAGE_SIZE, SEVERITY_RANKS
 import psutil
 import signal
 import requests
@@ -49,11 +62,24 @@ import socket
 import urllib.parse
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Set, Tuple
+from typing import List, Set, Tuple, Iterator
 import asyncio
 import aiohttp
 from urllib.parse import urljoin, urlparse, parse_qs
 from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+
+# Optional: lxml speeds up spider link extraction
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# Optional: zstandard compresses proxy history bodies (zlib otherwise)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 import selenium
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -2162,12 +2188,13 @@ class IntelligentErrorHandler:
     def _get_system_resources(self) -> Dict[str, Any]:
         """Get current system resource information"""
         try:
+            snapshot = resource_sampler.get_snapshot()
             return {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
-                "disk_percent": psutil.disk_usage('/').percent,
-                "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else None,
-                "active_processes": len(psutil.pids())
+                "cpu_percent": snapshot["cpu_percent"],
+                "memory_percent": snapshot["memory_percent"],
+                "disk_percent": snapshot["disk_percent"],
+                "load_average": snapshot["load_average"],
+                "active_processes": snapshot["active_processes"]
             }
         except Exception:
             return {"error": "Unable to get system resources"}
@@ -2213,12 +2240,22 @@ class IntelligentErrorHandler:
             "recent_errors": recent_errors[-10:]  # Last 10 recent errors
         }
 
+DEGRADATION_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995]  # basic port check fallback
+DEGRADATION_PATHS = ["/admin", "/login", "/api", "/wp-admin", "/phpmyadmin", "/robots.txt"]  # basic directory check fallback
+DEGRADATION_CONNECT_TIMEOUT = 2  # seconds per port probe
+DEGRADATION_HTTP_TIMEOUT = 5  # seconds per path probe
+DEGRADATION_DEADLINE = float(os.environ.get("HEXSTRIKE_DEGRADATION_DEADLINE", "8"))  # seconds for a whole batch of fallback checks
+DEGRADATION_CONCURRENCY = 256  # probes in flight per batch
+DEGRADATION_FOUND_STATUSES = (200, 301, 302, 403)
+
 class GracefulDegradation:
     """Ensure system continues operating even with partial tool failures"""
 
-    def __init__(self):
+    def __init__(self, ports: List[int] = None, paths: List[str] = None):
         self.fallback_chains = self._initialize_fallback_chains()
         self.critical_operations = self._initialize_critical_operations()
+        self.common_ports = list(ports or DEGRADATION_PORTS)
+        self.common_dirs = list(paths or DEGRADATION_PATHS)
 
     def _initialize_fallback_chains(self) -> Dict[str, List[List[str]]]:
         """Initialize fallback tool chains for critical operations"""
@@ -2298,14 +2335,23 @@ class GracefulDegradation:
             "timestamp": datetime.now().isoformat()
         }
 
+        # Target lists are checked in one batch and reported per target
+        targets = partial_results.get("targets")
+
         # Try to fill gaps based on operation type
         if operation == "network_discovery" and "open_ports" not in partial_results:
             # Try basic port check if full scan failed
-            enhanced_results["open_ports"] = self._basic_port_check(partial_results.get("target"))
+            if isinstance(targets, list):
+                enhanced_results["open_ports"] = self.basic_port_check(targets)
+            else:
+                enhanced_results["open_ports"] = self._basic_port_check(partial_results.get("target"))
 
         elif operation == "web_discovery" and "directories" not in partial_results:
             # Try basic directory check
-            enhanced_results["directories"] = self._basic_directory_check(partial_results.get("target"))
+            if isinstance(targets, list):
+                enhanced_results["directories"] = self.basic_directory_check(targets)
+            else:
+                enhanced_results["directories"] = self._basic_directory_check(partial_results.get("target"))
 
         elif operation == "vulnerability_scanning" and "vulnerabilities" not in partial_results:
             # Provide basic security headers check
@@ -2323,41 +2369,126 @@ class GracefulDegradation:
         """Basic port connectivity check"""
         if not target:
             return []
-
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995]
-        open_ports = []
-
-        for port in common_ports:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                result = sock.connect_ex((target, port))
-                if result == 0:
-                    open_ports.append(port)
-                sock.close()
-            except Exception:
-                continue
-
-        return open_ports
+        return self.basic_port_check([target]).get(target, [])
 
     def _basic_directory_check(self, target: str) -> List[str]:
         """Basic directory existence check"""
         if not target:
             return []
+        return self.basic_directory_check([target]).get(target, [])
+
+    def basic_port_check(self, targets: List[str], ports: List[int] = None,
+                         deadline: float = None) -> Dict[str, List[int]]:
+        """Probe ports on every target in one concurrent batch; returns open ports per target"""
+        return self.run_basic_checks(targets, ["ports"], ports=ports, deadline=deadline)["open_ports"]
+
+    def basic_directory_check(self, targets: List[str], paths: List[str] = None,
+                              deadline: float = None) -> Dict[str, List[str]]:
+        """Probe paths on every target in one concurrent batch; returns found paths per target"""
+        return self.run_basic_checks(targets, ["directories"], paths=paths, deadline=deadline)["directories"]
+
+    def run_basic_checks(self, targets: List[str], checks: List[str] = ("ports", "directories"),
+                         ports: List[int] = None, paths: List[str] = None,
+                         deadline: float = None) -> Dict[str, Any]:
+        """Run the port and directory fallbacks for all targets as one asyncio batch.
+
+        Every probe shares a single deadline, so the batch takes about one
+        probe timeout regardless of the number of targets, ports and paths.
+        Probes still pending at the deadline are cancelled and reported.
+        """
+        targets = [target for target in dict.fromkeys(targets or []) if target]
+        ports = [int(port) for port in (ports or self.common_ports)]
+        paths = [path if path.startswith("/") else f"/{path}" for path in (paths or self.common_dirs)]
+        deadline = DEGRADATION_DEADLINE if deadline is None else float(deadline)
+        return asyncio.run(self._run_basic_checks(targets, set(checks), ports, paths, deadline))
+
+    @staticmethod
+    def _probe_host(target: str) -> str:
+        """Host to connect to for a target given as a host, IP (v4 or bare/bracketed v6) or URL"""
+        bare = target.strip("[]")
+        try:
+            return str(ipaddress.ip_address(bare))
+        except ValueError:
+            pass
+        try:
+            host = urlparse(target if "://" in target else f"//{target}").hostname
+        except ValueError:
+            host = None
+        return host or bare
+
+    async def _run_basic_checks(self, targets: List[str], checks: Set[str], ports: List[int],
+                                paths: List[str], deadline: float) -> Dict[str, Any]:
+        started = time.time()
+        semaphore = asyncio.Semaphore(DEGRADATION_CONCURRENCY)
+        open_ports = {target: [] for target in targets} if "ports" in checks else None
+        directories = {target: [] for target in targets} if "directories" in checks else None
+        tasks = []
+        session = None
+
+        async def probe_port(target: str, host: str, port: int):
+            async with semaphore:
+                try:
+                    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port),
+                                                       DEGRADATION_CONNECT_TIMEOUT)
+                except (OSError, asyncio.TimeoutError):
+                    return
+                open_ports[target].append(port)
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
 
-        common_dirs = ["/admin", "/login", "/api", "/wp-admin", "/phpmyadmin", "/robots.txt"]
-        found_dirs = []
+        async def probe_path(target: str, base: str, path: str):
+            async with semaphore:
+                try:
+                    async with session.head(f"{base.rstrip('/')}{path}", allow_redirects=True) as response:
+                        if response.status in DEGRADATION_FOUND_STATUSES:
+                            directories[target].append(path)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    return
+
+        if open_ports is not None:
+            for target in targets:
+                host = self._probe_host(target)
+                tasks.extend(asyncio.create_task(probe_port(target, host, port)) for port in ports)
+        if directories is not None:
+            session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=DEGRADATION_HTTP_TIMEOUT))
+            for target in targets:
+                host = self._probe_host(target)
+                if "://" in target:
+                    base = target
+                elif ":" in host and not target.startswith("["):
+                    base = f"http://[{host}]"  # bare IPv6 address
+                else:
+                    base = f"http://{target}"
+                tasks.extend(asyncio.create_task(probe_path(target, base, path)) for path in paths)
 
-        for directory in common_dirs:
-            try:
-                url = f"{target.rstrip('/')}{directory}"
-                response = requests.head(url, timeout=5, allow_redirects=True)
-                if response.status_code in [200, 301, 302, 403]:
-                    found_dirs.append(directory)
-            except Exception:
-                continue
+        pending = set()
+        try:
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=deadline)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    logger.warning(f"⏰ Basic checks hit the {deadline}s deadline with {len(pending)} probes pending")
+        finally:
+            if session is not None:
+                await session.close()
 
-        return found_dirs
+        result = {
+            "targets": targets,
+            "probes": len(tasks),
+            "timed_out": len(pending),
+            "elapsed": round(time.time() - started, 3)
+        }
+        if open_ports is not None:
+            result["open_ports"] = {target: sorted(found) for target, found in open_ports.items()}
+        if directories is not None:
+            result["directories"] = {target: [path for path in paths if path in found]
+                                     for target, found in directories.items()}
+        return result
 
     def _basic_security_check(self, target: str) -> List[Dict[str, Any]]:
         """Basic security headers check"""
@@ -2445,6 +2576,161 @@ class GracefulDegradation:
 error_handler = IntelligentErrorHandler()
 degradation_manager = GracefulDegradation()
 
+CIRCUIT_FAILURE_THRESHOLD = 3  # classified failures before a breaker opens
+CIRCUIT_COOLDOWN = 60  # seconds a breaker stays open before a half-open probe
+CIRCUIT_MAX_COOLDOWN = 900  # cool-down doubles after failed probes up to this limit
+# Error types that say "this will keep failing"; others never trip a breaker
+CIRCUIT_TRIP_ERRORS = {
+    ErrorType.TOOL_NOT_FOUND,
+    ErrorType.TARGET_UNREACHABLE,
+    ErrorType.NETWORK_UNREACHABLE,
+    ErrorType.TIMEOUT,
+    ErrorType.PERMISSION_DENIED,
+    ErrorType.AUTHENTICATION_FAILED,
+}
+# Error types that do not depend on the target; these open a breaker for every target of the tool
+CIRCUIT_TOOL_WIDE_ERRORS = {ErrorType.TOOL_NOT_FOUND, ErrorType.PERMISSION_DENIED}
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreakerRegistry:
+    """Per-(tool, target) circuit breakers fed by classified tool failures.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures of a tripping error
+    type the breaker opens and calls fail fast with the cached error. Once the
+    cool-down passes a single half-open probe is let through; its outcome
+    closes the breaker or re-opens it with a longer cool-down.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown: int = CIRCUIT_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.breakers = {}  # (tool, target) -> breaker dict
+        self.breaker_lock = threading.Lock()
+        self.stats = {"short_circuited": 0, "opened": 0, "closed": 0, "probes": 0}
+
+    def _breaker(self, key: Tuple[str, str]) -> Dict[str, Any]:
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = {
+                "state": CircuitState.CLOSED, "failures": 0, "cooldown": self.cooldown,
+                "opened_at": None, "retry_at": None, "probe_started": None,
+                "last_error": None, "last_error_type": None
+            }
+        return breaker
+
+    def _blocked_response(self, key: Tuple[str, str], breaker: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "tool": key[0],
+            "target": key[1],
+            "state": breaker["state"].value,
+            "error_type": breaker["last_error_type"],
+            "error": breaker["last_error"],
+            "retry_after": max(0.0, round(breaker["retry_at"] - time.time(), 1))
+        }
+
+    def before_call(self, tool: str, target: str) -> Optional[Dict[str, Any]]:
+        """Return the cached failure if the call should fail fast, or None to proceed"""
+        now = time.time()
+        with self.breaker_lock:
+            for key in ((tool, "*"), (tool, target)):
+                breaker = self.breakers.get(key)
+                if breaker is None or breaker["state"] == CircuitState.CLOSED:
+                    continue
+                if breaker["state"] == CircuitState.OPEN and now >= breaker["retry_at"]:
+                    # Cool-down over: let this caller probe
+                    breaker["state"] = CircuitState.HALF_OPEN
+                    breaker["probe_started"] = now
+                    self.stats["probes"] += 1
+                    logger.info(f"🔌 Circuit half-open for {tool} on {key[1]}, probing")
+                    continue
+                if breaker["state"] == CircuitState.HALF_OPEN and now - breaker["probe_started"] > breaker["cooldown"]:
+                    # The previous probe never reported back
+                    breaker["probe_started"] = now
+                    self.stats["probes"] += 1
+                    continue
+                self.stats["short_circuited"] += 1
+                return self._blocked_response(key, breaker)
+        return None
+
+    def record_success(self, tool: str, target: str):
+        """Close the breakers of a tool/target after a successful call"""
+        with self.breaker_lock:
+            for key in ((tool, "*"), (tool, target)):
+                breaker = self.breakers.get(key)
+                if breaker is None:
+                    continue
+                if breaker["state"] != CircuitState.CLOSED:
+                    self.stats["closed"] += 1
+                    logger.info(f"✅ Circuit closed for {tool} on {key[1]}")
+                del self.breakers[key]
+
+    def record_failure(self, tool: str, target: str, error_type: ErrorType, error_message: str) -> bool:
+        """Count a classified failure; returns True if the breaker is (now) open"""
+        if error_type not in CIRCUIT_TRIP_ERRORS:
+            return False
+        key = (tool, "*") if error_type in CIRCUIT_TOOL_WIDE_ERRORS else (tool, target)
+        now = time.time()
+        with self.breaker_lock:
+            breaker = self._breaker(key)
+            breaker["failures"] += 1
+            breaker["last_error"] = error_message[:500]
+            breaker["last_error_type"] = error_type.value
+
+            if breaker["state"] == CircuitState.HALF_OPEN:
+                # Failed probe: back off further
+                breaker["cooldown"] = min(breaker["cooldown"] * 2, CIRCUIT_MAX_COOLDOWN)
+            elif breaker["state"] == CircuitState.OPEN or breaker["failures"] < self.failure_threshold:
+                return breaker["state"] == CircuitState.OPEN
+
+            breaker["state"] = CircuitState.OPEN
+            breaker["opened_at"] = now
+            breaker["retry_at"] = now + breaker["cooldown"]
+            self.stats["opened"] += 1
+        logger.warning(f"🚧 Circuit open for {tool} on {key[1]} ({error_type.value}), "
+                       f"failing fast for {breaker['cooldown']}s")
+        return True
+
+    def reset(self, tool: str = None, target: str = None) -> int:
+        """Forget breakers, optionally only those matching a tool and/or target"""
+        with self.breaker_lock:
+            keys = [key for key in self.breakers
+                    if (tool is None or key[0] == tool) and (target is None or key[1] == target)]
+            for key in keys:
+                del self.breakers[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Breaker states for monitoring"""
+        now = time.time()
+        with self.breaker_lock:
+            breakers = []
+            for (tool, target), breaker in self.breakers.items():
+                breakers.append({
+                    "tool": tool,
+                    "target": target,
+                    "state": breaker["state"].value,
+                    "failures": breaker["failures"],
+                    "last_error_type": breaker["last_error_type"],
+                    "last_error": breaker["last_error"],
+                    "cooldown": breaker["cooldown"],
+                    "retry_after": max(0.0, round(breaker["retry_at"] - now, 1)) if breaker["retry_at"] else None
+                })
+            return {
+                "failure_threshold": self.failure_threshold,
+                "open": sum(1 for b in breakers if b["state"] == CircuitState.OPEN.value),
+                "half_open": sum(1 for b in breakers if b["state"] == CircuitState.HALF_OPEN.value),
+                "tracked": len(breakers),
+                "breakers": breakers,
+                **self.stats
+            }
+
+# Global circuit breaker registry
+circuit_breakers = CircuitBreakerRegistry()
+
 # ============================================================================
 # BUG BOUNTY HUNTING SPECIALIZED WORKFLOWS (v6.0 ENHANCEMENT)
 # ============================================================================
@@ -4556,6 +4842,111 @@ class FailureRecoverySystem:
                 return tool
         return "unknown"
 
+RESOURCE_SAMPLE_INTERVAL = float(os.environ.get("HEXSTRIKE_RESOURCE_SAMPLE_INTERVAL", 2.0))  # seconds
+RESOURCE_HISTORY_SIZE = 300  # 10 minutes at the default cadence
+# Walking the socket table is expensive on busy hosts, so it is refreshed far less often
+RESOURCE_CONNECTIONS_INTERVAL = float(os.environ.get("HEXSTRIKE_RESOURCE_CONNECTIONS_INTERVAL", 60.0))  # seconds
+
+class ResourceSampler:
+    """Background sampler that publishes system resource snapshots.
+
+    A single daemon thread samples CPU, memory, disk and network at a fixed
+    cadence and swaps in a new immutable snapshot dict. Readers just take the
+    current reference, so they never block on psutil or contend on a lock.
+    """
+
+    def __init__(self, interval: float = RESOURCE_SAMPLE_INTERVAL, history_size: int = RESOURCE_HISTORY_SIZE):
+        self.interval = interval
+        self.history = deque(maxlen=history_size)
+        self.snapshot = self._sample(None)
+        self.history.append(self.snapshot)
+
+        # Start sampler thread
+        self.sampler_thread = threading.Thread(target=self._sample_loop, name="hexstrike-resource-sampler", daemon=True)
+        self.sampler_thread.start()
+
+    def _sample(self, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Take one sample; network rates are derived from the previous snapshot"""
+        now = time.time()
+        snapshot = {
+            "cpu_percent": 0.0,
+            "memory_percent": 0.0,
+            "memory_available_gb": 0.0,
+            "disk_percent": 0.0,
+            "disk_free_gb": 0.0,
+            "network_bytes_sent": 0,
+            "network_bytes_recv": 0,
+            "network_io": {},
+            "network_send_rate": 0.0,
+            "network_recv_rate": 0.0,
+            "load_average": None,
+            "active_processes": 0,
+            "active_connections": 0,
+            "active_connections_sampled_at": None,
+            "timestamp": now
+        }
+
+        try:
+            # Non-blocking: measures CPU since the previous call
+            snapshot["cpu_percent"] = psutil.cpu_percent(interval=None)
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage('/')
+            snapshot.update({
+                "memory_percent": memory.percent,
+                "memory_available_gb": memory.available / (1024**3),
+                "disk_percent": disk.percent,
+                "disk_free_gb": disk.free / (1024**3),
+                "active_processes": len(psutil.pids())
+            })
+
+            network = psutil.net_io_counters()
+            if network:
+                snapshot["network_bytes_sent"] = network.bytes_sent
+                snapshot["network_bytes_recv"] = network.bytes_recv
+                snapshot["network_io"] = network._asdict()
+                if previous and now > previous["timestamp"]:
+                    elapsed = now - previous["timestamp"]
+                    snapshot["network_send_rate"] = max(0, network.bytes_sent - previous["network_bytes_sent"]) / elapsed
+                    snapshot["network_recv_rate"] = max(0, network.bytes_recv - previous["network_bytes_recv"]) / elapsed
+
+            if hasattr(os, 'getloadavg'):
+                snapshot["load_average"] = os.getloadavg()
+        except Exception as e:
+            logger.error(f"💥 Error sampling resource usage: {str(e)}")
+
+        sampled_at = previous["active_connections_sampled_at"] if previous else None
+        if sampled_at is not None and now - sampled_at < RESOURCE_CONNECTIONS_INTERVAL:
+            snapshot["active_connections"] = previous["active_connections"]
+            snapshot["active_connections_sampled_at"] = sampled_at
+        else:
+            try:
+                snapshot["active_connections"] = len(psutil.net_connections())
+            except (psutil.AccessDenied, PermissionError, OSError):
+                snapshot["active_connections"] = previous["active_connections"] if previous else 0
+            snapshot["active_connections_sampled_at"] = now
+
+        return snapshot
+
+    def _sample_loop(self):
+        """Sample resources at a fixed cadence"""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._sample(self.snapshot)
+            self.history.append(snapshot)
+            self.snapshot = snapshot
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Latest published snapshot (do not mutate - copy first)"""
+        return self.snapshot
+
+    def get_history(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Sampled time series, oldest first"""
+        history = list(self.history)
+        return history[-limit:] if limit else history
+
+# Global resource sampler instance
+resource_sampler = ResourceSampler()
+
 class PerformanceMonitor:
     """Advanced performance monitoring with automatic resource allocation"""
 
@@ -4594,18 +4985,15 @@ class PerformanceMonitor:
     def monitor_system_resources(self) -> Dict[str, float]:
         """Monitor current system resource usage"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            network = psutil.net_io_counters()
+            snapshot = resource_sampler.get_snapshot()
 
             return {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "disk_percent": disk.percent,
-                "network_bytes_sent": network.bytes_sent,
-                "network_bytes_recv": network.bytes_recv,
-                "timestamp": time.time()
+                "cpu_percent": snapshot["cpu_percent"],
+                "memory_percent": snapshot["memory_percent"],
+                "disk_percent": snapshot["disk_percent"],
+                "network_bytes_sent": snapshot["network_bytes_sent"],
+                "network_bytes_recv": snapshot["network_bytes_recv"],
+                "timestamp": snapshot["timestamp"]
             }
         except Exception as e:
             logger.error(f"Error monitoring system resources: {str(e)}")
@@ -4889,18 +5277,244 @@ class ParameterOptimizer:
 # ADVANCED PROCESS MANAGEMENT AND MONITORING (v10.0 ENHANCEMENT)
 # ============================================================================
 
+# Task priorities for the process pool (lower runs first)
+TASK_PRIORITIES = {"critical": 0, "high": 25, "normal": 50, "low": 75, "background": 100}
+DEFAULT_TASK_PRIORITY = TASK_PRIORITIES["normal"]
+
+# Seconds of queue wait worth one priority point, so starved low-priority tasks age upwards
+POOL_PRIORITY_AGING_SECONDS = 2.0
+
+# Maximum concurrently running tasks per tool and per resource class (None = unlimited)
+POOL_TOOL_CONCURRENCY_LIMITS = {
+    "masscan": 2,
+    "rustscan": 2,
+    "nmap": 4,
+    "hashcat": 1,
+    "john": 1,
+    "hydra": 2,
+    "nuclei": 4,
+    "sqlmap": 3
+}
+
+POOL_CLASS_CONCURRENCY_LIMITS = {
+    "network_heavy": 6,
+    "cpu_heavy": max(1, (os.cpu_count() or 2) // 2),
+    "default": None
+}
+
+TOOL_RESOURCE_CLASSES = {
+    "masscan": "network_heavy",
+    "rustscan": "network_heavy",
+    "nmap": "network_heavy",
+    "amass": "network_heavy",
+    "hydra": "network_heavy",
+    "hashcat": "cpu_heavy",
+    "john": "cpu_heavy",
+    "ophcrack": "cpu_heavy",
+    "angr": "cpu_heavy",
+    "ghidra": "cpu_heavy"
+}
+
+COMMAND_WRAPPERS = {"sudo", "nice", "timeout", "stdbuf", "nohup", "time", "env"}
+
+def extract_tool_name(command: str) -> str:
+    """Best-effort name of the tool a shell command runs (skips sudo/nice/env wrappers)"""
+    try:
+        tokens = command.strip().split()
+    except AttributeError:
+        return "unknown"
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if "=" in token and not token.startswith("-") and token.split("=", 1)[0].isidentifier():
+            i += 1  # VAR=value environment prefix
+        elif os.path.basename(token) in COMMAND_WRAPPERS:
+            i += 1
+            # Skip wrapper options and their numeric arguments (nice -n 10, timeout 60)
+            while i < len(tokens) and (tokens[i].startswith("-") or tokens[i].replace(".", "", 1).isdigit()):
+                i += 1
+        else:
+            return os.path.basename(token).lower()
+    return "unknown"
+
+TASK_RESULT_TTL = int(os.environ.get("HEXSTRIKE_TASK_RESULT_TTL", 3600))  # 1 hour
+TASK_RESULT_MAX_BYTES = int(os.environ.get("HEXSTRIKE_TASK_RESULT_MAX_BYTES", 256 * 1024 * 1024))  # in-memory budget
+TASK_RESULT_SPILL_BYTES = int(os.environ.get("HEXSTRIKE_TASK_RESULT_SPILL_BYTES", 4 * 1024 * 1024))  # 0 disables spill
+TASK_RESULT_MAX_DISK_BYTES = int(os.environ.get("HEXSTRIKE_TASK_RESULT_MAX_DISK_BYTES", 2 * 1024 * 1024 * 1024))
+TASK_RESULT_TOMBSTONES = 10000  # remembered evicted/expired IDs
+
+class TaskResultStore:
+    """Bounded store for async task results.
+
+    Entries carry a TTL; in-memory results are kept within a byte budget with LRU
+    eviction, and results above the spill threshold are written to disk instead.
+    IDs of evicted or expired entries are remembered so lookups can report
+    "expired" rather than "not_found".
+    """
+
+    def __init__(self, ttl: int = TASK_RESULT_TTL, max_bytes: int = TASK_RESULT_MAX_BYTES,
+                 spill_threshold: int = TASK_RESULT_SPILL_BYTES, max_disk_bytes: int = TASK_RESULT_MAX_DISK_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.spill_threshold = spill_threshold
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_dir = None
+        self.entries = OrderedDict()  # task_id -> {"result", "path", "size", "expires_at"}
+        self.tombstones = OrderedDict()  # task_id -> reason
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.stats = {"stored": 0, "evictions": 0, "expirations": 0, "spills": 0}
+        self.store_lock = threading.Lock()
+
+    def put(self, task_id: str, result: Dict[str, Any], ttl: int = None):
+        """Store a task result"""
+        payload = json.dumps(result, default=str)
+        size = len(payload)
+        entry = {"result": result, "path": None, "size": size,
+                 "expires_at": time.time() + (ttl if ttl is not None else self.ttl)}
+
+        if self.spill_threshold and size > self.spill_threshold:
+            entry["path"] = self._spill(task_id, payload)
+            entry["result"] = None
+
+        with self.store_lock:
+            self._remove(task_id)
+            self.tombstones.pop(task_id, None)
+            self.entries[task_id] = entry
+            if entry["path"]:
+                self.disk_bytes += size
+                self.stats["spills"] += 1
+            else:
+                self.memory_bytes += size
+            self.stats["stored"] += 1
+            self._enforce_limits()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result, {"status": "expired", ...} for dropped IDs, or None if unknown"""
+        with self.store_lock:
+            entry = self.entries.get(task_id)
+            if entry is not None and entry["expires_at"] <= time.time():
+                self._drop(task_id, "ttl")
+                self.stats["expirations"] += 1
+                entry = None
+
+            if entry is None:
+                reason = self.tombstones.get(task_id)
+                if reason:
+                    return {"status": "expired", "result": None, "reason": reason}
+                return None
+
+            self.entries.move_to_end(task_id)
+            path = entry["path"]
+            if path is None:
+                return entry["result"]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"💥 Could not load spilled task result {task_id}: {str(e)}")
+            return {"status": "expired", "result": None, "reason": "spill_unreadable"}
+
+    def purge_expired(self) -> int:
+        """Drop all entries past their TTL"""
+        now = time.time()
+        with self.store_lock:
+            expired = [task_id for task_id, entry in self.entries.items() if entry["expires_at"] <= now]
+            for task_id in expired:
+                self._drop(task_id, "ttl")
+            self.stats["expirations"] += len(expired)
+        return len(expired)
+
+    def _spill(self, task_id: str, payload: str) -> str:
+        """Write a large result to the spill directory"""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="hexstrike_task_results_")
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", task_id)
+        path = os.path.join(self.spill_dir, f"{safe_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        return path
+
+    def _remove(self, task_id: str):
+        """Remove an entry and release its accounting (caller holds store_lock)"""
+        entry = self.entries.pop(task_id, None)
+        if entry is None:
+            return
+        if entry["path"]:
+            self.disk_bytes -= entry["size"]
+            try:
+                os.unlink(entry["path"])
+            except OSError:
+                pass
+        else:
+            self.memory_bytes -= entry["size"]
+
+    def _drop(self, task_id: str, reason: str):
+        """Remove an entry but remember its ID (caller holds store_lock)"""
+        self._remove(task_id)
+        self.tombstones[task_id] = reason
+        while len(self.tombstones) > TASK_RESULT_TOMBSTONES:
+            self.tombstones.popitem(last=False)
+
+    def _enforce_limits(self):
+        """Evict least recently used entries until both budgets are met (caller holds store_lock)"""
+        for task_id in list(self.entries):
+            if self.memory_bytes <= self.max_bytes and self.disk_bytes <= self.max_disk_bytes:
+                break
+            entry = self.entries[task_id]
+            over_disk = entry["path"] and self.disk_bytes > self.max_disk_bytes
+            over_memory = not entry["path"] and self.memory_bytes > self.max_bytes
+            if over_disk or over_memory:
+                self._drop(task_id, "evicted")
+                self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        with self.store_lock:
+            spilled = sum(1 for entry in self.entries.values() if entry["path"])
+            return {
+                "entries": len(self.entries),
+                "memory_entries": len(self.entries) - spilled,
+                "spilled_entries": spilled,
+                "memory_bytes": self.memory_bytes,
+                "disk_bytes": self.disk_bytes,
+                "max_bytes": self.max_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "ttl": self.ttl,
+                "remembered_expired_ids": len(self.tombstones),
+                **self.stats
+            }
+
 class ProcessPool:
-    """Intelligent process pool with auto-scaling capabilities"""
+    """Intelligent process pool with auto-scaling and priority-aware scheduling.
+
+    Pending tasks sit in a heap ordered by priority plus submission time, so a
+    task gains one priority point per POOL_PRIORITY_AGING_SECONDS it waits and
+    cannot starve. Per-tool and per-resource-class concurrency limits are
+    enforced when a worker picks its next task.
+    """
 
-    def __init__(self, min_workers=2, max_workers=20, scale_threshold=0.8):
+    def __init__(self, min_workers=2, max_workers=20, scale_threshold=0.8,
+                 tool_limits: Dict[str, int] = None, class_limits: Dict[str, Optional[int]] = None):
         self.min_workers = min_workers
         self.max_workers = max_workers
         self.scale_threshold = scale_threshold
         self.workers = []
-        self.task_queue = queue.Queue()
-        self.results = {}
+        self.worker_counter = 0
+        self.pending_shutdowns = 0
+        self.task_heap = []  # [sort_key, seq, task]
+        self.task_seq = 0
+        self.results = TaskResultStore()
         self.pool_lock = threading.Lock()
+        self.scheduler_cond = threading.Condition(self.pool_lock)
         self.active_tasks = {}
+        self.tool_limits = dict(POOL_TOOL_CONCURRENCY_LIMITS if tool_limits is None else tool_limits)
+        self.class_limits = dict(POOL_CLASS_CONCURRENCY_LIMITS if class_limits is None else class_limits)
+        self.running_by_tool = {}
+        self.running_by_class = {}
+        self.wait_stats = {}  # resource class -> queue wait statistics
         self.performance_metrics = {
             "tasks_completed": 0,
             "tasks_failed": 0,
@@ -4916,33 +5530,104 @@ class ProcessPool:
         self.monitor_thread = threading.Thread(target=self._monitor_performance, daemon=True)
         self.monitor_thread.start()
 
-    def submit_task(self, task_id: str, func, *args, **kwargs) -> str:
-        """Submit a task to the process pool"""
+    @staticmethod
+    def resolve_priority(priority) -> int:
+        """Accept a numeric priority or one of the TASK_PRIORITIES names"""
+        if isinstance(priority, str):
+            if priority.lower() in TASK_PRIORITIES:
+                return TASK_PRIORITIES[priority.lower()]
+            priority = int(priority)
+        if priority is None:
+            return DEFAULT_TASK_PRIORITY
+        return max(0, int(priority))
+
+    def submit_task(self, task_id: str, func, *args, priority=DEFAULT_TASK_PRIORITY,
+                    resource_class: str = None, tool: str = None, **kwargs) -> str:
+        """Submit a task to the process pool.
+
+        Args:
+            priority: Numeric priority (lower runs first) or a TASK_PRIORITIES name
+            resource_class: Concurrency class; defaults to the tool's class or "default"
+            tool: Tool name used for per-tool concurrency limits
+        """
+        tool = (tool or "unknown").lower()
+        resource_class = resource_class or TOOL_RESOURCE_CLASSES.get(tool, "default")
+        priority = self.resolve_priority(priority)
+        submitted_at = time.time()
+
         task = {
             "id": task_id,
             "func": func,
             "args": args,
             "kwargs": kwargs,
-            "submitted_at": time.time(),
-            "status": "queued"
+            "submitted_at": submitted_at,
+            "status": "queued",
+            "priority": priority,
+            "resource_class": resource_class,
+            "tool": tool
         }
 
-        with self.pool_lock:
+        with self.scheduler_cond:
             self.active_tasks[task_id] = task
-            self.task_queue.put(task)
+            self.task_seq += 1
+            sort_key = priority * POOL_PRIORITY_AGING_SECONDS + submitted_at
+            heapq.heappush(self.task_heap, [sort_key, self.task_seq, task])
+            self.scheduler_cond.notify()
 
-        logger.info(f"📋 Task submitted to pool: {task_id}")
+        logger.info(f"📋 Task submitted to pool: {task_id} | priority {priority} | class {resource_class} | tool {tool}")
         return task_id
 
     def get_task_result(self, task_id: str) -> Dict[str, Any]:
         """Get result of a submitted task"""
         with self.pool_lock:
-            if task_id in self.results:
-                return self.results[task_id]
-            elif task_id in self.active_tasks:
+            if task_id in self.active_tasks:
                 return {"status": self.active_tasks[task_id]["status"], "result": None}
-            else:
-                return {"status": "not_found", "result": None}
+
+        stored = self.results.get(task_id)
+        if stored is not None:
+            return stored
+        return {"status": "not_found", "result": None}
+
+    def _has_capacity(self, task: Dict[str, Any]) -> bool:
+        """Check per-tool and per-class limits (caller holds pool_lock)"""
+        tool_limit = self.tool_limits.get(task["tool"])
+        if tool_limit is not None and self.running_by_tool.get(task["tool"], 0) >= tool_limit:
+            return False
+        class_limit = self.class_limits.get(task["resource_class"])
+        if class_limit is not None and self.running_by_class.get(task["resource_class"], 0) >= class_limit:
+            return False
+        return True
+
+    def _next_runnable_task(self) -> Optional[Dict[str, Any]]:
+        """Pop the best task whose limits allow it to run now (caller holds pool_lock)"""
+        skipped = []
+        task = None
+        while self.task_heap:
+            entry = heapq.heappop(self.task_heap)
+            if self._has_capacity(entry[2]):
+                task = entry[2]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self.task_heap, entry)
+        return task
+
+    def _acquire_slots(self, task: Dict[str, Any], started_at: float):
+        """Account a task as running and record its queue wait (caller holds pool_lock)"""
+        self.running_by_tool[task["tool"]] = self.running_by_tool.get(task["tool"], 0) + 1
+        self.running_by_class[task["resource_class"]] = self.running_by_class.get(task["resource_class"], 0) + 1
+
+        wait_time = started_at - task["submitted_at"]
+        stats = self.wait_stats.setdefault(task["resource_class"], {"tasks_started": 0, "total_wait": 0.0, "max_wait": 0.0})
+        stats["tasks_started"] += 1
+        stats["total_wait"] += wait_time
+        stats["max_wait"] = max(stats["max_wait"], wait_time)
+
+    def _release_slots(self, task: Dict[str, Any]):
+        """Free a finished task's tool and class slots (caller holds pool_lock)"""
+        self.running_by_tool[task["tool"]] -= 1
+        self.running_by_class[task["resource_class"]] -= 1
+        self.scheduler_cond.notify_all()
 
     def _worker_thread(self, worker_id: int):
         """Worker thread that processes tasks"""
@@ -4950,20 +5635,25 @@ class ProcessPool:
 
         while True:
             try:
-                # Get task from queue with timeout
-                task = self.task_queue.get(timeout=30)
-                if task is None:  # Shutdown signal
-                    break
-
-                task_id = task["id"]
-                start_time = time.time()
-
-                # Update task status
-                with self.pool_lock:
-                    if task_id in self.active_tasks:
-                        self.active_tasks[task_id]["status"] = "running"
-                        self.active_tasks[task_id]["worker_id"] = worker_id
-                        self.active_tasks[task_id]["started_at"] = start_time
+                with self.scheduler_cond:
+                    task = None
+                    while task is None:
+                        if self.pending_shutdowns > 0:  # Shutdown signal
+                            self.pending_shutdowns -= 1
+                            logger.info(f"🔧 Process pool worker {worker_id} stopped")
+                            return
+                        task = self._next_runnable_task()
+                        if task is None:
+                            self.scheduler_cond.wait(timeout=30)
+
+                    task_id = task["id"]
+                    start_time = time.time()
+                    self._acquire_slots(task, start_time)
+
+                    # Update task status
+                    task["status"] = "running"
+                    task["worker_id"] = worker_id
+                    task["started_at"] = start_time
 
                 try:
                     # Execute task
@@ -4971,15 +5661,16 @@ class ProcessPool:
 
                     # Store result
                     execution_time = time.time() - start_time
-                    with self.pool_lock:
-                        self.results[task_id] = {
-                            "status": "completed",
-                            "result": result,
-                            "execution_time": execution_time,
-                            "worker_id": worker_id,
-                            "completed_at": time.time()
-                        }
+                    self.results.put(task_id, {
+                        "status": "completed",
+                        "result": result,
+                        "execution_time": execution_time,
+                        "queue_wait": start_time - task["submitted_at"],
+                        "worker_id": worker_id,
+                        "completed_at": time.time()
+                    })
 
+                    with self.pool_lock:
                         # Update performance metrics
                         self.performance_metrics["tasks_completed"] += 1
                         self.performance_metrics["avg_task_time"] = (
@@ -4987,35 +5678,30 @@ class ProcessPool:
                             self.performance_metrics["tasks_completed"]
                         )
 
-                        # Remove from active tasks
-                        if task_id in self.active_tasks:
-                            del self.active_tasks[task_id]
-
                     logger.info(f"✅ Task completed: {task_id} in {execution_time:.2f}s")
 
                 except Exception as e:
                     # Handle task failure
-                    with self.pool_lock:
-                        self.results[task_id] = {
-                            "status": "failed",
-                            "error": str(e),
-                            "execution_time": time.time() - start_time,
-                            "worker_id": worker_id,
-                            "failed_at": time.time()
-                        }
+                    self.results.put(task_id, {
+                        "status": "failed",
+                        "error": str(e),
+                        "execution_time": time.time() - start_time,
+                        "queue_wait": start_time - task["submitted_at"],
+                        "worker_id": worker_id,
+                        "failed_at": time.time()
+                    })
 
+                    with self.pool_lock:
                         self.performance_metrics["tasks_failed"] += 1
 
-                        if task_id in self.active_tasks:
-                            del self.active_tasks[task_id]
-
                     logger.error(f"❌ Task failed: {task_id} - {str(e)}")
 
-                self.task_queue.task_done()
+                finally:
+                    with self.scheduler_cond:
+                        self._release_slots(task)
+                        # Remove from active tasks
+                        self.active_tasks.pop(task_id, None)
 
-            except queue.Empty:
-                # No tasks available, continue waiting
-                continue
             except Exception as e:
                 logger.error(f"💥 Worker {worker_id} error: {str(e)}")
 
@@ -5026,7 +5712,7 @@ class ProcessPool:
                 time.sleep(10)  # Monitor every 10 seconds
 
                 with self.pool_lock:
-                    queue_size = self.task_queue.qsize()
+                    queue_size = len(self.task_heap)
                     active_workers = len([w for w in self.workers if w.is_alive()])
                     active_tasks_count = len(self.active_tasks)
 
@@ -5049,17 +5735,14 @@ class ProcessPool:
                     self._scale_down(workers_to_remove)
                     logger.info(f"📉 Scaled down process pool: -{workers_to_remove} workers (total: {active_workers - workers_to_remove})")
 
-                # Update performance metrics
-                try:
-                    cpu_percent = psutil.cpu_percent()
-                    memory_info = psutil.virtual_memory()
-
-                    with self.pool_lock:
-                        self.performance_metrics["cpu_usage"] = cpu_percent
-                        self.performance_metrics["memory_usage"] = memory_info.percent
+                # Drop task results past their TTL
+                self.results.purge_expired()
 
-                except Exception:
-                    pass  # Ignore psutil errors
+                # Update performance metrics
+                snapshot = resource_sampler.get_snapshot()
+                with self.pool_lock:
+                    self.performance_metrics["cpu_usage"] = snapshot["cpu_percent"]
+                    self.performance_metrics["memory_usage"] = snapshot["memory_percent"]
 
             except Exception as e:
                 logger.error(f"💥 Pool monitor error: {str(e)}")
@@ -5068,164 +5751,478 @@ class ProcessPool:
         """Add workers to the pool"""
         with self.pool_lock:
             for i in range(count):
-                worker_id = len(self.workers)
+                worker_id = self.worker_counter
+                self.worker_counter += 1
                 worker = threading.Thread(target=self._worker_thread, args=(worker_id,), daemon=True)
                 worker.start()
                 self.workers.append(worker)
 
     def _scale_down(self, count: int):
         """Remove workers from the pool"""
-        with self.pool_lock:
-            for _ in range(count):
-                if len(self.workers) > self.min_workers:
-                    # Signal worker to shutdown by putting None in queue
-                    self.task_queue.put(None)
-                    # Remove from workers list (worker will exit naturally)
-                    if self.workers:
-                        self.workers.pop()
+        with self.scheduler_cond:
+            self.workers = [w for w in self.workers if w.is_alive()]
+            removable = max(0, len(self.workers) - self.pending_shutdowns - self.min_workers)
+            # Idle workers pick up the shutdown signal; busy ones after their current task
+            self.pending_shutdowns += min(count, removable)
+            self.scheduler_cond.notify_all()
+
+    def set_concurrency_limits(self, tool_limits: Dict[str, Optional[int]] = None,
+                               class_limits: Dict[str, Optional[int]] = None):
+        """Update per-tool / per-class limits; a value of None removes the limit.
+
+        Every entry is validated before any is applied, so a bad value
+        (TypeError/ValueError) leaves all limits unchanged.
+        """
+        changes = []
+        for limits, updates in ((self.tool_limits, tool_limits), (self.class_limits, class_limits)):
+            for name, limit in (updates or {}).items():
+                if not isinstance(name, str) or not name:
+                    raise ValueError(f"limit name must be a non-empty string: {name!r}")
+                if isinstance(limit, bool) or isinstance(limit, float) and not limit.is_integer():
+                    raise ValueError(f"limit for {name} must be an integer or null: {limit!r}")
+                changes.append((limits, name.lower(), None if limit is None else max(1, int(limit))))
+
+        with self.scheduler_cond:
+            for limits, name, limit in changes:
+                if limit is None:
+                    limits.pop(name, None)
+                else:
+                    limits[name] = limit
+            self.scheduler_cond.notify_all()
 
     def get_pool_stats(self) -> Dict[str, Any]:
         """Get current pool statistics"""
         with self.pool_lock:
             active_workers = len([w for w in self.workers if w.is_alive()])
+
+            queued_by_class = {}
+            for _, _, task in self.task_heap:
+                queued_by_class[task["resource_class"]] = queued_by_class.get(task["resource_class"], 0) + 1
+
+            queue_wait_by_class = {}
+            for resource_class in set(self.wait_stats) | set(queued_by_class):
+                stats = self.wait_stats.get(resource_class, {"tasks_started": 0, "total_wait": 0.0, "max_wait": 0.0})
+                queue_wait_by_class[resource_class] = {
+                    "queued": queued_by_class.get(resource_class, 0),
+                    "running": self.running_by_class.get(resource_class, 0),
+                    "tasks_started": stats["tasks_started"],
+                    "avg_wait_seconds": stats["total_wait"] / stats["tasks_started"] if stats["tasks_started"] else 0.0,
+                    "max_wait_seconds": stats["max_wait"],
+                    "limit": self.class_limits.get(resource_class)
+                }
+
             return {
                 "active_workers": active_workers,
-                "queue_size": self.task_queue.qsize(),
+                "queue_size": len(self.task_heap),
                 "active_tasks": len(self.active_tasks),
                 "performance_metrics": self.performance_metrics.copy(),
                 "min_workers": self.min_workers,
-                "max_workers": self.max_workers
+                "max_workers": self.max_workers,
+                "queue_wait_by_class": queue_wait_by_class,
+                "running_by_tool": {tool: count for tool, count in self.running_by_tool.items() if count},
+                "tool_limits": dict(self.tool_limits),
+                "class_limits": dict(self.class_limits),
+                "priority_aging_seconds": POOL_PRIORITY_AGING_SECONDS,
+                "result_store": self.results.get_stats()
             }
 
+PERSISTENT_CACHE_ENABLED = os.environ.get("HEXSTRIKE_PERSISTENT_CACHE", "1").lower() not in ("0", "false", "no")
+PERSISTENT_CACHE_PATH = os.environ.get(
+    "HEXSTRIKE_CACHE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "hexstrike_cache.db"))
+PERSISTENT_CACHE_MAX_BYTES = int(os.environ.get("HEXSTRIKE_CACHE_DB_MAX_BYTES", 512 * 1024 * 1024))
+PERSISTENT_CACHE_EVICT_EVERY = 100  # writes between size checks
+PERSISTENT_CACHE_TOUCH_INTERVAL = 60  # seconds between access-time updates for one entry
+
+def stable_hash(*parts: Any) -> str:
+    """Process-independent content hash (unlike the salted builtin hash())"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def strip_output_handles(value: Any) -> Any:
+    """value without 'output_handles' keys at any depth.
+
+    Handles name captures held by one process's OutputStore, so they are
+    meaningless to other workers and after a restart.
+    """
+    if isinstance(value, dict):
+        return {key: strip_output_handles(item) for key, item in value.items() if key != "output_handles"}
+    if isinstance(value, list):
+        return [strip_output_handles(item) for item in value]
+    return value
+
+class PersistentCache:
+    """Disk-backed cache tier shared by every server process.
+
+    Entries live in a SQLite database in WAL mode so all gunicorn workers read and
+    write the same store and results survive restarts. Each entry has its own TTL;
+    once the stored bytes exceed the budget the least recently accessed entries
+    are removed.
+    """
+
+    def __init__(self, db_path: str = PERSISTENT_CACHE_PATH, max_bytes: int = PERSISTENT_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.stats_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0, "errors": 0}
+        self.writes_since_evict = 0
+        self.available = True
+        try:
+            with self._connection() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS cache_entries (
+                        namespace TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL,
+                        PRIMARY KEY (namespace, key)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries(accessed_at)")
+        except sqlite3.Error as e:
+            self.available = False
+            logger.warning(f"⚠️  Persistent cache disabled ({self.db_path}): {str(e)}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection; sqlite3 connections are not shared across threads"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry"""
+        entry = self.get_entry(namespace, key)
+        return entry[0] if entry else None
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at), or None on miss/expiry"""
+        if not self.available:
+            return None
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at <= now:
+                with conn:
+                    conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+                self._count("expired")
+                self._count("misses")
+                return None
+            if now - accessed_at > PERSISTENT_CACHE_TOUCH_INTERVAL:
+                with conn:
+                    conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                                 (now, namespace, key))
+            self._count("hits")
+            return json.loads(value), expires_at
+        except (sqlite3.Error, ValueError) as e:
+            self._count("errors")
+            logger.warning(f"⚠️  Persistent cache read failed: {str(e)}")
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: int):
+        """Store a JSON-serializable value with its own TTL (output handles are not persisted)"""
+        if not self.available:
+            return
+        now = time.time()
+        try:
+            payload = json.dumps(strip_output_handles(value), default=str)
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(namespace, key, value, size, created_at, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, payload, len(payload), now, now + ttl, now))
+            self._count("writes")
+            with self.stats_lock:
+                self.writes_since_evict += 1
+                check = self.writes_since_evict >= PERSISTENT_CACHE_EVICT_EVERY
+                if check:
+                    self.writes_since_evict = 0
+            if check:
+                self.evict()
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"⚠️  Persistent cache write failed: {str(e)}")
+
+    def evict(self) -> int:
+        """Remove expired entries, then least recently accessed ones until under the byte budget"""
+        if not self.available:
+            return 0
+        try:
+            conn = self._connection()
+            with conn:
+                expired = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+                evicted = 0
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    freed = 0
+                    victims = []
+                    for namespace, key, size in conn.execute(
+                            "SELECT namespace, key, size FROM cache_entries ORDER BY accessed_at"):
+                        victims.append((namespace, key))
+                        freed += size
+                        if freed >= excess:
+                            break
+                    conn.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", victims)
+                    evicted = len(victims)
+            self._count("expired", expired)
+            self._count("evictions", evicted)
+            if evicted:
+                logger.info(f"🗑️ Persistent cache evicted {evicted} entries to stay under {self.max_bytes} bytes")
+            return expired + evicted
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"⚠️  Persistent cache eviction failed: {str(e)}")
+            return 0
+
+    def clear(self, namespace: str = None):
+        """Remove all entries, or only those of one namespace"""
+        if not self.available:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                if namespace:
+                    conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+                else:
+                    conn.execute("DELETE FROM cache_entries")
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"⚠️  Persistent cache clear failed: {str(e)}")
+
+    def reset_stats(self):
+        with self.stats_lock:
+            for stat in self.stats:
+                self.stats[stat] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get persistent tier statistics (counters are per process, sizes are shared)"""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "enabled": self.available,
+            "path": self.db_path,
+            "max_bytes": self.max_bytes,
+            "hit_rate": f"{(stats['hits'] / lookups * 100) if lookups else 0:.1f}%"
+        })
+        if self.available:
+            try:
+                entries, size = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+                stats.update({"entries": entries, "bytes": size})
+            except sqlite3.Error as e:
+                stats["error"] = str(e)
+        return stats
+
+# Global persistent cache tier (None when disabled)
+persistent_cache = PersistentCache() if PERSISTENT_CACHE_ENABLED else None
+
+ADVANCED_CACHE_SHARDS = 16
+
+class _CacheShard:
+    """One lock-protected slice of an AdvancedCache: LRU order plus an expiry heap"""
+
+    __slots__ = ("lock", "entries", "expiry_heap", "max_size", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self, max_size: int):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (value, expires_at); oldest first
+        self.expiry_heap = []  # (expires_at, key); may hold stale items
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def purge_expired(self, now: float) -> int:
+        """Pop due heap items, skipping ones superseded by a later set (caller holds lock)"""
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self.entries[key]
+                removed += 1
+        self.expirations += removed
+        return removed
+
+    def compact_heap(self):
+        """Rebuild the heap once stale items outnumber live ones (caller holds lock)"""
+        if len(self.expiry_heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [(expires_at, key) for key, (_, expires_at) in self.entries.items()]
+            heapq.heapify(self.expiry_heap)
+
 class AdvancedCache:
-    """Advanced caching system with intelligent TTL and LRU eviction"""
+    """Advanced caching system with intelligent TTL and LRU eviction.
+
+    Keys are spread over independently locked shards. Each shard keeps its entries
+    in an OrderedDict (O(1) LRU touch and eviction) and a heap of expiry times, so
+    expiring entries only visits what is actually due.
+    """
 
-    def __init__(self, max_size=1000, default_ttl=3600):
+    def __init__(self, max_size=1000, default_ttl=3600, persistent: "PersistentCache" = None,
+                 namespace: str = "advanced", shards: int = ADVANCED_CACHE_SHARDS):
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache = {}
-        self.access_times = {}
-        self.ttl_times = {}
-        self.cache_lock = threading.RLock()
-        self.hit_count = 0
-        self.miss_count = 0
+        self.persistent = persistent
+        self.namespace = namespace
+        shard_count = max(1, min(shards, max_size))
+        base, extra = divmod(max_size, shard_count)
+        self.shards = [_CacheShard(base + (1 if i < extra else 0)) for i in range(shard_count)]
 
         # Start cleanup thread
         self.cleanup_thread = threading.Thread(target=self._cleanup_expired, daemon=True)
         self.cleanup_thread.start()
 
+    def _shard(self, key: str) -> _CacheShard:
+        return self.shards[hash(key) % len(self.shards)]
+
     def get(self, key: str) -> Any:
         """Get value from cache"""
-        with self.cache_lock:
-            current_time = time.time()
-
-            # Check if key exists and is not expired
-            if key in self.cache and (key not in self.ttl_times or self.ttl_times[key] > current_time):
-                # Update access time for LRU
-                self.access_times[key] = current_time
-                self.hit_count += 1
-                return self.cache[key]
-
-            # Cache miss or expired
-            if key in self.cache:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if entry[1] > time.time():
+                    # Mark as most recently used
+                    shard.entries.move_to_end(key)
+                    shard.hits += 1
+                    return entry[0]
                 # Remove expired entry
-                self._remove_key(key)
+                del shard.entries[key]
+                shard.expirations += 1
+
+        # Fall through to the shared disk tier
+        if self.persistent is not None:
+            persisted = self.persistent.get_entry(self.namespace, key)
+            if persisted is not None:
+                value, expires_at = persisted
+                with shard.lock:
+                    shard.hits += 1
+                    self._insert(shard, key, value, expires_at)
+                return value
+
+        with shard.lock:
+            shard.misses += 1
+        return None
 
-            self.miss_count += 1
-            return None
+    def _insert(self, shard: _CacheShard, key: str, value: Any, expires_at: float):
+        """Insert into a shard, evicting its least recently used entry if full (caller holds lock)"""
+        if key in shard.entries:
+            shard.entries.move_to_end(key)
+        elif len(shard.entries) >= shard.max_size:
+            lru_key, _ = shard.entries.popitem(last=False)
+            shard.evictions += 1
+            logger.debug(f"🗑️ Evicted LRU cache entry: {lru_key}")
+        shard.entries[key] = (value, expires_at)
+        heapq.heappush(shard.expiry_heap, (expires_at, key))
+        shard.compact_heap()
 
     def set(self, key: str, value: Any, ttl: int = None) -> None:
         """Set value in cache with optional TTL"""
-        with self.cache_lock:
-            current_time = time.time()
-
-            # Use default TTL if not specified
-            if ttl is None:
-                ttl = self.default_ttl
+        # Use default TTL if not specified
+        if ttl is None:
+            ttl = self.default_ttl
 
-            # Check if we need to evict entries
-            if len(self.cache) >= self.max_size and key not in self.cache:
-                self._evict_lru()
+        shard = self._shard(key)
+        with shard.lock:
+            self._insert(shard, key, value, time.time() + ttl)
 
-            # Set the value
-            self.cache[key] = value
-            self.access_times[key] = current_time
-            self.ttl_times[key] = current_time + ttl
+        if self.persistent is not None:
+            self.persistent.set(self.namespace, key, value, ttl)
 
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
-        with self.cache_lock:
-            if key in self.cache:
-                self._remove_key(key)
-                return True
-            return False
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.entries.pop(key, None) is not None
 
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self.cache_lock:
-            self.cache.clear()
-            self.access_times.clear()
-            self.ttl_times.clear()
-
-    def _remove_key(self, key: str) -> None:
-        """Remove key and associated metadata"""
-        self.cache.pop(key, None)
-        self.access_times.pop(key, None)
-        self.ttl_times.pop(key, None)
-
-    def _evict_lru(self) -> None:
-        """Evict least recently used entry"""
-        if not self.access_times:
-            return
+        for shard in self.shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+        if self.persistent is not None:
+            self.persistent.clear(self.namespace)
 
-        # Find least recently used key
-        lru_key = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-        self._remove_key(lru_key)
-        logger.debug(f"🗑️ Evicted LRU cache entry: {lru_key}")
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self.shards)
 
     def _cleanup_expired(self) -> None:
         """Cleanup expired entries periodically"""
         while True:
             try:
                 time.sleep(60)  # Cleanup every minute
-                current_time = time.time()
-                expired_keys = []
-
-                with self.cache_lock:
-                    for key, expiry_time in self.ttl_times.items():
-                        if expiry_time <= current_time:
-                            expired_keys.append(key)
-
-                    for key in expired_keys:
-                        self._remove_key(key)
+                now = time.time()
+                removed = 0
+                for shard in self.shards:
+                    with shard.lock:
+                        removed += shard.purge_expired(now)
 
-                if expired_keys:
-                    logger.debug(f"🧹 Cleaned up {len(expired_keys)} expired cache entries")
+                if removed:
+                    logger.debug(f"🧹 Cleaned up {removed} expired cache entries")
 
             except Exception as e:
                 logger.error(f"💥 Cache cleanup error: {str(e)}")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        with self.cache_lock:
-            total_requests = self.hit_count + self.miss_count
-            hit_rate = (self.hit_count / total_requests * 100) if total_requests > 0 else 0
+        size = hits = misses = evictions = expirations = 0
+        for shard in self.shards:
+            with shard.lock:
+                size += len(shard.entries)
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                expirations += shard.expirations
+
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
 
-            return {
-                "size": len(self.cache),
-                "max_size": self.max_size,
-                "hit_count": self.hit_count,
-                "miss_count": self.miss_count,
-                "hit_rate": hit_rate,
-                "utilization": (len(self.cache) / self.max_size * 100)
-            }
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hit_count": hits,
+            "miss_count": misses,
+            "hit_rate": hit_rate,
+            "evictions": evictions,
+            "expirations": expirations,
+            "shards": len(self.shards),
+            "utilization": (size / self.max_size * 100)
+        }
 
 class EnhancedProcessManager:
     """Advanced process management with intelligent resource allocation"""
 
     def __init__(self):
         self.process_pool = ProcessPool(min_workers=4, max_workers=32)
-        self.cache = AdvancedCache(max_size=2000, default_ttl=1800)  # 30 minutes default TTL
+        self.cache = AdvancedCache(max_size=2000, default_ttl=1800, persistent=persistent_cache,
+                                   namespace="process_results")  # 30 minutes default TTL
         self.resource_monitor = ResourceMonitor()
         self.process_registry = {}
         self.registry_lock = threading.RLock()
@@ -5250,21 +6247,26 @@ class EnhancedProcessManager:
 
     def execute_command_async(self, command: str, context: Dict[str, Any] = None) -> str:
         """Execute command asynchronously using process pool"""
-        task_id = f"cmd_{int(time.time() * 1000)}_{hash(command) % 10000}"
+        command_hash = stable_hash(command)
+        task_id = f"cmd_{int(time.time() * 1000)}_{command_hash[:8]}"
 
         # Check cache first
-        cache_key = f"cmd_result_{hash(command)}"
+        cache_key = f"cmd_result_{command_hash}"
         cached_result = self.cache.get(cache_key)
         if cached_result and context and context.get("use_cache", True):
             logger.info(f"📋 Using cached result for command: {command[:50]}...")
             return cached_result
 
         # Submit to process pool
+        context = context or {}
         self.process_pool.submit_task(
             task_id,
             self._execute_command_internal,
             command,
-            context or {}
+            context,
+            priority=context.get("priority", DEFAULT_TASK_PRIORITY),
+            resource_class=context.get("resource_class"),
+            tool=context.get("tool") or extract_tool_name(command)
         )
 
         return task_id
@@ -5319,7 +6321,7 @@ class EnhancedProcessManager:
 
             # Cache successful results
             if result["success"] and context.get("cache_result", True):
-                cache_key = f"cmd_result_{hash(command)}"
+                cache_key = f"cmd_result_{stable_hash(command)}"
                 cache_ttl = context.get("cache_ttl", 1800)  # 30 minutes default
                 self.cache.set(cache_key, result, cache_ttl)
 
@@ -5438,50 +6440,17 @@ class EnhancedProcessManager:
 class ResourceMonitor:
     """Advanced resource monitoring with historical tracking"""
 
-    def __init__(self, history_size=100):
-        self.history_size = history_size
-        self.usage_history = []
-        self.history_lock = threading.Lock()
-
-    def get_current_usage(self) -> Dict[str, float]:
-        """Get current system resource usage"""
-        try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            network = psutil.net_io_counters()
-
-            usage = {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_available_gb": memory.available / (1024**3),
-                "disk_percent": disk.percent,
-                "disk_free_gb": disk.free / (1024**3),
-                "network_bytes_sent": network.bytes_sent,
-                "network_bytes_recv": network.bytes_recv,
-                "timestamp": time.time()
-            }
+    USAGE_KEYS = ("cpu_percent", "memory_percent", "memory_available_gb", "disk_percent",
+                  "disk_free_gb", "network_bytes_sent", "network_bytes_recv", "timestamp")
 
-            # Add to history
-            with self.history_lock:
-                self.usage_history.append(usage)
-                if len(self.usage_history) > self.history_size:
-                    self.usage_history.pop(0)
+    def __init__(self, sampler: ResourceSampler = None):
+        # Usage and history come from the shared background sampler
+        self.sampler = sampler or resource_sampler
 
-            return usage
-
-        except Exception as e:
-            logger.error(f"💥 Error getting resource usage: {str(e)}")
-            return {
-                "cpu_percent": 0,
-                "memory_percent": 0,
-                "memory_available_gb": 0,
-                "disk_percent": 0,
-                "disk_free_gb": 0,
-                "network_bytes_sent": 0,
-                "network_bytes_recv": 0,
-                "timestamp": time.time()
-            }
+    def get_current_usage(self) -> Dict[str, float]:
+        """Get current system resource usage from the latest sampler snapshot"""
+        snapshot = self.sampler.get_snapshot()
+        return {key: snapshot[key] for key in self.USAGE_KEYS}
 
     def get_process_usage(self, pid: int) -> Dict[str, Any]:
         """Get resource usage for specific process"""
@@ -5499,21 +6468,22 @@ class ResourceMonitor:
 
     def get_usage_trends(self) -> Dict[str, Any]:
         """Get resource usage trends"""
-        with self.history_lock:
-            if len(self.usage_history) < 2:
-                return {}
-
-            recent = self.usage_history[-10:]  # Last 10 measurements
+        history = self.sampler.get_history()
+        if len(history) < 2:
+            return {}
 
-            cpu_trend = sum(u["cpu_percent"] for u in recent) / len(recent)
-            memory_trend = sum(u["memory_percent"] for u in recent) / len(recent)
+        recent = history[-10:]  # Last 10 measurements
 
-            return {
-                "cpu_avg_10": cpu_trend,
-                "memory_avg_10": memory_trend,
-                "measurements": len(self.usage_history),
-                "trend_period_minutes": len(recent) * 15 / 60  # 15 second intervals
-            }
+        cpu_trend = sum(u["cpu_percent"] for u in recent) / len(recent)
+        memory_trend = sum(u["memory_percent"] for u in recent) / len(recent)
+
+        return {
+            "cpu_avg_10": cpu_trend,
+            "memory_avg_10": memory_trend,
+            "measurements": len(history),
+            "trend_period_minutes": len(recent) * self.sampler.interval / 60,
+            "sample_interval_seconds": self.sampler.interval
+        }
 
 class PerformanceDashboard:
     """Real-time performance monitoring dashboard"""
@@ -6679,74 +7649,233 @@ DEBUG_MODE = os.environ.get("DEBUG_MODE", "0").lower() in ("1", "true", "yes", "
 COMMAND_TIMEOUT = 300  # 5 minutes default timeout
 CACHE_SIZE = 1000
 CACHE_TTL = 3600  # 1 hour
+CACHE_MAX_BYTES = int(os.environ.get("HEXSTRIKE_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # in-memory budget
+CACHE_MAX_ENTRY_FRACTION = 0.25  # a single result may use at most this share of the budget
+
+# Per-tool cache policies: ttl in seconds, cacheable=False never stores results
+CACHE_TOOL_POLICIES = {
+    "which": {"ttl": 86400, "cacheable": True},
+    # DNS and subdomain enumeration changes slowly
+    "dig": {"ttl": 6 * 3600, "cacheable": True},
+    "host": {"ttl": 6 * 3600, "cacheable": True},
+    "nslookup": {"ttl": 6 * 3600, "cacheable": True},
+    "whois": {"ttl": 12 * 3600, "cacheable": True},
+    "dnsenum": {"ttl": 6 * 3600, "cacheable": True},
+    "fierce": {"ttl": 6 * 3600, "cacheable": True},
+    "dnsx": {"ttl": 6 * 3600, "cacheable": True},
+    "subfinder": {"ttl": 6 * 3600, "cacheable": True},
+    "amass": {"ttl": 6 * 3600, "cacheable": True},
+    "assetfinder": {"ttl": 6 * 3600, "cacheable": True},
+    "sublist3r": {"ttl": 6 * 3600, "cacheable": True},
+    # Live vulnerability checks must always hit the target
+    "nuclei": {"ttl": 0, "cacheable": False},
+    "sqlmap": {"ttl": 0, "cacheable": False},
+    "nikto": {"ttl": 0, "cacheable": False},
+    "dalfox": {"ttl": 0, "cacheable": False},
+    "wpscan": {"ttl": 0, "cacheable": False},
+    "jaeles": {"ttl": 0, "cacheable": False},
+    "xsser": {"ttl": 0, "cacheable": False},
+    "commix": {"ttl": 0, "cacheable": False},
+    "hydra": {"ttl": 0, "cacheable": False},
+}
+OUTPUT_SPILL_THRESHOLD = int(os.environ.get("HEXSTRIKE_OUTPUT_SPILL_BYTES", 8 * 1024 * 1024))  # spill to disk past 8 MB
+OUTPUT_PREVIEW_BYTES = int(os.environ.get("HEXSTRIKE_OUTPUT_PREVIEW_BYTES", 1024 * 1024))  # inline head+tail in responses
+OUTPUT_STORE_MAX_ENTRIES = 256
+OUTPUT_STORE_TTL = 6 * 3600  # 6 hours
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory payload size of a JSON-like value in bytes"""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(estimate_size(item) for item in value)
+    return 8
 
 class HexStrikeCache:
-    """Advanced caching system for command results"""
+    """Advanced caching system for command results.
 
-    def __init__(self, max_size: int = CACHE_SIZE, ttl: int = CACHE_TTL):
-        self.cache = OrderedDict()
+    An in-memory LRU sits in front of the shared persistent tier: memory misses
+    fall through to disk and disk hits are promoted back into memory. The memory
+    tier is bounded by both entry count and the byte size of cached results, and
+    each tool can have its own TTL or opt out of caching entirely.
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: int = CACHE_TTL, persistent: PersistentCache = None,
+                 max_bytes: int = CACHE_MAX_BYTES, policies: Dict[str, Dict[str, Any]] = None):
+        self.cache = OrderedDict()  # key -> (expires_at, data, size, tool)
         self.max_size = max_size
         self.ttl = ttl
-        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.policies = dict(CACHE_TOOL_POLICIES if policies is None else policies)
+        self.persistent = persistent
+        self.namespace = "command_results"
+        self.cache_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "memory_hits": 0, "disk_hits": 0,
+                      "bypassed": 0, "too_large": 0}
+        self.tool_stats = {}
 
     def _generate_key(self, command: str, params: Dict[str, Any]) -> str:
         """Generate cache key from command and parameters"""
-        key_data = f"{command}:{json.dumps(params, sort_keys=True)}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return stable_hash(command, params)
 
     def _is_expired(self, timestamp: float) -> bool:
         """Check if cache entry is expired"""
-        return time.time() - timestamp > self.ttl
+        return time.time() > timestamp
+
+    def get_policy(self, tool: str) -> Dict[str, Any]:
+        """Cache policy for a tool, falling back to the global TTL"""
+        return self.policies.get(tool, {"ttl": self.ttl, "cacheable": True})
+
+    def set_policy(self, tool: str, ttl: int = None, cacheable: bool = True):
+        """Override the cache policy of one tool"""
+        with self.cache_lock:
+            self.policies[tool] = {"ttl": self.ttl if ttl is None else ttl, "cacheable": cacheable}
+
+    def _count_tool(self, tool: str, stat: str, amount: int = 1):
+        """Per-tool counters (caller holds cache_lock)"""
+        counters = self.tool_stats.setdefault(tool, {"evictions": 0, "evicted_bytes": 0, "hits": 0, "stored": 0})
+        counters[stat] += amount
+
+    def _remove(self, key: str):
+        """Drop a memory entry and release its bytes (caller holds cache_lock)"""
+        _, _, size, _ = self.cache.pop(key)
+        self.current_bytes -= size
+
+    def _store_memory(self, key: str, expires_at: float, data: Dict[str, Any], tool: str):
+        """Insert into the memory tier, evicting least recently used entries past either limit"""
+        size = estimate_size(data)
+        if size > self.max_bytes * CACHE_MAX_ENTRY_FRACTION:
+            self.stats["too_large"] += 1
+            return
+        if key in self.cache:
+            self._remove(key)
+        while self.cache and (len(self.cache) >= self.max_size or self.current_bytes + size > self.max_bytes):
+            oldest_key = next(iter(self.cache))
+            _, _, oldest_size, oldest_tool = self.cache[oldest_key]
+            self._remove(oldest_key)
+            self.stats["evictions"] += 1
+            self._count_tool(oldest_tool, "evictions")
+            self._count_tool(oldest_tool, "evicted_bytes", oldest_size)
+        self.cache[key] = (expires_at, data, size, tool)
+        self.current_bytes += size
 
     def get(self, command: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Get cached result if available and not expired"""
+        tool = extract_tool_name(command)
+        if not self.get_policy(tool)["cacheable"]:
+            with self.cache_lock:
+                self.stats["bypassed"] += 1
+            return None
+
         key = self._generate_key(command, params)
 
-        if key in self.cache:
-            timestamp, data = self.cache[key]
-            if not self._is_expired(timestamp):
-                # Move to end (most recently used)
-                self.cache.move_to_end(key)
-                self.stats["hits"] += 1
-                logger.info(f"💾 Cache HIT for command: {command}")
+        with self.cache_lock:
+            if key in self.cache:
+                expires_at, data, _, _ = self.cache[key]
+                if not self._is_expired(expires_at):
+                    # Move to end (most recently used)
+                    self.cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    self._count_tool(tool, "hits")
+                    logger.info(f"💾 Cache HIT for command: {command}")
+                    return data
+                else:
+                    # Remove expired entry
+                    self._remove(key)
+
+        if self.persistent is not None:
+            entry = self.persistent.get_entry(self.namespace, key)
+            if entry is not None:
+                data, expires_at = entry
+                with self.cache_lock:
+                    self._store_memory(key, expires_at, data, tool)
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                    self._count_tool(tool, "hits")
+                logger.info(f"💾 Cache HIT (disk) for command: {command}")
                 return data
-            else:
-                # Remove expired entry
-                del self.cache[key]
 
-        self.stats["misses"] += 1
+        with self.cache_lock:
+            self.stats["misses"] += 1
         logger.info(f"🔍 Cache MISS for command: {command}")
         return None
 
     def set(self, command: str, params: Dict[str, Any], result: Dict[str, Any]):
-        """Store result in cache"""
-        key = self._generate_key(command, params)
-
-        # Remove oldest entries if cache is full
-        while len(self.cache) >= self.max_size:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-            self.stats["evictions"] += 1
+        """Store result in cache according to the tool's policy"""
+        tool = extract_tool_name(command)
+        policy = self.get_policy(tool)
+        if not policy["cacheable"] or policy["ttl"] <= 0:
+            return
 
-        self.cache[key] = (time.time(), result)
+        key = self._generate_key(command, params)
+        with self.cache_lock:
+            self._store_memory(key, time.time() + policy["ttl"], result, tool)
+            self._count_tool(tool, "stored")
+        if self.persistent is not None:
+            self.persistent.set(self.namespace, key, result, policy["ttl"])
         logger.info(f"💾 Cached result for command: {command}")
 
+    def clear(self):
+        """Clear both tiers and reset statistics"""
+        with self.cache_lock:
+            self.cache.clear()
+            self.current_bytes = 0
+            self.stats = {stat: 0 for stat in self.stats}
+            self.tool_stats = {}
+        if self.persistent is not None:
+            self.persistent.clear()
+            self.persistent.reset_stats()
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total_requests = self.stats["hits"] + self.stats["misses"]
-        hit_rate = (self.stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        with self.cache_lock:
+            stats = dict(self.stats)
+            size = len(self.cache)
+            current_bytes = self.current_bytes
+            tool_stats = {tool: dict(counters) for tool, counters in self.tool_stats.items()}
+
+        total_requests = stats["hits"] + stats["misses"]
+        hit_rate = (stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        memory_hit_rate = (stats["memory_hits"] / total_requests * 100) if total_requests > 0 else 0
+        disk_lookups = total_requests - stats["memory_hits"]
+        disk_hit_rate = (stats["disk_hits"] / disk_lookups * 100) if disk_lookups > 0 else 0
 
         return {
-            "size": len(self.cache),
+            "size": size,
             "max_size": self.max_size,
+            "bytes": current_bytes,
+            "max_bytes": self.max_bytes,
             "hit_rate": f"{hit_rate:.1f}%",
-            "hits": self.stats["hits"],
-            "misses": self.stats["misses"],
-            "evictions": self.stats["evictions"]
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "bypassed": stats["bypassed"],
+            "too_large": stats["too_large"],
+            "by_tool": tool_stats,
+            "tiers": {
+                "memory": {
+                    "hits": stats["memory_hits"],
+                    "lookups": total_requests,
+                    "hit_rate": f"{memory_hit_rate:.1f}%",
+                    "entries": size,
+                    "bytes": current_bytes,
+                    "evictions": stats["evictions"]
+                },
+                "disk": {
+                    "hits": stats["disk_hits"],
+                    "lookups": disk_lookups,
+                    "hit_rate": f"{disk_hit_rate:.1f}%",
+                    **(self.persistent.get_stats() if self.persistent is not None else {"enabled": False})
+                }
+            }
         }
 
 # Global cache instance
-cache = HexStrikeCache()
+cache = HexStrikeCache(persistent=persistent_cache)
 
 class TelemetryCollector:
     """Collect and manage system telemetry"""
@@ -6771,11 +7900,12 @@ class TelemetryCollector:
 
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get current system metrics"""
+        snapshot = resource_sampler.get_snapshot()
         return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage('/').percent,
-            "network_io": psutil.net_io_counters()._asdict() if psutil.net_io_counters() else {}
+            "cpu_percent": snapshot["cpu_percent"],
+            "memory_percent": snapshot["memory_percent"],
+            "disk_usage": snapshot["disk_percent"],
+            "network_io": snapshot["network_io"]
         }
 
     def get_stats(self) -> Dict[str, Any]:
@@ -6789,147 +7919,538 @@ class TelemetryCollector:
             "commands_executed": self.stats["commands_executed"],
             "success_rate": f"{success_rate:.1f}%",
             "average_execution_time": f"{avg_execution_time:.2f}s",
-            "system_metrics": self.get_system_metrics()
+            "system_metrics": self.get_system_metrics(),
+            "process_engine": process_engine.get_stats(),
+            "single_flight": single_flight.get_stats()
         }
 
 # Global telemetry collector
 telemetry = TelemetryCollector()
 
+TOOL_INVENTORY_RECHECK_INTERVAL = 5.0  # seconds between PATH mtime checks
+TOOL_VERSION_TIMEOUT = 5  # seconds per version probe
+
+class ToolInventory:
+    """In-process index of executables on PATH.
+
+    PATH is scanned once into a name -> path map; later lookups are dictionary
+    reads. The index is rebuilt when PATH itself or the mtime of any of its
+    directories changes. Versions are probed lazily and remembered.
+    """
+
+    def __init__(self):
+        self.inventory_lock = threading.Lock()
+        self.binaries = {}
+        self.versions = {}
+        self.path_value = None
+        self.dir_mtimes = {}
+        self.scanned_at = 0.0
+        self.checked_at = 0.0
+        self.scan_count = 0
+
+    def _path_dirs(self, path_value: str) -> List[str]:
+        dirs = []
+        for directory in path_value.split(os.pathsep):
+            if directory and directory not in dirs:
+                dirs.append(directory)
+        return dirs
+
+    def _dir_mtimes(self, dirs: List[str]) -> Dict[str, float]:
+        mtimes = {}
+        for directory in dirs:
+            try:
+                mtimes[directory] = os.stat(directory).st_mtime
+            except OSError:
+                mtimes[directory] = None
+        return mtimes
+
+    def scan(self):
+        """Rebuild the index from the current PATH"""
+        path_value = os.environ.get("PATH", "")
+        dirs = self._path_dirs(path_value)
+        binaries = {}
+        for directory in dirs:
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name in binaries:
+                        continue  # earlier PATH entries win, as with which
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            binaries[entry.name] = entry.path
+                    except OSError:
+                        continue
+
+        with self.inventory_lock:
+            self.binaries = binaries
+            self.versions = {name: version for name, version in self.versions.items() if name in binaries}
+            self.path_value = path_value
+            self.dir_mtimes = self._dir_mtimes(dirs)
+            self.scanned_at = self.checked_at = time.time()
+            self.scan_count += 1
+        logger.info(f"🔎 Tool inventory indexed {len(binaries)} executables from {len(dirs)} PATH directories")
+
+    def refresh_if_stale(self, force: bool = False):
+        """Rescan if PATH or one of its directories changed since the last scan"""
+        now = time.time()
+        if not force and self.scan_count and now - self.checked_at < TOOL_INVENTORY_RECHECK_INTERVAL:
+            return
+        path_value = os.environ.get("PATH", "")
+        stale = force or not self.scan_count or path_value != self.path_value
+        if not stale:
+            stale = self._dir_mtimes(self._path_dirs(path_value)) != self.dir_mtimes
+        if stale:
+            self.scan()
+        else:
+            self.checked_at = now
+
+    def resolve(self, tool: str) -> Optional[str]:
+        """Full path of a tool, or None if it is not on PATH"""
+        self.refresh_if_stale()
+        return self.binaries.get(tool)
+
+    def is_available(self, tool: str) -> bool:
+        return self.resolve(tool) is not None
+
+    def status(self, tools: List[str]) -> Dict[str, bool]:
+        """Availability of many tools from a single index snapshot"""
+        self.refresh_if_stale()
+        binaries = self.binaries
+        return {tool: tool in binaries for tool in tools}
+
+    def get_version(self, tool: str, refresh: bool = False) -> Optional[str]:
+        """First line of `tool --version`, probed once and then remembered"""
+        if not refresh and tool in self.versions:
+            return self.versions[tool]
+        path = self.resolve(tool)
+        if path is None:
+            return None
+
+        version = None
+        try:
+            proc = subprocess.run([path, "--version"], stdin=subprocess.DEVNULL, capture_output=True,
+                                  text=True, errors="replace", timeout=TOOL_VERSION_TIMEOUT)
+            output = (proc.stdout or proc.stderr).strip()
+            if output:
+                version = output.splitlines()[0][:200]
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+        with self.inventory_lock:
+            self.versions[tool] = version
+        return version
+
+    def probe(self, tools: List[str], max_workers: int = 16) -> Dict[str, Dict[str, Any]]:
+        """Rescan PATH and re-probe versions of the given tools in parallel"""
+        self.refresh_if_stale(force=True)
+        available = [tool for tool in tools if tool in self.binaries]
+        versions = {}
+        if available:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(available))) as pool:
+                for tool, version in zip(available, pool.map(lambda t: self.get_version(t, refresh=True), available)):
+                    versions[tool] = version
+        return {
+            tool: {"available": tool in self.binaries, "path": self.binaries.get(tool), "version": versions.get(tool)}
+            for tool in tools
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "executables_indexed": len(self.binaries),
+            "path_directories": len(self.dir_mtimes),
+            "versions_known": sum(1 for version in self.versions.values() if version),
+            "scanned_at": datetime.fromtimestamp(self.scanned_at).isoformat() if self.scanned_at else None,
+            "scan_count": self.scan_count
+        }
+
+# Global tool inventory
+tool_inventory = ToolInventory()
+
+class OutputCapture:
+    """Chunked, bounded capture buffer for one process output stream.
+
+    Chunks are appended to a list instead of concatenated; once the captured size
+    passes the spill threshold the data moves to a temp file so huge outputs
+    never sit in RAM. Head/tail previews and ranged reads work in both modes.
+    """
+
+    def __init__(self, name: str = "stdout", spill_threshold: int = OUTPUT_SPILL_THRESHOLD):
+        self.name = name
+        self.spill_threshold = spill_threshold
+        self.chunks = []
+        self.size = 0
+        self.spill_path = None
+        self.spill_file = None
+
+    def __len__(self):
+        return self.size
+
+    def write(self, data: bytes):
+        """Append a chunk of raw output"""
+        if not data:
+            return
+        self.size += len(data)
+        if self.spill_file is not None:
+            self.spill_file.write(data)
+            return
+        self.chunks.append(data)
+        if self.size > self.spill_threshold:
+            self.spill()
+
+    def spill(self):
+        """Move buffered chunks to a temp file and keep appending there"""
+        if self.spill_path is not None:
+            return
+        fd, self.spill_path = tempfile.mkstemp(prefix="hexstrike_output_", suffix=f".{self.name}")
+        self.spill_file = os.fdopen(fd, "wb")
+        for chunk in self.chunks:
+            self.spill_file.write(chunk)
+        self.chunks = []
+        logger.info(f"💽 Output capture spilled to disk: {self.spill_path} ({self.size} bytes)")
+
+    def finish(self):
+        """Flush the spill file once the stream is complete"""
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def read(self, offset: int = 0, limit: int = None) -> bytes:
+        """Read a byte range of the captured output"""
+        if limit is None:
+            limit = self.size - offset
+        if offset >= self.size or limit <= 0:
+            return b""
+        if self.spill_path is not None:
+            if self.spill_file is not None:
+                self.spill_file.flush()
+            with open(self.spill_path, "rb") as f:
+                f.seek(offset)
+                return f.read(limit)
+        return b"".join(self.chunks)[offset:offset + limit]
+
+    def head(self, size: int) -> str:
+        """First bytes of the output as text"""
+        return self.read(0, size).decode("utf-8", errors="replace")
+
+    def tail(self, size: int) -> str:
+        """Last bytes of the output as text"""
+        return self.read(max(0, self.size - size), size).decode("utf-8", errors="replace")
+
+    def getvalue(self) -> str:
+        """Whole output as text"""
+        return self.read().decode("utf-8", errors="replace")
+
+    def preview(self, limit: int = OUTPUT_PREVIEW_BYTES) -> Tuple[str, bool]:
+        """Return (text, truncated) - the full text when small, otherwise head + tail"""
+        if self.size <= limit:
+            return self.getvalue(), False
+        half = limit // 2
+        omitted = self.size - 2 * half
+        marker = f"\n\n... [{omitted} bytes omitted - full output available via output handle] ...\n\n"
+        return self.head(half) + marker + self.tail(half), True
+
+    def close(self):
+        """Release the buffer and delete any spill file"""
+        self.finish()
+        self.chunks = []
+        if self.spill_path is not None:
+            try:
+                os.unlink(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+class OutputStore:
+    """Registry of full tool outputs too large to return inline, addressed by handle.
+
+    Readers pin a capture while they use it; an entry evicted while pinned
+    leaves the registry at once but its spill file is only deleted when the
+    last reader lets go.
+    """
+
+    def __init__(self, max_entries: int = OUTPUT_STORE_MAX_ENTRIES, ttl: int = OUTPUT_STORE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # handle -> (created_at, command, capture)
+        self.pins = {}  # id(capture) -> readers currently using it
+        self.retired = {}  # id(capture) -> evicted capture waiting for its readers
+        self.store_lock = threading.Lock()
+
+    def register(self, capture: OutputCapture, command: str = "") -> str:
+        """Keep a finished capture on disk and return its handle"""
+        capture.spill()
+        capture.finish()
+        handle = f"out_{uuid.uuid4().hex}"
+
+        with self.store_lock:
+            self.entries[handle] = (time.time(), command, capture)
+            self._evict()
+
+        return handle
+
+    def pin(self, handle: str) -> Optional[OutputCapture]:
+        """Look up a capture and keep its file alive until unpin() (None if unknown)"""
+        with self.store_lock:
+            self._evict()
+            entry = self.entries.get(handle)
+            capture = entry[2] if entry else None
+            if capture is not None:
+                self.pins[id(capture)] = self.pins.get(id(capture), 0) + 1
+            return capture
+
+    def unpin(self, capture: OutputCapture):
+        """Release a pin; an evicted capture is closed when its last pin goes"""
+        with self.store_lock:
+            self.pins[id(capture)] -= 1
+            if not self.pins[id(capture)]:
+                del self.pins[id(capture)]
+                retired = self.retired.pop(id(capture), None)
+                if retired is not None:
+                    retired.close()
+
+    @contextmanager
+    def open(self, handle: str) -> Iterator[Optional[OutputCapture]]:
+        """Pin a capture by handle for the duration of the with block (None if unknown)"""
+        capture = self.pin(handle)
+        try:
+            yield capture
+        finally:
+            if capture is not None:
+                self.unpin(capture)
+
+    def _evict(self):
+        """Drop expired entries and the oldest ones beyond max_entries"""
+        now = time.time()
+        while self.entries:
+            handle, (created_at, _, capture) = next(iter(self.entries.items()))
+            if len(self.entries) <= self.max_entries and now - created_at <= self.ttl:
+                break
+            del self.entries[handle]
+            if id(capture) in self.pins:
+                self.retired[id(capture)] = capture
+            else:
+                capture.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get output store statistics"""
+        with self.store_lock:
+            return {
+                "entries": len(self.entries),
+                "pinned": len(self.pins),
+                "retired_pending_close": len(self.retired),
+                "max_entries": self.max_entries,
+                "total_bytes": sum(entry[2].size for entry in self.entries.values()),
+                "ttl": self.ttl
+            }
+
+# Global output store instance
+output_store = OutputStore()
+
+class _AsyncProcessHandle:
+    """Popen-compatible view of an asyncio subprocess so ProcessManager can poll and signal it"""
+
+    def __init__(self, process, loop):
+        self._process = process
+        self._loop = loop
+        self.pid = process.pid
+
+    def poll(self):
+        """Return the exit code, or None while the process is still running"""
+        return self._process.returncode
+
+    def _send_signal(self, sig):
+        try:
+            self._process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self):
+        """Send SIGTERM from the engine loop (safe to call from any thread)"""
+        self._loop.call_soon_threadsafe(self._send_signal, signal.SIGTERM)
+
+    def kill(self):
+        """Send SIGKILL from the engine loop (safe to call from any thread)"""
+        self._loop.call_soon_threadsafe(self._send_signal, signal.SIGKILL)
+
+class AsyncProcessEngine:
+    """Single shared asyncio event loop that drives every tool subprocess.
+
+    Replaces the per-command stdout/stderr/progress threads of the old executor:
+    all pipes are multiplexed on one loop thread and callers block on a future.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.loop_thread = None
+        self.start_lock = threading.Lock()
+        self.stats = {"commands_started": 0, "commands_completed": 0, "commands_timed_out": 0, "running": 0}
+
+    def _ensure_loop(self):
+        """Start the engine loop thread on first use"""
+        if self.loop is not None:
+            return
+        with self.start_lock:
+            if self.loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+
+            # Python < 3.12 defaults to ThreadedChildWatcher (one thread per child);
+            # use pidfd-based reaping where the kernel supports it
+            if sys.version_info < (3, 12) and hasattr(asyncio, "PidfdChildWatcher") and hasattr(os, "pidfd_open"):
+                try:
+                    watcher = asyncio.PidfdChildWatcher()
+                    watcher.attach_loop(loop)
+                    asyncio.set_child_watcher(watcher)
+                except Exception as e:
+                    logger.debug(f"PidfdChildWatcher unavailable, using default child watcher: {e}")
+
+            self.loop_thread = threading.Thread(target=loop.run_forever, name="hexstrike-process-engine", daemon=True)
+            self.loop_thread.start()
+            self.loop = loop
+            logger.info("⚙️  Async process engine started")
+
+    def submit(self, coro):
+        """Schedule a coroutine on the engine loop and return a thread-safe future"""
+        self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get engine statistics"""
+        return {
+            **self.stats,
+            "loop_running": bool(self.loop and self.loop.is_running()),
+            "server_threads": threading.active_count()
+        }
+
+# Global process engine instance
+process_engine = AsyncProcessEngine()
+
 class EnhancedCommandExecutor:
     """Enhanced command executor with caching, progress tracking, and better output handling"""
 
-    def __init__(self, command: str, timeout: int = COMMAND_TIMEOUT):
+    def __init__(self, command: str, timeout: int = COMMAND_TIMEOUT, on_output=None):
         self.command = command
         self.timeout = timeout
+        self.on_output = on_output  # optional callback(stream_name, line) for live streaming
         self.process = None
-        self.stdout_data = ""
-        self.stderr_data = ""
-        self.stdout_thread = None
-        self.stderr_thread = None
+        self.stdout_capture = OutputCapture("stdout")
+        self.stderr_capture = OutputCapture("stderr")
         self.return_code = None
         self.timed_out = False
         self.start_time = None
         self.end_time = None
 
-    def _read_stdout(self):
-        """Thread function to continuously read and display stdout"""
+    async def _read_stream(self, stream, is_stderr: bool):
+        """Continuously read and display one output stream of the process"""
         try:
-            for line in iter(self.process.stdout.readline, ''):
-                if line:
-                    self.stdout_data += line
-                    # Real-time output display
-                    logger.info(f"📤 STDOUT: {line.strip()}")
-        except Exception as e:
-            logger.error(f"Error reading stdout: {e}")
+            while True:
+                try:
+                    chunk = await stream.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    chunk = e.partial
+                except asyncio.LimitOverrunError as e:
+                    # Very long line without a newline - take what is buffered
+                    chunk = await stream.read(e.consumed)
+                if not chunk:
+                    break
 
-    def _read_stderr(self):
-        """Thread function to continuously read and display stderr"""
-        try:
-            for line in iter(self.process.stderr.readline, ''):
-                if line:
-                    self.stderr_data += line
+                line = chunk.decode("utf-8", errors="replace")
+                if is_stderr:
+                    self.stderr_capture.write(chunk)
                     # Real-time error output display
                     logger.warning(f"📥 STDERR: {line.strip()}")
+                else:
+                    self.stdout_capture.write(chunk)
+                    # Real-time output display
+                    logger.info(f"📤 STDOUT: {line.strip()}")
+
+                if self.on_output:
+                    try:
+                        self.on_output("stderr" if is_stderr else "stdout", line)
+                    except Exception as e:
+                        logger.debug(f"Output callback failed: {e}")
         except Exception as e:
-            logger.error(f"Error reading stderr: {e}")
+            logger.error(f"Error reading {'stderr' if is_stderr else 'stdout'}: {e}")
 
-    def _show_progress(self, duration: float):
+    async def _show_progress(self):
         """Show enhanced progress indication for long-running commands"""
-        if duration > 2:  # Show progress for commands taking more than 2 seconds
-            progress_chars = ModernVisualEngine.PROGRESS_STYLES['dots']
-            start = time.time()
-            i = 0
-            while self.process and self.process.poll() is None:
-                elapsed = time.time() - start
-                char = progress_chars[i % len(progress_chars)]
-
-                # Calculate progress percentage (rough estimate)
-                progress_percent = min((elapsed / self.timeout) * 100, 99.9)
-                progress_fraction = progress_percent / 100
-
-                # Calculate ETA
-                eta = 0
-                if progress_percent > 5:  # Only show ETA after 5% progress
-                    eta = ((elapsed / progress_percent) * 100) - elapsed
-
-                # Calculate speed
-                bytes_processed = len(self.stdout_data) + len(self.stderr_data)
-                speed = f"{bytes_processed/elapsed:.0f} B/s" if elapsed > 0 else "0 B/s"
-
-                # Update process manager with progress
-                ProcessManager.update_process_progress(
-                    self.process.pid,
-                    progress_fraction,
-                    f"Running for {elapsed:.1f}s",
-                    bytes_processed
-                )
-
-                # Create beautiful progress bar using ModernVisualEngine
-                progress_bar = ModernVisualEngine.render_progress_bar(
-                    progress_fraction,
-                    width=30,
-                    style='cyber',
-                    label=f"⚡ PROGRESS {char}",
-                    eta=eta,
-                    speed=speed
-                )
-
-                logger.info(f"{progress_bar} | {elapsed:.1f}s | PID: {self.process.pid}")
-                time.sleep(0.8)
-                i += 1
-                if elapsed > self.timeout:
-                    break
-
-    def execute(self) -> Dict[str, Any]:
-        """Execute the command with enhanced monitoring and output"""
-        self.start_time = time.time()
-
-        logger.info(f"🚀 EXECUTING: {self.command}")
-        logger.info(f"⏱️  TIMEOUT: {self.timeout}s | PID: Starting...")
+        await asyncio.sleep(2)  # Show progress for commands taking more than 2 seconds
+        progress_chars = ModernVisualEngine.PROGRESS_STYLES['dots']
+        start = time.time()
+        i = 0
+        while self.process and self.process.returncode is None:
+            elapsed = time.time() - start
+            char = progress_chars[i % len(progress_chars)]
+
+            # Calculate progress percentage (rough estimate)
+            progress_percent = min((elapsed / self.timeout) * 100, 99.9)
+            progress_fraction = progress_percent / 100
+
+            # Calculate ETA
+            eta = 0
+            if progress_percent > 5:  # Only show ETA after 5% progress
+                eta = ((elapsed / progress_percent) * 100) - elapsed
+
+            # Calculate speed
+            bytes_processed = self.stdout_capture.size + self.stderr_capture.size
+            speed = f"{bytes_processed/elapsed:.0f} B/s" if elapsed > 0 else "0 B/s"
+
+            # Update process manager with progress
+            ProcessManager.update_process_progress(
+                self.process.pid,
+                progress_fraction,
+                f"Running for {elapsed:.1f}s",
+                bytes_processed
+            )
 
-        try:
-            self.process = subprocess.Popen(
-                self.command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
+            # Create beautiful progress bar using ModernVisualEngine
+            progress_bar = ModernVisualEngine.render_progress_bar(
+                progress_fraction,
+                width=30,
+                style='cyber',
+                label=f"⚡ PROGRESS {char}",
+                eta=eta,
+                speed=speed
             )
 
-            pid = self.process.pid
-            logger.info(f"🆔 PROCESS: PID {pid} started")
+            logger.info(f"{progress_bar} | {elapsed:.1f}s | PID: {self.process.pid}")
+            await asyncio.sleep(0.8)
+            i += 1
+            if elapsed > self.timeout:
+                break
 
-            # Register process with ProcessManager (v5.0 enhancement)
-            ProcessManager.register_process(pid, self.command, self.process)
+    async def _run(self):
+        """Run the command on the engine loop, enforcing the timeout"""
+        self.process = await asyncio.create_subprocess_shell(
+            self.command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        pid = self.process.pid
+        logger.info(f"🆔 PROCESS: PID {pid} started")
+        process_engine.stats["commands_started"] += 1
+        process_engine.stats["running"] += 1
 
-            # Start threads to read output continuously
-            self.stdout_thread = threading.Thread(target=self._read_stdout)
-            self.stderr_thread = threading.Thread(target=self._read_stderr)
-            self.stdout_thread.daemon = True
-            self.stderr_thread.daemon = True
-            self.stdout_thread.start()
-            self.stderr_thread.start()
+        # Register process with ProcessManager (v5.0 enhancement)
+        ProcessManager.register_process(pid, self.command, _AsyncProcessHandle(self.process, asyncio.get_running_loop()))
 
-            # Start progress tracking in a separate thread
-            progress_thread = threading.Thread(target=self._show_progress, args=(self.timeout,))
-            progress_thread.daemon = True
-            progress_thread.start()
+        readers = [
+            asyncio.ensure_future(self._read_stream(self.process.stdout, False)),
+            asyncio.ensure_future(self._read_stream(self.process.stderr, True))
+        ]
+        progress_task = asyncio.ensure_future(self._show_progress())
 
-            # Wait for the process to complete or timeout
+        try:
             try:
-                self.return_code = self.process.wait(timeout=self.timeout)
+                self.return_code = await asyncio.wait_for(self.process.wait(), timeout=self.timeout)
                 self.end_time = time.time()
-
-                # Process completed, join the threads
-                self.stdout_thread.join(timeout=1)
-                self.stderr_thread.join(timeout=1)
-
                 execution_time = self.end_time - self.start_time
 
-                # Cleanup process from registry (v5.0 enhancement)
-                ProcessManager.cleanup_process(pid)
-
                 if self.return_code == 0:
                     logger.info(f"✅ SUCCESS: Command completed | Exit Code: {self.return_code} | Duration: {execution_time:.2f}s")
                     telemetry.record_execution(True, execution_time)
@@ -6937,31 +8458,80 @@ class EnhancedCommandExecutor:
                     logger.warning(f"⚠️  WARNING: Command completed with errors | Exit Code: {self.return_code} | Duration: {execution_time:.2f}s")
                     telemetry.record_execution(False, execution_time)
 
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 self.end_time = time.time()
                 execution_time = self.end_time - self.start_time
 
                 # Process timed out but we might have partial results
                 self.timed_out = True
-                logger.warning(f"⏰ TIMEOUT: Command timed out after {self.timeout}s | Terminating PID {self.process.pid}")
+                process_engine.stats["commands_timed_out"] += 1
+                logger.warning(f"⏰ TIMEOUT: Command timed out after {self.timeout}s | Terminating PID {pid}")
 
                 # Try to terminate gracefully first
-                self.process.terminate()
                 try:
-                    self.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                    self.process.terminate()
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
+                except ProcessLookupError:
+                    pass
+                except asyncio.TimeoutError:
                     # Force kill if it doesn't terminate
-                    logger.error(f"🔪 FORCE KILL: Process {self.process.pid} not responding to termination")
-                    self.process.kill()
+                    logger.error(f"🔪 FORCE KILL: Process {pid} not responding to termination")
+                    try:
+                        self.process.kill()
+                    except ProcessLookupError:
+                        pass
 
                 self.return_code = -1
                 telemetry.record_execution(False, execution_time)
 
+            # Process finished, give the readers a moment to drain the pipes
+            _, pending = await asyncio.wait(readers, timeout=1)
+            for task in pending:
+                task.cancel()
+        finally:
+            progress_task.cancel()
+            process_engine.stats["running"] -= 1
+            process_engine.stats["commands_completed"] += 1
+
+            # Cleanup process from registry (v5.0 enhancement)
+            ProcessManager.cleanup_process(pid)
+
+    def _attach_output(self, result: Dict[str, Any]):
+        """Put stdout/stderr previews in the result and register handles for truncated output"""
+        output_handles = {}
+        for capture in (self.stdout_capture, self.stderr_capture):
+            capture.finish()
+            text, truncated = capture.preview()
+            result[capture.name] = text
+            if truncated:
+                output_handles[capture.name] = output_store.register(capture, self.command)
+            else:
+                capture.close()
+
+        if output_handles:
+            result["output_handles"] = output_handles
+            result["output_bytes"] = {
+                "stdout": self.stdout_capture.size,
+                "stderr": self.stderr_capture.size
+            }
+
+    def execute(self) -> Dict[str, Any]:
+        """Execute the command with enhanced monitoring and output"""
+        self.start_time = time.time()
+
+        logger.info(f"🚀 EXECUTING: {self.command}")
+        logger.info(f"⏱️  TIMEOUT: {self.timeout}s | PID: Starting...")
+
+        try:
+            # Block only this caller; the subprocess is driven by the shared engine loop
+            process_engine.submit(self._run()).result()
+
             # Always consider it a success if we have output, even with timeout
-            success = True if self.timed_out and (self.stdout_data or self.stderr_data) else (self.return_code == 0)
+            has_output = bool(self.stdout_capture.size or self.stderr_capture.size)
+            success = True if self.timed_out and has_output else (self.return_code == 0)
 
             # Log enhanced final results with summary using ModernVisualEngine
-            output_size = len(self.stdout_data) + len(self.stderr_data)
+            output_size = self.stdout_capture.size + self.stderr_capture.size
             execution_time = self.end_time - self.start_time if self.end_time else 0
 
             # Create status summary
@@ -6987,16 +8557,16 @@ class EnhancedCommandExecutor:
                 if line.strip():
                     logger.info(line)
 
-            return {
-                "stdout": self.stdout_data,
-                "stderr": self.stderr_data,
+            result = {
                 "return_code": self.return_code,
                 "success": success,
                 "timed_out": self.timed_out,
-                "partial_results": self.timed_out and (self.stdout_data or self.stderr_data),
+                "partial_results": self.timed_out and has_output,
                 "execution_time": self.end_time - self.start_time if self.end_time else 0,
                 "timestamp": datetime.now().isoformat()
             }
+            self._attach_output(result)
+            return result
 
         except Exception as e:
             self.end_time = time.time()
@@ -7006,16 +8576,17 @@ class EnhancedCommandExecutor:
             logger.error(f"🔍 TRACEBACK: {traceback.format_exc()}")
             telemetry.record_execution(False, execution_time)
 
-            return {
-                "stdout": self.stdout_data,
-                "stderr": f"Error executing command: {str(e)}\n{self.stderr_data}",
+            result = {
                 "return_code": -1,
                 "success": False,
                 "timed_out": False,
-                "partial_results": bool(self.stdout_data or self.stderr_data),
+                "partial_results": bool(self.stdout_capture.size or self.stderr_capture.size),
                 "execution_time": execution_time,
                 "timestamp": datetime.now().isoformat()
             }
+            self._attach_output(result)
+            result["stderr"] = f"Error executing command: {str(e)}\n{result['stderr']}"
+            return result
 
 # ============================================================================
 # DUPLICATE CLASSES REMOVED - Using the first definitions above
@@ -8648,6 +10219,63 @@ cve_intelligence = CVEIntelligenceManager()
 exploit_generator = AIExploitGenerator()
 vulnerability_correlator = VulnerabilityCorrelator()
 
+class SingleFlight:
+    """Coalesce identical in-flight command executions onto one shared result.
+
+    The first caller for a key runs the work; callers arriving while it is still
+    running wait on its future and receive a copy of the same result.
+    """
+
+    def __init__(self):
+        self.flights = {}  # key -> {"future": Future, "sinks": [output callbacks]}
+        self.flight_lock = threading.Lock()
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key: str, func, on_output=None) -> Dict[str, Any]:
+        """Run func(fan_out) once per key; concurrent callers share its result"""
+        with self.flight_lock:
+            flight = self.flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = {"future": Future(), "sinks": []}
+                self.flights[key] = flight
+                self.stats["executions"] += 1
+            else:
+                self.stats["coalesced"] += 1
+            if on_output:
+                flight["sinks"].append(on_output)
+
+        if not is_leader:
+            logger.info(f"🔗 Coalesced with in-flight execution: {key[:80]}")
+            result = flight["future"].result()
+            return dict(result) if isinstance(result, dict) else result
+
+        def fan_out(stream_name: str, line: str):
+            for sink in list(flight["sinks"]):
+                sink(stream_name, line)
+
+        try:
+            result = func(fan_out)
+            flight["future"].set_result(result)
+            return result
+        except BaseException as e:
+            flight["future"].set_exception(e)
+            raise
+        finally:
+            with self.flight_lock:
+                self.flights.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        with self.flight_lock:
+            return {
+                **self.stats,
+                "in_flight": len(self.flights)
+            }
+
+# Global single-flight registry for execute_command()
+single_flight = SingleFlight()
+
 def execute_command(command: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Execute a shell command with enhanced features
@@ -8666,70 +10294,135 @@ def execute_command(command: str, use_cache: bool = True) -> Dict[str, Any]:
         if cached_result:
             return cached_result
 
-    # Execute command
-    executor = EnhancedCommandExecutor(command)
-    result = executor.execute()
+    def run(on_output):
+        executor = EnhancedCommandExecutor(command, on_output=on_output)
+        result = executor.execute()
+        tool_output_indexer.submit(command, result)
 
-    # Cache successful results
-    if use_cache and result.get("success", False):
-        cache.set(command, {}, result)
+        # Cache successful results
+        if use_cache and result.get("success", False):
+            cache.set(command, {}, result)
 
-    return result
+        return result
 
-def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict[str, Any] = None,
-                                 use_cache: bool = True, max_attempts: int = 3) -> Dict[str, Any]:
-    """
-    Execute a command with intelligent error handling and recovery
+    # Execute command, streaming lines to the client when the request asked for it
+    if not use_cache:
+        return run(_current_output_sink())
 
-    Args:
-        tool_name: Name of the tool being executed
-        command: The command to execute
-        parameters: Tool parameters for context
-        use_cache: Whether to use caching
-        max_attempts: Maximum number of recovery attempts
+    # Identical commands already running are joined instead of spawned again. The key is
+    # the exact command text: quoted whitespace and newlines matter to the shell
+    return single_flight.do(command, run, _current_output_sink())
 
-    Returns:
-        A dictionary containing execution results with recovery information
+RECOVERY_WORKERS = 16  # threads running attempts of background (wait=False) recovery jobs
+RECOVERY_BLOCKING_WORKERS = 16  # threads running attempts of jobs a request is waiting on
+RECOVERY_WAIT_TIMEOUT = COMMAND_TIMEOUT * 4  # longest a request waits before getting a job ID to poll
+RECOVERY_JOB_NAMESPACE = "recovery_jobs"  # persistent cache namespace shared by all workers
+
+class RecoveryJob:
+    """One execute_command_with_recovery run, advanced an attempt at a time.
+
+    step() never sleeps: a backoff is handed back to the RecoveryScheduler as a
+    delay and the job is resumed from its delay queue.
     """
-    if parameters is None:
-        parameters = {}
 
-    attempt_count = 0
-    last_error = None
-    recovery_history = []
+    def __init__(self, tool_name: str, command: str, parameters: Dict[str, Any],
+                 use_cache: bool, max_attempts: int):
+        self.job_id = f"recovery_{uuid.uuid4().hex[:12]}"
+        self.tool_name = tool_name
+        self.command = command
+        self.parameters = parameters
+        self.use_cache = use_cache
+        self.max_attempts = max_attempts
+        self.target = str(parameters.get("target", "unknown"))
+        self.attempt_count = 0
+        self.last_error = None
+        self.recovery_history = []
+        self.state = "pending"
+        self.created_at = time.time()
+        self.next_attempt_at = None
+        self.future = Future()
+        self.blocking = False  # a request thread is waiting on the result
+        # Streaming requests keep receiving output from attempts run on scheduler threads
+        self.output_sink = _current_output_sink()
+
+    def _recovery_info(self, final_action: str = None) -> Dict[str, Any]:
+        info = {
+            "attempts_made": self.attempt_count,
+            "recovery_applied": len(self.recovery_history) > 0 if final_action is None else True,
+            "recovery_history": self.recovery_history
+        }
+        if final_action:
+            info["final_action"] = final_action
+        return info
+
+    def finish(self, result: Dict[str, Any]):
+        self.state = "completed"
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def step(self) -> Optional[float]:
+        """Run one attempt; returns a retry delay in seconds, or None once the job has finished"""
+        tool_name = self.tool_name
+        parameters = self.parameters
+
+        if self.attempt_count >= self.max_attempts:
+            # All attempts exhausted
+            logger.error(f"🚫 All recovery attempts exhausted for {tool_name}")
+            self.finish({
+                "success": False,
+                "error": f"All recovery attempts exhausted: {str(self.last_error)}",
+                "recovery_info": self._recovery_info("all_attempts_exhausted")
+            })
+            return None
 
-    while attempt_count < max_attempts:
-        attempt_count += 1
+        # Fail fast while this tool/target keeps failing the same way
+        blocked = circuit_breakers.before_call(tool_name, self.target)
+        if blocked:
+            logger.warning(f"🚧 Circuit open for {tool_name} on {blocked['target']}, "
+                           f"skipping (retry in {blocked['retry_after']}s)")
+            info = self._recovery_info("circuit_open")
+            info["recovery_applied"] = self.attempt_count > 0
+            self.finish({
+                "success": False,
+                "error": f"Circuit open: {blocked['error']}",
+                "circuit_breaker": blocked,
+                "recovery_info": info
+            })
+            return None
+
+        self.attempt_count += 1
+        attempt_count = self.attempt_count
 
         try:
             # Execute the command
-            result = execute_command(command, use_cache)
+            result = execute_command(self.command, self.use_cache)
 
             # Check if execution was successful
             if result.get("success", False):
+                circuit_breakers.record_success(tool_name, self.target)
                 # Add recovery information to successful result
-                result["recovery_info"] = {
-                    "attempts_made": attempt_count,
-                    "recovery_applied": len(recovery_history) > 0,
-                    "recovery_history": recovery_history
-                }
-                return result
+                result["recovery_info"] = self._recovery_info()
+                self.finish(result)
+                return None
 
             # Command failed, determine if we should attempt recovery
             error_message = result.get("stderr", "Unknown error")
             exception = Exception(error_message)
+            if circuit_breakers.record_failure(tool_name, self.target, error_handler.classify_error(error_message, exception),
+                                               error_message):
+                return 0  # the breaker answers the next step
 
             # Create context for error handler
             context = {
                 "target": parameters.get("target", "unknown"),
                 "parameters": parameters,
                 "attempt_count": attempt_count,
-                "command": command
+                "command": self.command
             }
 
             # Get recovery strategy from error handler
             recovery_strategy = error_handler.handle_tool_failure(tool_name, exception, context)
-            recovery_history.append({
+            self.recovery_history.append({
                 "attempt": attempt_count,
                 "error": error_message,
                 "recovery_action": recovery_strategy.action.value,
@@ -8742,10 +10435,10 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                 backoff = recovery_strategy.parameters.get("max_delay", 60)
                 actual_delay = min(delay * (recovery_strategy.backoff_multiplier ** (attempt_count - 1)), backoff)
 
-                retry_info = f'Retrying in {actual_delay}s (attempt {attempt_count}/{max_attempts})'
+                retry_info = f'Retrying in {actual_delay}s (attempt {attempt_count}/{self.max_attempts})'
                 logger.info(f"{ModernVisualEngine.format_tool_status(tool_name, 'RECOVERY', retry_info)}")
-                time.sleep(actual_delay)
-                continue
+                self.last_error = exception
+                return actual_delay
 
             elif recovery_strategy.action == RecoveryAction.RETRY_WITH_REDUCED_SCOPE:
                 # Adjust parameters to reduce scope
@@ -8756,9 +10449,10 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                 )
 
                 # Rebuild command with adjusted parameters
-                command = _rebuild_command_with_params(tool_name, command, adjusted_params)
+                self.command = _rebuild_command_with_params(tool_name, self.command, adjusted_params)
                 logger.info(f"🔧 Retrying {tool_name} with reduced scope")
-                continue
+                self.last_error = exception
+                return 0
 
             elif recovery_strategy.action == RecoveryAction.SWITCH_TO_ALTERNATIVE_TOOL:
                 # Get alternative tool
@@ -8769,13 +10463,9 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                     logger.info(f"{ModernVisualEngine.format_tool_status(tool_name, 'RECOVERY', switch_info)}")
                     # This would require the calling function to handle tool switching
                     result["alternative_tool_suggested"] = alternative_tool
-                    result["recovery_info"] = {
-                        "attempts_made": attempt_count,
-                        "recovery_applied": True,
-                        "recovery_history": recovery_history,
-                        "final_action": "tool_switch_suggested"
-                    }
-                    return result
+                    result["recovery_info"] = self._recovery_info("tool_switch_suggested")
+                    self.finish(result)
+                    return None
                 else:
                     logger.warning(f"⚠️  No alternative tool found for {tool_name}")
 
@@ -8785,9 +10475,10 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                 adjusted_params = error_handler.auto_adjust_parameters(tool_name, error_type, parameters)
 
                 # Rebuild command with adjusted parameters
-                command = _rebuild_command_with_params(tool_name, command, adjusted_params)
+                self.command = _rebuild_command_with_params(tool_name, self.command, adjusted_params)
                 logger.info(f"🔧 Retrying {tool_name} with adjusted parameters")
-                continue
+                self.last_error = exception
+                return 0
 
             elif recovery_strategy.action == RecoveryAction.ESCALATE_TO_HUMAN:
                 # Create error context for escalation
@@ -8809,13 +10500,9 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                 )
 
                 result["human_escalation"] = escalation_data
-                result["recovery_info"] = {
-                    "attempts_made": attempt_count,
-                    "recovery_applied": True,
-                    "recovery_history": recovery_history,
-                    "final_action": "human_escalation"
-                }
-                return result
+                result["recovery_info"] = self._recovery_info("human_escalation")
+                self.finish(result)
+                return None
 
             elif recovery_strategy.action == RecoveryAction.GRACEFUL_DEGRADATION:
                 # Apply graceful degradation
@@ -8826,32 +10513,26 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
                     [tool_name]
                 )
 
-                degraded_result["recovery_info"] = {
-                    "attempts_made": attempt_count,
-                    "recovery_applied": True,
-                    "recovery_history": recovery_history,
-                    "final_action": "graceful_degradation"
-                }
-                return degraded_result
+                degraded_result["recovery_info"] = self._recovery_info("graceful_degradation")
+                self.finish(degraded_result)
+                return None
 
             elif recovery_strategy.action == RecoveryAction.ABORT_OPERATION:
                 logger.error(f"🛑 Aborting {tool_name} operation after {attempt_count} attempts")
-                result["recovery_info"] = {
-                    "attempts_made": attempt_count,
-                    "recovery_applied": True,
-                    "recovery_history": recovery_history,
-                    "final_action": "operation_aborted"
-                }
-                return result
+                result["recovery_info"] = self._recovery_info("operation_aborted")
+                self.finish(result)
+                return None
 
-            last_error = exception
+            self.last_error = exception
+            return 0
 
         except Exception as e:
-            last_error = e
+            self.last_error = e
             logger.error(f"💥 Unexpected error in recovery attempt {attempt_count}: {str(e)}")
+            circuit_breakers.record_failure(tool_name, self.target, error_handler.classify_error(str(e), e), str(e))
 
             # If this is the last attempt, escalate to human
-            if attempt_count >= max_attempts:
+            if attempt_count >= self.max_attempts:
                 error_context = ErrorContext(
                     tool_name=tool_name,
                     target=parameters.get("target", "unknown"),
@@ -8866,29 +10547,207 @@ def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict
 
                 escalation_data = error_handler.escalate_to_human(error_context, "high")
 
-                return {
+                self.finish({
                     "success": False,
                     "error": str(e),
                     "human_escalation": escalation_data,
-                    "recovery_info": {
-                        "attempts_made": attempt_count,
-                        "recovery_applied": True,
-                        "recovery_history": recovery_history,
-                        "final_action": "human_escalation_after_failure"
-                    }
-                }
+                    "recovery_info": self._recovery_info("human_escalation_after_failure")
+                })
+                return None
 
-    # All attempts exhausted
-    logger.error(f"🚫 All recovery attempts exhausted for {tool_name}")
-    return {
-        "success": False,
-        "error": f"All recovery attempts exhausted: {str(last_error)}",
-        "recovery_info": {
-            "attempts_made": attempt_count,
-            "recovery_applied": True,
-            "recovery_history": recovery_history,
-            "final_action": "all_attempts_exhausted"
+            return 0
+
+class RecoveryScheduler:
+    """Runs RecoveryJobs on a worker pool with backoff waits kept in a delay queue.
+
+    No pool thread sleeps on a retry: a job due for another attempt sits in a
+    heap until a single timer thread hands it back to the pool. Jobs a request
+    is waiting on get a pool of their own, so they never queue behind
+    background jobs, and the request thread only waits on the job's future.
+    Job state is mirrored to the
+    persistent cache so any worker process can answer a status poll.
+    """
+
+    def __init__(self, max_workers: int = RECOVERY_WORKERS, persistent: Optional["PersistentCache"] = None,
+                 blocking_workers: int = RECOVERY_BLOCKING_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hexstrike-recovery")
+        self.blocking_executor = ThreadPoolExecutor(max_workers=blocking_workers,
+                                                    thread_name_prefix="hexstrike-recovery-wait")
+        self.persistent = persistent
+        self.delay_queue = []  # heap of (due_at, seq, job)
+        self.seq = 0
+        self.delay_cond = threading.Condition()
+        self.jobs = {}  # job_id -> unfinished RecoveryJob
+        self.results = TaskResultStore()
+        self.stats = {"submitted": 0, "completed": 0, "retries_scheduled": 0, "failed": 0, "blocking": 0, "wait_timeouts": 0}
+
+        self.timer_thread = threading.Thread(target=self._timer_loop, name="hexstrike-recovery-timer", daemon=True)
+        self.timer_thread.start()
+
+    def submit(self, job: RecoveryJob) -> RecoveryJob:
+        """Start a job on the worker pool"""
+        with self.delay_cond:
+            self.jobs[job.job_id] = job
+            self.stats["submitted"] += 1
+        job.state = "queued"
+        self._persist(job)
+        self.executor.submit(self._run, job)
+        return job
+
+    def run(self, job: RecoveryJob, timeout: float = RECOVERY_WAIT_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """Run a job on the blocking pool and wait for its result; None if it outlasts the timeout"""
+        job.blocking = True
+        with self.delay_cond:
+            self.jobs[job.job_id] = job
+            self.stats["submitted"] += 1
+            self.stats["blocking"] += 1
+        job.state = "queued"
+        self._persist(job)
+        self.blocking_executor.submit(self._run, job)
+        try:
+            return job.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self.delay_cond:
+                self.stats["wait_timeouts"] += 1
+            return None
+
+    def _executor_for(self, job: RecoveryJob) -> ThreadPoolExecutor:
+        return self.blocking_executor if job.blocking else self.executor
+
+    def _run(self, job: RecoveryJob):
+        """Advance a job until it finishes or needs to wait"""
+        _output_stream_local.sink = job.output_sink
+        job.state = "running"
+        self._persist(job)
+        try:
+            while True:
+                delay = job.step()
+                if delay is None:
+                    break
+                if delay > 0:
+                    self._schedule(job, delay)
+                    return
+        except Exception as e:
+            logger.error(f"💥 Recovery job {job.job_id} crashed: {str(e)}")
+            job.finish({"success": False, "error": str(e), "recovery_info": job._recovery_info("job_failed")})
+            with self.delay_cond:
+                self.stats["failed"] += 1
+        finally:
+            _output_stream_local.sink = None
+        self._complete(job)
+
+    def _complete(self, job: RecoveryJob):
+        """Publish the final result, then forget the running job so polls never fall in between"""
+        record = {"status": "completed", "result": job.future.result(), "completed_at": time.time()}
+        self.results.put(job.job_id, record)
+        if self.persistent is not None:
+            self.persistent.set(RECOVERY_JOB_NAMESPACE, job.job_id, record, self.results.ttl)
+        with self.delay_cond:
+            self.jobs.pop(job.job_id, None)
+            self.stats["completed"] += 1
+
+    def _schedule(self, job: RecoveryJob, delay: float):
+        """Park a job in the delay queue"""
+        job.state = "waiting_retry"
+        job.next_attempt_at = time.time() + delay
+        self._persist(job)
+        with self.delay_cond:
+            self.seq += 1
+            heapq.heappush(self.delay_queue, (job.next_attempt_at, self.seq, job))
+            self.stats["retries_scheduled"] += 1
+            self.delay_cond.notify()
+
+    def _status(self, job: RecoveryJob) -> Dict[str, Any]:
+        return {
+            "status": job.state,
+            "tool": job.tool_name,
+            "attempts_made": job.attempt_count,
+            "max_attempts": job.max_attempts,
+            "next_attempt_in": round(max(0.0, job.next_attempt_at - time.time()), 1) if job.next_attempt_at else None,
+            "recovery_history": job.recovery_history
         }
+
+    def _persist(self, job: RecoveryJob):
+        """Mirror the state of an unfinished job for other worker processes"""
+        if self.persistent is None:
+            return
+        record = self._status(job)
+        record["next_attempt_at"] = job.next_attempt_at
+        self.persistent.set(RECOVERY_JOB_NAMESPACE, job.job_id, record, self.results.ttl)
+
+    def _timer_loop(self):
+        """Hand jobs back to the pool as their backoff expires"""
+        while True:
+            with self.delay_cond:
+                while not self.delay_queue or self.delay_queue[0][0] > time.time():
+                    timeout = self.delay_queue[0][0] - time.time() if self.delay_queue else None
+                    self.delay_cond.wait(timeout)
+                _, _, job = heapq.heappop(self.delay_queue)
+            job.state = "queued"
+            job.next_attempt_at = None
+            self._persist(job)
+            self._executor_for(job).submit(self._run, job)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a job, its final result, or None if unknown to every worker"""
+        with self.delay_cond:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return self._status(job)
+        result = self.results.get(job_id)
+        if result is None and self.persistent is not None:
+            # Started by another worker process (or before a restart)
+            result = self.persistent.get(RECOVERY_JOB_NAMESPACE, job_id)
+            next_attempt_at = result.pop("next_attempt_at", None) if result is not None else None
+            if next_attempt_at:
+                result["next_attempt_in"] = round(max(0.0, next_attempt_at - time.time()), 1)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.delay_cond:
+            return {
+                "active_jobs": len(self.jobs),
+                "waiting_retry": len(self.delay_queue),
+                "result_store": self.results.get_stats(),
+                **self.stats
+            }
+
+# Global recovery scheduler
+recovery_scheduler = RecoveryScheduler(persistent=persistent_cache)
+
+def execute_command_with_recovery(tool_name: str, command: str, parameters: Dict[str, Any] = None,
+                                 use_cache: bool = True, max_attempts: int = 3, wait: bool = True) -> Dict[str, Any]:
+    """
+    Execute a command with intelligent error handling and recovery
+
+    Args:
+        tool_name: Name of the tool being executed
+        command: The command to execute
+        parameters: Tool parameters for context
+        use_cache: Whether to use caching
+        max_attempts: Maximum number of recovery attempts
+        wait: Block until the final result; if False return the job ID immediately
+
+    Returns:
+        A dictionary containing execution results with recovery information,
+        or the scheduled job ID when wait is False or the job outlasts RECOVERY_WAIT_TIMEOUT
+    """
+    if parameters is None:
+        parameters = {}
+
+    job = RecoveryJob(tool_name, command, parameters, use_cache, max_attempts)
+    if wait:
+        result = recovery_scheduler.run(job)
+        if result is not None:
+            return result
+        logger.warning(f"⏰ Still recovering {tool_name} after {RECOVERY_WAIT_TIMEOUT}s, returning job {job.job_id}")
+    else:
+        recovery_scheduler.submit(job)
+    return {
+        "success": True,
+        "job_id": job.job_id,
+        "status": "scheduled",
+        "status_url": f"/api/error-handling/jobs/{job.job_id}"
     }
 
 def _rebuild_command_with_params(tool_name: str, original_command: str, new_params: Dict[str, Any]) -> str:
@@ -9033,6 +10892,117 @@ class FileOperationsManager:
 # Global file operations manager
 file_manager = FileOperationsManager()
 
+# ============================================================================
+# STREAMING COMMAND OUTPUT (SSE / JSONL)
+# ============================================================================
+
+STREAM_QUEUE_SIZE = 10000  # buffered output events per streaming request
+STREAM_KEEPALIVE_INTERVAL = 15  # seconds between SSE keep-alive comments
+STREAMABLE_PATH_PREFIXES = ("/api/command", "/api/tools/")
+
+# Per-request output sink; execute_command() hands it to the executor
+_output_stream_local = threading.local()
+
+def _current_output_sink():
+    """Return the output callback of the streaming request running on this thread"""
+    return getattr(_output_stream_local, "sink", None)
+
+def _requested_stream_format() -> Optional[str]:
+    """Return 'sse' or 'jsonl' when the client asked for streamed output"""
+    accept = request.headers.get("Accept", "")
+    if "text/event-stream" in accept:
+        return "sse"
+    if "application/x-ndjson" in accept or "application/jsonl" in accept:
+        return "jsonl"
+
+    stream_arg = request.args.get("stream", "").lower()
+    if stream_arg in ("1", "true", "yes", "sse"):
+        return "sse"
+    if stream_arg in ("jsonl", "ndjson"):
+        return "jsonl"
+    return None
+
+@app.before_request
+def stream_command_output():
+    """Serve tool endpoints as a live stream of output lines plus a final summary event.
+
+    Selected with ?stream=1 (SSE), ?stream=jsonl, or an Accept header of
+    text/event-stream / application/x-ndjson. The regular view runs in a
+    helper thread; its JSON response becomes the closing 'summary' event.
+    """
+    if request.method != "POST" or not request.path.startswith(STREAMABLE_PATH_PREFIXES):
+        return None
+
+    stream_format = _requested_stream_format()
+    view = app.view_functions.get(request.endpoint)
+    if stream_format is None or view is None:
+        return None
+
+    events = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    view_args = dict(request.view_args or {})
+    dropped = {"lines": 0}
+    closed = threading.Event()  # set once the response is closed, e.g. the client went away
+
+    def put_final(item):
+        # Wait for room while the client is still reading; give up once it is gone
+        while not closed.is_set():
+            try:
+                events.put(item, timeout=STREAM_KEEPALIVE_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def sink(stream_name: str, line: str):
+        # Called from the process engine loop - never block it on a slow client
+        try:
+            events.put_nowait(("output", {"stream": stream_name, "line": line}))
+        except queue.Full:
+            dropped["lines"] += 1
+
+    @copy_current_request_context
+    def run_view():
+        _output_stream_local.sink = sink
+        try:
+            response = app.make_response(view(**view_args))
+            put_final(("summary", {
+                "status_code": response.status_code,
+                "dropped_lines": dropped["lines"],
+                "result": response.get_json(silent=True)
+            }))
+        except Exception as e:
+            logger.error(f"💥 Error in streamed request {request.path}: {str(e)}")
+            put_final(("error", {"error": f"Server error: {str(e)}"}))
+        finally:
+            _output_stream_local.sink = None
+            put_final(None)
+
+    threading.Thread(target=run_view, name="hexstrike-stream-view", daemon=True).start()
+    logger.info(f"📡 Streaming {request.path} as {stream_format.upper()}")
+
+    def generate():
+        while True:
+            try:
+                item = events.get(timeout=STREAM_KEEPALIVE_INTERVAL)
+            except queue.Empty:
+                if stream_format == "sse":
+                    yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            event, data = item
+            if stream_format == "sse":
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+            else:
+                yield json.dumps({"event": event, **data}) + "\n"
+
+    response = Response(
+        generate(),
+        mimetype="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    response.call_on_close(closed.set)
+    return response
+
 # API Routes
 
 @app.route("/", methods=["GET"])
@@ -9076,9 +11046,11 @@ def api_index():
         "endpoints": {
             "core": {
                 "GET /": "Server information and status",
-                "GET /health": "Health check with tool availability",
+                "GET /health": "Health check with tool availability (?deep=1 re-probes tools and versions)",
                 "GET /api": "API documentation (this endpoint)",
-                "POST /api/command": "Execute arbitrary commands"
+                "POST /api/command": "Execute arbitrary commands",
+                "GET /api/command/output/<handle>": "Read full output of a truncated command result",
+                "POST /api/command?stream=1": "Stream output as Server-Sent Events (also /api/tools/*; ?stream=jsonl for JSON lines)"
             },
             "intelligence": {
                 "POST /api/intelligence/analyze-target": "AI-powered target analysis",
@@ -9101,6 +11073,13 @@ def api_index():
                 "GET /api/cache/stats": "Cache statistics",
                 "POST /api/cache/clear": "Clear cache"
             },
+            "database": {
+                "GET /api/database/stats": "Table counts, write-behind and audit writer metrics",
+                "POST /api/database/backup": "Start an online backup (optional file name inside the backup directory, compress, keep)",
+                "GET /api/database/backup/status": "Progress and duration of the running or last backup",
+                "GET /api/search": "Full-text search over vulnerabilities and tool output (?q=&kinds=&limit=&cursor=&raw=1)",
+                "GET /api/search/tool-output/<id>": "Full stored tool output chunk"
+            },
             "settings": {
                 "GET /api/config/settings": "Get settings",
                 "PUT /api/config/settings": "Update settings"
@@ -9181,14 +11160,14 @@ def health_check():
         password_tools + binary_tools + forensics_tools + cloud_tools +
         osint_tools + exploitation_tools + api_tools + wireless_tools + additional_tools
     )
-    tools_status = {}
-
-    for tool in all_tools:
-        try:
-            result = execute_command(f"which {tool}", use_cache=True)
-            tools_status[tool] = result["success"]
-        except:
-            tools_status[tool] = False
+    # ?deep=1 rescans PATH and re-probes versions; otherwise read the inventory index
+    deep = request.args.get("deep", "0").lower() in ("1", "true", "yes")
+    tool_details = None
+    if deep:
+        tool_details = tool_inventory.probe(all_tools)
+        tools_status = {tool: details["available"] for tool, details in tool_details.items()}
+    else:
+        tools_status = tool_inventory.status(all_tools)
 
     all_essential_tools_available = all(tools_status[tool] for tool in essential_tools)
 
@@ -9208,7 +11187,7 @@ def health_check():
         "additional": {"total": len(additional_tools), "available": sum(1 for tool in additional_tools if tools_status.get(tool, False))}
     }
 
-    return jsonify({
+    response = {
         "status": "healthy",
         "message": "HexStrike AI Tools API Server is operational",
         "version": "6.0.0",
@@ -9217,10 +11196,14 @@ def health_check():
         "total_tools_available": sum(1 for tool, available in tools_status.items() if available),
         "total_tools_count": len(all_tools),
         "category_stats": category_stats,
+        "tool_inventory": tool_inventory.get_stats(),
         "cache_stats": cache.get_stats(),
         "telemetry": telemetry.get_stats(),
         "uptime": time.time() - telemetry.stats["start_time"]
-    })
+    }
+    if tool_details is not None:
+        response["tool_details"] = tool_details
+    return jsonify(response)
 
 @app.route("/api/command", methods=["POST"])
 def generic_command():
@@ -9245,6 +11228,38 @@ def generic_command():
             "error": f"Server error: {str(e)}"
         }), 500
 
+@app.route("/api/command/output/<handle>", methods=["GET"])
+def get_command_output(handle):
+    """Read the full output of a command whose response carried only a preview"""
+    try:
+        offset = max(0, request.args.get("offset", 0, type=int))
+        limit = min(max(1, request.args.get("limit", OUTPUT_PREVIEW_BYTES, type=int)), 16 * 1024 * 1024)
+
+        # Pinned while reading so eviction cannot delete the spill file underneath us
+        with output_store.open(handle) as capture:
+            if capture is None:
+                return jsonify({
+                    "error": f"Output handle {handle} not found or expired"
+                }), 404
+            data = capture.read(offset, limit)
+            stream, total_bytes = capture.name, capture.size
+
+        return jsonify({
+            "success": True,
+            "handle": handle,
+            "stream": stream,
+            "offset": offset,
+            "next_offset": offset + len(data),
+            "total_bytes": total_bytes,
+            "eof": offset + len(data) >= total_bytes,
+            "data": data.decode("utf-8", errors="replace")
+        })
+    except Exception as e:
+        logger.error(f"💥 Error reading command output: {str(e)}")
+        return jsonify({
+            "error": f"Server error: {str(e)}"
+        }), 500
+
 # File Operations API Endpoints
 
 @app.route("/api/files/create", methods=["POST"])
@@ -9361,8 +11376,7 @@ def cache_stats():
 @app.route("/api/cache/clear", methods=["POST"])
 def clear_cache():
     """Clear the cache"""
-    cache.cache.clear()
-    cache.stats = {"hits": 0, "misses": 0, "evictions": 0}
+    cache.clear()
     logger.info("🧹 Cache cleared")
     return jsonify({"success": True, "message": "Cache cleared"})
 
@@ -9372,6 +11386,18 @@ def get_telemetry():
     """Get system telemetry"""
     return jsonify(telemetry.get_stats())
 
+@app.route("/api/database/stats", methods=["GET"])
+def database_stats():
+    """Get database, API state writer and audit writer statistics"""
+    try:
+        stats = {"state_store": state_store.get_stats(), "tool_output_indexer": tool_output_indexer.get_stats()}
+        if state_store.db is not None:
+            stats["database"] = state_store.db.get_database_stats()
+        return jsonify(stats)
+    except Exception as e:
+        logger.error(f"💥 Error getting database stats: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 # ============================================================================
 # PROCESS MANAGEMENT API ENDPOINTS (v5.0 ENHANCEMENT)
 # ============================================================================
@@ -9505,6 +11531,7 @@ def process_dashboard():
     try:
         processes = ProcessManager.list_active_processes()
         current_time = time.time()
+        system_snapshot = resource_sampler.get_snapshot()
 
         # Create beautiful dashboard using ModernVisualEngine
         dashboard_visual = ModernVisualEngine.create_live_dashboard(processes)
@@ -9515,9 +11542,9 @@ def process_dashboard():
             "visual_dashboard": dashboard_visual,
             "processes": [],
             "system_load": {
-                "cpu_percent": psutil.cpu_percent(interval=1),
-                "memory_percent": psutil.virtual_memory().percent,
-                "active_connections": len(psutil.net_connections())
+                "cpu_percent": system_snapshot["cpu_percent"],
+                "memory_percent": system_snapshot["memory_percent"],
+                "active_connections": system_snapshot["active_connections"]
             }
         }
 
@@ -10449,7 +12476,8 @@ def nmap():
                 "ports": ports,
                 "additional_args": additional_args
             }
-            result = execute_command_with_recovery("nmap", command, tool_params)
+            result = execute_command_with_recovery("nmap", command, tool_params,
+                                                   wait=not params.get("async", False))
         else:
             result = execute_command(command)
 
@@ -10501,7 +12529,8 @@ def gobuster():
                 "wordlist": wordlist,
                 "additional_args": additional_args
             }
-            result = execute_command_with_recovery("gobuster", command, tool_params)
+            result = execute_command_with_recovery("gobuster", command, tool_params,
+                                                   wait=not params.get("async", False))
         else:
             result = execute_command(command)
 
@@ -10557,7 +12586,8 @@ def nuclei():
                 "template": template,
                 "additional_args": additional_args
             }
-            result = execute_command_with_recovery("nuclei", command, tool_params)
+            result = execute_command_with_recovery("nuclei", command, tool_params,
+                                                   wait=not params.get("async", False))
         else:
             result = execute_command(command)
 
@@ -13347,24 +15377,1014 @@ def uro():
         if blacklist:
             command += f" --blacklist {blacklist}"
 
-        if additional_args:
-            command += f" {additional_args}"
+        if additional_args:
+            command += f" {additional_args}"
+
+        logger.info("🔍 Starting uro URL filtering")
+        result = execute_command(command)
+        logger.info("📊 uro URL filtering completed")
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"💥 Error in uro endpoint: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+# ============================================================================
+# ADVANCED WEB SECURITY TOOLS CONTINUED
+# ============================================================================
+
+# ============================================================================
+# ENHANCED HTTP TESTING FRAMEWORK (BURP SUITE ALTERNATIVE)
+# ============================================================================
+
+INTRUDER_CONCURRENCY = 20  # requests in flight per attack
+INTRUDER_MAX_CONCURRENCY = 200
+INTRUDER_TIMEOUT = 30  # seconds per request
+INTRUDER_LENGTH_DELTA = 150  # response size change (bytes) that marks a result as interesting
+INTRUDER_DELAY_THRESHOLD = 4.0  # seconds slower than the baseline that marks a result as interesting
+INTRUDER_MAX_INTERESTING = 50  # interesting results returned in the response
+INTRUDER_MODES = ("sniper", "pitchfork", "cluster_bomb")
+
+class HostRateLimiter:
+    """Spaces requests to each host at most `rate` per second (0 = unlimited)"""
+
+    def __init__(self, rate: float = 0):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.next_slot = {}
+
+    async def acquire(self, host: str):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot.get(host, now))
+        self.next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class IntruderEngine:
+    """Concurrent aiohttp attack engine behind HTTPTestingFramework's intruder.
+
+    The request template (URL, headers, cookies, body) is prepared once;
+    each attempt only substitutes its payloads. Requests share one
+    connection pool, a fixed number of workers pull attempts from a lazy
+    generator, and each response is compared with the baseline as it
+    arrives, so memory stays flat however many combinations are queued.
+    """
+
+    def __init__(self, url: str, method: str, location: str, params: List[str],
+                 base_data: Dict[str, Any], headers: Dict[str, str], cookies: Dict[str, str],
+                 proxy: Optional[str] = None, concurrency: int = INTRUDER_CONCURRENCY,
+                 rate_limit: float = 0, timeout: float = INTRUDER_TIMEOUT, verify_ssl: bool = True):
+        self.url = url
+        self.method = method.upper()
+        self.location = location
+        self.params = params
+        self.base_data = dict(base_data or {})
+        self.headers = dict(headers)
+        self.cookies = dict(cookies)
+        self.proxy = proxy
+        self.concurrency = max(1, min(int(concurrency), INTRUDER_MAX_CONCURRENCY))
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+
+        parsed = urlparse(url)
+        self.host = parsed.netloc
+        self.base_query = urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        self.url_parts = parsed
+
+    @staticmethod
+    def attempts(mode: str, params: List[str], payloads: list) -> Iterator[Dict[str, str]]:
+        """Yield {param: payload} assignments for the attack mode.
+
+        payloads is either one list used for every parameter or, for pitchfork
+        and cluster bomb, a list of lists with one payload set per parameter.
+        """
+        per_param = isinstance(payloads[0], (list, tuple)) if payloads else False
+        sets = [list(payloads[i]) if per_param else list(payloads) for i in range(len(params))]
+        if mode == "sniper":
+            for index, param in enumerate(params):
+                for payload in sets[index]:
+                    yield {param: payload}
+        elif mode == "pitchfork":
+            for combination in zip(*sets):
+                yield dict(zip(params, combination))
+        elif mode == "cluster_bomb":
+            for combination in itertools.product(*sets):
+                yield dict(zip(params, combination))
+        else:
+            raise ValueError(f"Unknown intruder mode: {mode}. Must be one of: {', '.join(INTRUDER_MODES)}")
+
+    def _build(self, assignment: Dict[str, str]) -> Dict[str, Any]:
+        """Request arguments for one attempt"""
+        url = self.url
+        headers = self.headers
+        cookies = self.cookies
+        data = self.base_data
+        if assignment:
+            if self.location == "query":
+                query = [(k, assignment.get(k, v)) for k, v in self.base_query]
+                query += [(k, v) for k, v in assignment.items() if k not in dict(self.base_query)]
+                url = urllib.parse.urlunparse(self.url_parts._replace(query=urllib.parse.urlencode(query)))
+            elif self.location == "body":
+                data = {**data, **assignment}
+            elif self.location == "headers":
+                headers = {**headers, **assignment}
+            elif self.location == "cookie":
+                cookies = {**cookies, **assignment}
+        request_args = {"headers": headers, "cookies": cookies, "proxy": self.proxy,
+                        "ssl": None if self.verify_ssl else False, "allow_redirects": True}
+        if data:
+            request_args["params" if self.method == "GET" else "data"] = data
+        return {"method": self.method, "url": url, **request_args}
+
+    async def _send(self, session: "aiohttp.ClientSession", assignment: Dict[str, str]) -> Dict[str, Any]:
+        request_args = self._build(assignment)
+        await self.rate_limiter.acquire(self.host)
+        started = time.perf_counter()
+        try:
+            async with session.request(**request_args) as response:
+                body = await response.read()
+                return {"status_code": response.status, "size": len(body), "body": body,
+                        "time": round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            return {"error": str(e) or type(e).__name__, "time": round(time.perf_counter() - started, 3)}
+
+    def _compare(self, baseline: Dict[str, Any], assignment: Dict[str, str],
+                 response: Dict[str, Any]) -> Dict[str, Any]:
+        """Diff one response against the baseline"""
+        body = response.pop("body", b"")
+        result = {"payloads": assignment, **response}
+        if "error" in response:
+            return result
+        reflected = [p for p in assignment.values() if p and p.encode("utf-8", "ignore") in body]
+        reasons = []
+        if "status_code" in baseline and response["status_code"] != baseline["status_code"]:
+            reasons.append("status")
+        if "size" in baseline and abs(response["size"] - baseline["size"]) > INTRUDER_LENGTH_DELTA:
+            reasons.append("length")
+        if "time" in baseline and response["time"] - baseline["time"] > INTRUDER_DELAY_THRESHOLD:
+            reasons.append("delay")
+        if reflected:
+            reasons.append("reflected")
+        result.update(reflected=bool(reflected), interesting=bool(reasons), reasons=reasons)
+        return result
+
+    async def run(self, mode: str, payloads: list, max_requests: int,
+                  on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        attempts = itertools.islice(self.attempts(mode, self.params, payloads), max(0, int(max_requests)))
+        summary = {"tested": 0, "errors": 0, "interesting": [], "interesting_total": 0, "status_counts": {}}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.perf_counter()
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            baseline = await self._send(session, {})
+            baseline.pop("body", None)
+
+            async def worker():
+                for assignment in attempts:
+                    result = self._compare(baseline, assignment, await self._send(session, assignment))
+                    summary["tested"] += 1
+                    if "error" in result:
+                        summary["errors"] += 1
+                    else:
+                        status = str(result["status_code"])
+                        summary["status_counts"][status] = summary["status_counts"].get(status, 0) + 1
+                        if result["interesting"]:
+                            summary["interesting_total"] += 1
+                            if len(summary["interesting"]) < INTRUDER_MAX_INTERESTING:
+                                summary["interesting"].append(result)
+                    if on_result:
+                        on_result(result)
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        elapsed = time.perf_counter() - started
+        return {
+            "success": True,
+            "mode": mode,
+            "baseline": baseline,
+            **summary,
+            "elapsed_seconds": round(elapsed, 3),
+            "requests_per_second": round(summary["tested"] / elapsed, 1) if elapsed else 0
+        }
+
+SPIDER_CONCURRENCY = 16  # pages fetched in parallel
+SPIDER_PER_HOST_CONCURRENCY = 8  # parallel requests to any one host
+SPIDER_TIMEOUT = 10  # seconds per page
+SPIDER_MAX_BODY_BYTES = 5 * 1024 * 1024  # larger pages are not parsed
+SPIDER_BLOOM_THRESHOLD = 1_000_000  # crawls allowed this many pages track seen URLs in a Bloom filter
+SPIDER_BLOOM_ERROR_RATE = 0.001
+
+class SeenDigestSet:
+    """Seen-URL set storing 8-byte digests instead of URL strings"""
+
+    def __init__(self):
+        self.digests = set()
+
+    def add(self, url: str) -> bool:
+        """Add url; False if it was already present"""
+        digest = hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+        if digest in self.digests:
+            return False
+        self.digests.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self.digests)
+
+class BloomFilter:
+    """Fixed-size Bloom filter for seen URLs in very large crawls (rare false positives skip a URL)"""
+
+    def __init__(self, capacity: int, error_rate: float = SPIDER_BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, url: str) -> bool:
+        """Add url; False if it was (probably) already present"""
+        digest = hashlib.blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        new = False
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        self.count += new
+        return new
+
+    def __len__(self):
+        return self.count
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical form used for de-duplication: lower-case scheme and host, no
+    default port or fragment, '/' for an empty path and sorted query parameters"""
+    try:
+        parts = urlparse(url)
+        port = parts.port  # raises for a non-numeric or out of range port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return None
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    netloc = f"{host}:{port}" if port not in (None, 80 if scheme == "http" else 443) else host
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunparse((scheme, netloc, parts.path or "/", parts.params, query, ""))
+
+class _LinkFormParser(HTMLParser):
+    """Streaming extraction of links and forms (used when lxml is not installed)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.forms = []
+        self.form = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.links.append(href)
+        elif tag == "form":
+            attrs = dict(attrs)
+            self.form = {"action": attrs.get("action") or "", "method": (attrs.get("method") or "GET").upper(), "inputs": []}
+            self.forms.append(self.form)
+        elif tag in ("input", "textarea", "select") and self.form is not None:
+            attrs = dict(attrs)
+            self.form["inputs"].append({"name": attrs.get("name") or "", "type": attrs.get("type") or "text",
+                                        "value": attrs.get("value") or ""})
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self.form = None
+
+def extract_links_and_forms(body: bytes, encoding: Optional[str] = None) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Hrefs of <a> tags and forms with their inputs, via lxml when available.
+
+    lxml is given the raw bytes so it can honour the page's own charset
+    declaration; the fallback parser decodes with the response charset.
+    """
+    if lxml_html is not None:
+        try:
+            root = lxml_html.fromstring(body)
+        except Exception:
+            return [], []
+        links = root.xpath("//a/@href")
+        forms = [{
+            "action": form.get("action") or "",
+            "method": (form.get("method") or "GET").upper(),
+            "inputs": [{"name": field.get("name") or "", "type": field.get("type") or "text",
+                        "value": field.get("value") or ""}
+                       for field in form.iter("input", "textarea", "select")]
+        } for form in root.iter("form")]
+        return links, forms
+
+    parser = _LinkFormParser()
+    try:
+        parser.feed(body.decode(encoding or "utf-8", errors="replace"))
+        parser.close()
+    except Exception:
+        pass
+    return parser.links, parser.forms
+
+def cookies_for_url(jar: "requests.cookies.RequestsCookieJar", url: str) -> Dict[str, str]:
+    """Cookies from jar that a browser would send to url (domain, path and secure rules)"""
+    header = requests.cookies.get_cookie_header(jar, requests.Request("GET", url).prepare())
+    if not header:
+        return {}
+    return dict(pair.split("=", 1) for pair in header.split("; ") if "=" in pair)
+
+class SpiderEngine:
+    """Concurrent same-host crawler behind HTTPTestingFramework.spider_website.
+
+    A deque frontier is drained breadth-first by a pool of workers sharing one
+    connection pool; each host gets its own concurrency cap and optional rate
+    limit. URLs are normalized and recorded on enqueue, so a page is queued
+    at most once.
+    """
+
+    def __init__(self, headers: Dict[str, str], cookie_jar: "requests.cookies.RequestsCookieJar",
+                 proxy: Optional[str] = None, concurrency: int = SPIDER_CONCURRENCY, per_host: int = SPIDER_PER_HOST_CONCURRENCY,
+                 rate_limit: float = 0, timeout: float = SPIDER_TIMEOUT,
+                 on_url: Callable[[str], None] = None, on_form: Callable[[Dict[str, Any]], None] = None):
+        self.headers = headers
+        self.cookie_jar = cookie_jar
+        self.proxy = proxy
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.host_slots = {}
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.timeout = timeout
+        self.on_url = on_url
+        self.on_form = on_form
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self.host_slots.get(host)
+        if slot is None:
+            slot = self.host_slots[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def _fetch(self, session: "aiohttp.ClientSession", url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """(body, charset) of an HTML page that returned 200, else None.
+
+        Bodies are read up to SPIDER_MAX_BODY_BYTES; pages that are not HTML
+        or run past the cap come back with an empty body and are not parsed.
+        """
+        host = urlparse(url).netloc
+        async with self._host_slot(host):
+            await self.rate_limiter.acquire(host)
+            async with session.get(url, headers=self.headers, cookies=cookies_for_url(self.cookie_jar, url),
+                                   proxy=self.proxy) as response:
+                if response.status != 200:
+                    return None
+                if "html" not in response.headers.get("Content-Type", "text/html"):
+                    return b"", None
+                if (response.content_length or 0) > SPIDER_MAX_BODY_BYTES:
+                    return b"", None
+                body = bytearray()
+                while len(body) <= SPIDER_MAX_BODY_BYTES:
+                    chunk = await response.content.read(SPIDER_MAX_BODY_BYTES + 1 - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+                if len(body) > SPIDER_MAX_BODY_BYTES:
+                    return b"", None
+                return bytes(body), response.charset
+
+    async def crawl(self, base_url: str, max_depth: int, max_pages: int) -> Dict[str, Any]:
+        start_url = normalize_url(base_url)
+        if start_url is None:
+            return {"success": False, "error": f"Unsupported URL: {base_url}"}
+        base_netloc = urlparse(start_url).netloc
+        seen = BloomFilter(max_pages * 20) if max_pages >= SPIDER_BLOOM_THRESHOLD else SeenDigestSet()
+        seen.add(start_url)
+        frontier = deque([(start_url, 0)])
+        discovered, forms = [], []
+        stats = {"fetched": 0, "errors": 0}
+        state = {"in_flight": 0, "done": False}
+        wakeup = asyncio.Condition()
+        started = time.perf_counter()
+
+        async def visit(session, url, depth):
+            try:
+                page = await self._fetch(session, url)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.debug(f"Error spidering {url}: {str(e)}")
+                return
+            stats["fetched"] += 1
+            if page is None or state["done"]:
+                return
+            body, charset = page
+            discovered.append(url)
+            if self.on_url:
+                self.on_url(url)
+            if len(discovered) >= max_pages:
+                state["done"] = True
+            if not body:
+                return
+
+            links, page_forms = extract_links_and_forms(body, charset)
+            for form in page_forms:
+                form = {"url": url, **form, "action": urljoin(url, form["action"])}
+                forms.append(form)
+                if self.on_form:
+                    self.on_form(form)
+            if depth >= max_depth:
+                return
+            for href in links:
+                link = normalize_url(urljoin(url, href.strip()))
+                if link and urlparse(link).netloc == base_netloc and seen.add(link):
+                    frontier.append((link, depth + 1))
+
+        async def worker(session):
+            while True:
+                async with wakeup:
+                    while not frontier and state["in_flight"] and not state["done"]:
+                        await wakeup.wait()
+                    if state["done"] or not frontier:
+                        wakeup.notify_all()
+                        return
+                    url, depth = frontier.popleft()
+                    state["in_flight"] += 1
+                try:
+                    await visit(session, url, depth)
+                finally:
+                    async with wakeup:
+                        state["in_flight"] -= 1
+                        wakeup.notify_all()
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(worker(session) for _ in range(self.concurrency)))
+
+        elapsed = time.perf_counter() - started
+        return {
+            "success": True,
+            "discovered_urls": discovered,
+            "forms": forms,
+            "total_pages": len(discovered),
+            "stats": {
+                **stats,
+                "queued_unvisited": len(frontier),
+                "seen_urls": len(seen),
+                "parser": "lxml" if lxml_html is not None else "html.parser",
+                "elapsed_seconds": round(elapsed, 3),
+                "pages_per_second": round(stats["fetched"] / elapsed, 1) if elapsed else 0
+            }
+        }
+
+PROXY_HISTORY_PATH = os.environ.get(
+    "HEXSTRIKE_PROXY_HISTORY_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "hexstrike_proxy_history.db"))
+PROXY_HISTORY_MAX_ENTRIES = int(os.environ.get("HEXSTRIKE_PROXY_HISTORY_MAX", 100000))
+PROXY_HISTORY_MAX_BODY_BYTES = 1024 * 1024  # longer bodies are truncated before storage
+PROXY_HISTORY_PRUNE_EVERY = 500  # writes between retention checks
+PROXY_HISTORY_RAW_BODY_BYTES = 64  # bodies this small are stored uncompressed
+PROXY_HISTORY_MAX_EXPORT = 10000  # entries per HAR export
+HTTP_VULN_HISTORY_MAX = 1000  # findings kept by the HTTP framework
+
+class ProxyHistoryStore:
+    """Disk-backed HTTP framework history.
+
+    Request/response metadata goes into an indexed SQLite table (host, path,
+    status and time), so filtered, paginated queries and HAR export never
+    load the whole history. Bodies are stored once per SHA-256 content hash
+    and compressed with zstd when the optional zstandard package is
+    installed, zlib otherwise. The oldest entries beyond max_entries are
+    pruned together with bodies nothing references any more.
+    """
+
+    def __init__(self, db_path: str = PROXY_HISTORY_PATH, max_entries: int = PROXY_HISTORY_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.stats_lock = threading.Lock()
+        self.stats = {"recorded": 0, "bodies_stored": 0, "bodies_deduplicated": 0, "pruned": 0, "errors": 0}
+        self.writes_since_prune = 0
+        self.codec = "zstd" if zstandard is not None else "zlib"
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at REAL NOT NULL,
+                    method TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    host TEXT,
+                    path TEXT,
+                    status INTEGER,
+                    elapsed REAL,
+                    mime_type TEXT,
+                    request_headers TEXT,
+                    response_headers TEXT,
+                    request_body TEXT,
+                    response_body TEXT,
+                    response_size INTEGER
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bodies (
+                    hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_host ON history(host, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_path ON history(path, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_status ON history(status, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_started ON history(started_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection; sqlite3 connections are not shared across threads"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def _compress(self, body: bytes) -> Tuple[str, bytes]:
+        if len(body) <= PROXY_HISTORY_RAW_BODY_BYTES:
+            return "raw", body
+        if self.codec == "zstd":
+            return "zstd", zstandard.ZstdCompressor(level=3).compress(body)
+        return "zlib", zlib.compress(body, 6)
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Body was stored with zstd; install zstandard to read it")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if codec == "zlib":
+            return zlib.decompress(data)
+        return data
+
+    def _store_body(self, conn: sqlite3.Connection, body: Optional[bytes]) -> Optional[str]:
+        """Store a body once per content hash and return the hash"""
+        if not body:
+            return None
+        body = body[:PROXY_HISTORY_MAX_BODY_BYTES]
+        digest = hashlib.sha256(body).hexdigest()
+        if conn.execute("SELECT 1 FROM bodies WHERE hash = ?", (digest,)).fetchone():
+            self._count("bodies_deduplicated")
+            return digest
+        codec, data = self._compress(body)
+        conn.execute("INSERT OR IGNORE INTO bodies (hash, codec, size, data) VALUES (?, ?, ?, ?)",
+                     (digest, codec, len(body), data))
+        self._count("bodies_stored")
+        return digest
+
+    def record(self, method: str, url: str, request_headers: Dict[str, str], request_body: Optional[bytes],
+               status: int, response_headers: Dict[str, str], response_body: Optional[bytes],
+               elapsed: float, started_at: float = None) -> Optional[int]:
+        """Append one request/response pair; returns its history ID"""
+        parsed = urlparse(url)
+        try:
+            conn = self._connection()
+            with conn:
+                # Take the write lock first: a concurrent prune() must not delete a
+                # deduplicated body between the lookup and the history insert
+                conn.execute("BEGIN IMMEDIATE")
+                request_hash = self._store_body(conn, request_body)
+                response_hash = self._store_body(conn, response_body)
+                cursor = conn.execute("""
+                    INSERT INTO history (started_at, method, url, host, path, status, elapsed, mime_type,
+                                         request_headers, response_headers, request_body, response_body,
+                                         response_size)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (started_at or time.time(), method.upper(), url, (parsed.hostname or "").lower(),
+                      parsed.path or "/", status, elapsed, response_headers.get("Content-Type", ""),
+                      json.dumps(request_headers), json.dumps(response_headers), request_hash, response_hash,
+                      len(response_body or b"")))
+            self._count("recorded")
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"⚠️  Could not record proxy history: {str(e)}")
+            return None
+
+        with self.stats_lock:
+            self.writes_since_prune += 1
+            prune = self.writes_since_prune >= PROXY_HISTORY_PRUNE_EVERY
+            if prune:
+                self.writes_since_prune = 0
+        if prune:
+            self.prune()
+        return cursor.lastrowid
+
+    def prune(self):
+        """Drop the oldest entries beyond max_entries and bodies no longer referenced"""
+        conn = self._connection()
+        with conn:
+            removed = conn.execute(
+                "DELETE FROM history WHERE id <= (SELECT MAX(id) FROM history) - ?", (self.max_entries,)).rowcount
+            if removed:
+                conn.execute("""
+                    DELETE FROM bodies WHERE hash NOT IN (
+                        SELECT request_body FROM history WHERE request_body IS NOT NULL
+                        UNION SELECT response_body FROM history WHERE response_body IS NOT NULL)
+                """)
+        if removed:
+            self._count("pruned", removed)
+
+    def _filters(self, host: str = None, path: str = None, status: int = None, method: str = None,
+                 since: float = None, until: float = None) -> Tuple[str, list]:
+        conditions, params = [], []
+        if host:
+            conditions.append("host = ?")
+            params.append(host.lower())
+        if path:
+            # Prefix match that can still use idx_history_path
+            conditions.append("path >= ? AND path < ?")
+            params.extend([path, path + "\U0010ffff"])
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(int(status))
+        if method:
+            conditions.append("method = ?")
+            params.append(method.upper())
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(float(since))
+        if until is not None:
+            conditions.append("started_at < ?")
+            params.append(float(until))
+        return " AND ".join(conditions), params
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "request": {
+                "id": row["id"],
+                "url": row["url"],
+                "method": row["method"],
+                "headers": json.loads(row["request_headers"] or "{}"),
+                "timestamp": datetime.fromtimestamp(row["started_at"]).isoformat()
+            },
+            "response": {
+                "status_code": row["status"],
+                "headers": json.loads(row["response_headers"] or "{}"),
+                "size": row["response_size"],
+                "time": row["elapsed"]
+            }
+        }
+
+    def query(self, limit: int = 100, cursor: str = None, **filters) -> Dict[str, Any]:
+        """Newest-first page of history summaries matching the filters (host, path prefix, status, method, since, until)"""
+        where, params = self._filters(**filters)
+        limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        if cursor:
+            where = " AND ".join(filter(None, [where, "id < ?"]))
+            params.append(int(decode_cursor(cursor, 1)[0]))
+        sql = "SELECT * FROM history" + (f" WHERE {where}" if where else "") + " ORDER BY id DESC LIMIT ?"
+        rows = self._connection().execute(sql, params + [limit + 1]).fetchall()
+        next_cursor = encode_cursor([rows[limit - 1]["id"]]) if len(rows) > limit else None
+        return {"items": [self._summary(row) for row in rows[:limit]], "next_cursor": next_cursor}
+
+    def _body(self, digest: Optional[str]) -> Optional[bytes]:
+        if not digest:
+            return None
+        row = self._connection().execute("SELECT codec, data FROM bodies WHERE hash = ?", (digest,)).fetchone()
+        return self._decompress(row["codec"], row["data"]) if row else None
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """One history entry including its decoded bodies"""
+        row = self._connection().execute("SELECT * FROM history WHERE id = ?", (entry_id,)).fetchone()
+        if row is None:
+            return None
+        entry = self._summary(row)
+        request_body = self._body(row["request_body"])
+        response_body = self._body(row["response_body"]) or b""
+        entry["request"]["data"] = request_body.decode("utf-8", "replace") if request_body else None
+        entry["response"]["content"] = response_body.decode("utf-8", "replace")
+        return entry
+
+    def iter_har_entries(self, limit: int = PROXY_HISTORY_MAX_EXPORT, **filters) -> Iterator[Dict[str, Any]]:
+        """HAR 1.2 entries, oldest first, decoded one row at a time"""
+        where, params = self._filters(**filters)
+        # Newest `limit` matches, returned in chronological order
+        sql = ("SELECT * FROM (SELECT * FROM history" + (f" WHERE {where}" if where else "") +
+               " ORDER BY id DESC LIMIT ?) ORDER BY id")
+        for row in self._connection().execute(sql, params + [min(int(limit), PROXY_HISTORY_MAX_EXPORT)]):
+            parsed = urlparse(row["url"])
+            request_headers = json.loads(row["request_headers"] or "{}")
+            response_headers = json.loads(row["response_headers"] or "{}")
+            request_body = self._body(row["request_body"])
+            response_body = self._body(row["response_body"]) or b""
+            try:
+                content = {"text": response_body.decode("utf-8")}
+            except UnicodeDecodeError:
+                content = {"text": base64.b64encode(response_body).decode("ascii"), "encoding": "base64"}
+            elapsed_ms = round((row["elapsed"] or 0) * 1000, 3)
+            request_entry = {
+                "method": row["method"],
+                "url": row["url"],
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": [{"name": k, "value": v} for k, v in request_headers.items()],
+                "queryString": [{"name": k, "value": v}
+                                for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)],
+                "headersSize": -1,
+                "bodySize": len(request_body or b"")
+            }
+            if request_body:
+                request_entry["postData"] = {"mimeType": request_headers.get("Content-Type", ""),
+                                             "text": request_body.decode("utf-8", "replace")}
+            yield {
+                "startedDateTime": datetime.fromtimestamp(row["started_at"]).astimezone().isoformat(),
+                "time": elapsed_ms,
+                "request": request_entry,
+                "response": {
+                    "status": row["status"],
+                    "statusText": "",
+                    "httpVersion": "HTTP/1.1",
+                    "cookies": [],
+                    "headers": [{"name": k, "value": v} for k, v in response_headers.items()],
+                    "content": {"size": row["response_size"], "mimeType": row["mime_type"] or "", **content},
+                    "redirectURL": response_headers.get("Location", ""),
+                    "headersSize": -1,
+                    "bodySize": row["response_size"]
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": elapsed_ms, "receive": 0}
+            }
+
+    def export_har(self, limit: int = PROXY_HISTORY_MAX_EXPORT, **filters) -> Iterator[str]:
+        """HAR 1.2 document as JSON text chunks, one entry per chunk.
+
+        Arguments are validated before the first chunk, so bad filters raise
+        ValueError here rather than halfway through a streamed response.
+        """
+        self._filters(**filters)
+        return self._har_chunks(int(limit), filters)
+
+    def _har_chunks(self, limit: int, filters: Dict[str, Any]) -> Iterator[str]:
+        creator = json.dumps({"name": "HexStrike AI", "version": "6.0"})
+        yield f'{{"log": {{"version": "1.2", "creator": {creator}, "entries": ['
+        for index, entry in enumerate(self.iter_har_entries(limit, **filters)):
+            yield ("," if index else "") + json.dumps(entry)
+        yield "]}}"
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM history")
+            conn.execute("DELETE FROM bodies")
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._connection()
+        bodies, raw_bytes, stored_bytes = conn.execute(
+            "SELECT COUNT(*), IFNULL(SUM(size), 0), IFNULL(SUM(LENGTH(data)), 0) FROM bodies").fetchone()
+        with self.stats_lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "entries": self.count(),
+            "max_entries": self.max_entries,
+            "unique_bodies": bodies,
+            "body_bytes": raw_bytes,
+            "stored_body_bytes": stored_bytes,
+            "codec": self.codec
+        }
+
+PASSIVE_SCAN_MAX_BYTES = 2 * 1024 * 1024  # only the head of larger bodies is scanned
+PASSIVE_SCAN_MAX_MATCHES = 5  # matches reported per rule and response
+PASSIVE_RULE_PACKS = [p for p in os.environ.get("HEXSTRIKE_PASSIVE_RULES", "").split(os.pathsep) if p]
+
+# Built-in passive rules. Rule packs are JSON lists of objects in the same shape:
+#   body rules:   {"id", "type", "severity", "description", "pattern" (regex) or "literal",
+#                  "case_sensitive": false, "anchor": optional literal every match starts with};
+#                 the first capture group of a pattern is reported
+#   header rules: {"id", "type", "severity", "description", "missing_header": "<name>"}
+DEFAULT_PASSIVE_RULES = [
+    {"id": "header-xfo", "type": "missing_security_header", "severity": "medium",
+     "description": "Clickjacking protection missing", "missing_header": "X-Frame-Options"},
+    {"id": "header-xcto", "type": "missing_security_header", "severity": "medium",
+     "description": "MIME type sniffing protection missing", "missing_header": "X-Content-Type-Options"},
+    {"id": "header-xxp", "type": "missing_security_header", "severity": "medium",
+     "description": "XSS protection missing", "missing_header": "X-XSS-Protection"},
+    {"id": "header-hsts", "type": "missing_security_header", "severity": "medium",
+     "description": "HTTPS enforcement missing", "missing_header": "Strict-Transport-Security"},
+    {"id": "header-csp", "type": "missing_security_header", "severity": "medium",
+     "description": "Content Security Policy missing", "missing_header": "Content-Security-Policy"},
+    {"id": "disclosure-password", "type": "information_disclosure", "severity": "high",
+     "description": "Password disclosure", "pattern": r"password\s*[:=]\s*[\"']?([^\"'\s]+)"},
+    {"id": "disclosure-api-key", "type": "information_disclosure", "severity": "high",
+     "description": "API key disclosure", "pattern": r"api[_-]?key\s*[:=]\s*[\"']?([^\"'\s]+)"},
+    {"id": "disclosure-secret", "type": "information_disclosure", "severity": "high",
+     "description": "Secret disclosure", "pattern": r"secret\s*[:=]\s*[\"']?([^\"'\s]+)"},
+    {"id": "disclosure-token", "type": "information_disclosure", "severity": "high",
+     "description": "Token disclosure", "pattern": r"token\s*[:=]\s*[\"']?([^\"'\s]+)"},
+] + [
+    {"id": f"sqli-{index}", "type": "sql_injection_indicator", "severity": "high",
+     "description": f"Potential SQL injection: {error}", "literal": error}
+    for index, error in enumerate(["SQL syntax error", "mysql_fetch_array", "ORA-01756",
+                                   "Microsoft OLE DB Provider", "PostgreSQL query failed"])
+]
+
+def _literal_prefix(pattern: str) -> str:
+    """Leading literal text every match of a regex must start with ('' if there is none)"""
+    if _has_top_level_alternation(pattern):
+        return ""
+    prefix = ""
+    for char in pattern:
+        if char in "*?{":
+            return prefix[:-1]
+        if char in ".^$+[]|()\\":
+            break
+        prefix += char
+    return prefix
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """True if the regex has a | outside any group or character class"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+class PassiveScanner:
+    """Compiled passive checks over raw response bytes.
+
+    Rules are compiled once into bytes regexes, each guarded by a literal
+    anchor. A body gets one length-preserving ASCII lower-case copy (no
+    decode); anchors are located with substring search and a rule's regex
+    only runs from its first anchor hit. Header rules are checked against
+    the set of header names.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]] = None):
+        self.rules = []
+        self.lock = threading.Lock()
+        self.stats = {"responses": 0, "bytes": 0, "findings": 0, "seconds": 0.0}
+        self.add_rules(DEFAULT_PASSIVE_RULES if rules is None else rules)
+
+    def add_rules(self, rules: List[Dict[str, Any]]) -> int:
+        """Validate, add (replacing rules with the same id) and recompile; returns the number added.
+
+        Raises ValueError on any invalid rule, leaving the active rules unchanged.
+        """
+        if not isinstance(rules, list):
+            raise ValueError("Passive rules must be a list")
+        for rule in rules:
+            self._validate_rule(rule)
+        with self.lock:
+            ids = {rule["id"] for rule in rules}
+            merged = [rule for rule in self.rules if rule["id"] not in ids] + [dict(rule) for rule in rules]
+            body_rules, header_rules = self._compile(merged)
+            self.rules, self.body_rules, self.header_rules = merged, body_rules, header_rules
+        return len(rules)
+
+    @staticmethod
+    def _validate_rule(rule: Any):
+        if not isinstance(rule, dict):
+            raise ValueError(f"Passive rule must be an object: {rule!r}")
+        for key in ("id", "type"):
+            if not isinstance(rule.get(key), str) or not rule[key]:
+                raise ValueError(f"Passive rule needs a string {key}: {rule}")
+        name = rule["id"]
+        matchers = [key for key in ("pattern", "literal", "missing_header") if key in rule]
+        if len(matchers) != 1:
+            raise ValueError(f"Rule {name} needs exactly one of pattern, literal or missing_header")
+        if not isinstance(rule[matchers[0]], str) or not rule[matchers[0]]:
+            raise ValueError(f"Rule {name}: {matchers[0]} must be a non-empty string")
+        for key in ("severity", "description", "anchor"):
+            if key in rule and not isinstance(rule[key], str):
+                raise ValueError(f"Rule {name}: {key} must be a string")
+        if "case_sensitive" in rule and not isinstance(rule["case_sensitive"], bool):
+            raise ValueError(f"Rule {name}: case_sensitive must be true or false")
+        if "pattern" in rule:
+            try:
+                re.compile(rule["pattern"].encode("utf-8"))
+            except re.error as e:
+                raise ValueError(f"Rule {name} has an invalid pattern: {e}")
+
+    def load_rule_pack(self, path: str) -> int:
+        """Add the rules of a JSON rule pack file (a list of rules, or {"rules": [...]})"""
+        with open(path, "r", encoding="utf-8") as f:
+            pack = json.load(f)
+        rules = pack.get("rules", []) if isinstance(pack, dict) else pack
+        count = self.add_rules(rules)
+        logger.info(f"🛡️  Loaded {count} passive rules from {path}")
+        return count
+
+    @staticmethod
+    def _compile(rules: List[Dict[str, Any]]) -> Tuple[list, list]:
+        """(body rules, header rules) ready for scan()"""
+        body_rules = []
+        for rule in rules:
+            if "missing_header" in rule:
+                continue
+            case_sensitive = bool(rule.get("case_sensitive"))
+            if "pattern" in rule:
+                source = rule["pattern"]
+                anchor = rule.get("anchor") or _literal_prefix(source)
+            else:
+                source = re.escape(rule["literal"])
+                anchor = rule["literal"]
+            regex = re.compile(source.encode("utf-8"), 0 if case_sensitive else re.IGNORECASE)
+            anchor = anchor.encode("utf-8")
+            body_rules.append((rule, regex, anchor if case_sensitive else anchor.lower(), case_sensitive))
+        header_rules = [(rule["missing_header"].lower(), rule) for rule in rules if "missing_header" in rule]
+        return body_rules, header_rules
+
+    def scan(self, url: str, headers, body: bytes) -> List[Dict[str, Any]]:
+        """Findings for one response, in the HTTP framework's vulnerability format"""
+        started = time.perf_counter()
+        body = body[:PASSIVE_SCAN_MAX_BYTES] if body else b""
+        with self.lock:
+            body_rules, header_rules = self.body_rules, self.header_rules
+        findings = []
 
-        logger.info("🔍 Starting uro URL filtering")
-        result = execute_command(command)
-        logger.info("📊 uro URL filtering completed")
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"💥 Error in uro endpoint: {str(e)}")
-        return jsonify({"error": f"Server error: {str(e)}"}), 500
+        present = {name.lower() for name in headers}
+        for header, rule in header_rules:
+            if header not in present:
+                findings.append({"type": rule["type"], "severity": rule.get("severity", "medium"),
+                                 "description": rule.get("description", ""), "url": url,
+                                 "header": rule["missing_header"]})
+
+        lowered = body.lower() if body else b""
+        for rule, regex, anchor, case_sensitive in body_rules:
+            start = (body if case_sensitive else lowered).find(anchor)
+            if start < 0:
+                continue
+            values = []
+            for match in regex.finditer(body, start):
+                values.append(match.group(1) if regex.groups else match.group(0))
+                if len(values) >= PASSIVE_SCAN_MAX_MATCHES:
+                    break
+            if not values:
+                continue
+            finding = {"type": rule["type"], "severity": rule.get("severity", "medium"),
+                       "description": rule.get("description", ""), "url": url}
+            if regex.groups:
+                finding["matches"] = [(value or b"").decode("utf-8", "replace") for value in values]
+            findings.append(finding)
+
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.stats["responses"] += 1
+            self.stats["bytes"] += len(body)
+            self.stats["findings"] += len(findings)
+            self.stats["seconds"] += elapsed
+        return findings
 
-# ============================================================================
-# ADVANCED WEB SECURITY TOOLS CONTINUED
-# ============================================================================
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+            rules = len(self.rules)
+        seconds = stats.pop("seconds")
+        return {**stats, "rules": rules,
+                "mb_per_second": round(stats["bytes"] / seconds / 1e6, 1) if seconds else 0}
+
+def _create_passive_scanner() -> PassiveScanner:
+    scanner = PassiveScanner()
+    for path in PASSIVE_RULE_PACKS:
+        try:
+            scanner.load_rule_pack(path)
+        except Exception as e:
+            logger.error(f"💥 Could not load passive rule pack {path}: {str(e)}")
+    return scanner
 
-# ============================================================================
-# ENHANCED HTTP TESTING FRAMEWORK (BURP SUITE ALTERNATIVE)
-# ============================================================================
+# Global passive scanner instance
+passive_scanner = _create_passive_scanner()
 
 class HTTPTestingFramework:
     """Advanced HTTP testing framework as Burp Suite alternative"""
@@ -13374,11 +16394,10 @@ class HTTPTestingFramework:
         self.session.headers.update({
             'User-Agent': 'HexStrike-HTTP-Framework/1.0 (Advanced Security Testing)'
         })
-        self.proxy_history = []
-        self.vulnerabilities = []
+        self.proxy_history = ProxyHistoryStore()
+        self.vulnerabilities = deque(maxlen=HTTP_VULN_HISTORY_MAX)
         self.match_replace_rules = []  # [{'where':'query|headers|body|url','pattern':'regex','replacement':'str'}]
         self.scope = None  # {'host': 'example.com', 'include_subdomains': True}
-        self._req_id = 0
 
     def setup_proxy(self, proxy_port: int = 8080):
         """Setup HTTP proxy for request interception"""
@@ -13413,9 +16432,16 @@ class HTTPTestingFramework:
                 response = self.session.request(method, url, data=data, headers=send_headers, timeout=30)
 
             # Store request/response in history
-            self._req_id += 1
+            request_body = response.request.body
+            if isinstance(request_body, str):
+                request_body = request_body.encode('utf-8')
+            history_id = self.proxy_history.record(
+                method, url, dict(response.request.headers), request_body if isinstance(request_body, bytes) else None,
+                response.status_code, dict(response.headers), response.content,
+                response.elapsed.total_seconds()
+            )
             request_data = {
-                'id': self._req_id,
+                'id': history_id,
                 'url': url,
                 'method': method,
                 'headers': dict(response.request.headers),
@@ -13431,11 +16457,6 @@ class HTTPTestingFramework:
                 'time': response.elapsed.total_seconds()
             }
 
-            self.proxy_history.append({
-                'request': request_data,
-                'response': response_data
-            })
-
             # Analyze for vulnerabilities
             self._analyze_response_for_vulns(url, response)
 
@@ -13527,182 +16548,63 @@ class HTTPTestingFramework:
                         params: list = None, payloads: list = None, base_data: dict = None,
                         max_requests: int = 100) -> dict:
         """Simple fuzzing: iterate payloads over each parameter individually (Sniper)."""
-        from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+        return self.intruder(url, method, location, params, payloads, base_data, max_requests, mode='sniper')
+
+    def intruder(self, url: str, method: str = 'GET', location: str = 'query',
+                 params: list = None, payloads: list = None, base_data: dict = None,
+                 max_requests: int = 100, mode: str = 'sniper', concurrency: int = INTRUDER_CONCURRENCY,
+                 rate_limit: float = 0, timeout: float = INTRUDER_TIMEOUT, verify_ssl: bool = True,
+                 on_result: Callable[[Dict[str, Any]], None] = None) -> dict:
+        """Concurrent fuzzing in sniper, pitchfork or cluster_bomb mode.
+
+        Match/replace rules, session headers and cookies are applied once to
+        the request template. rate_limit caps requests per second to the host;
+        on_result receives every result as it completes.
+        """
         params = params or []
         payloads = payloads or ["'\"<>`, ${7*7}"]
-        base_data = base_data or {}
-        interesting = []
-        total = 0
-        baseline = self.intercept_request(url, method, base_data)
-        base_status = baseline.get('response',{}).get('status_code') if baseline.get('success') else None
-        base_len = baseline.get('response',{}).get('size') if baseline.get('success') else None
-        for p in params:
-            for pay in payloads:
-                if total >= max_requests:
-                    break
-                m_url = url
-                m_data = dict(base_data)
-                m_headers = {}
-                if location == 'query':
-                    pr = urlparse(url)
-                    q = dict(parse_qsl(pr.query, keep_blank_values=True))
-                    q[p] = pay
-                    m_url = urlunparse((pr.scheme, pr.netloc, pr.path, pr.params, urlencode(q), pr.fragment))
-                elif location == 'body':
-                    m_data[p] = pay
-                elif location == 'headers':
-                    m_headers[p] = pay
-                elif location == 'cookie':
-                    self.session.cookies.set(p, pay)
-                resp = self.intercept_request(m_url, method, m_data, m_headers)
-                total += 1
-                if not resp.get('success'):
-                    continue
-                r = resp['response']
-                changed = (base_status is not None and r.get('status_code') != base_status) or (base_len is not None and abs(r.get('size',0) - base_len) > 150)
-                reflected = pay in (r.get('content') or '')
-                if changed or reflected:
-                    interesting.append({
-                        'param': p,
-                        'payload': pay,
-                        'status_code': r.get('status_code'),
-                        'size': r.get('size'),
-                        'reflected': reflected
-                    })
-        return {
-            'success': True,
-            'tested': total,
-            'interesting': interesting[:50]
-        }
+        if mode not in INTRUDER_MODES:
+            return {'success': False, 'error': f"Unknown mode: {mode}. Must be one of: {', '.join(INTRUDER_MODES)}"}
+        if not self._in_scope(url):
+            return {'success': False, 'error': f'Out of scope: {url}'}
+
+        url, base_data, headers = self._apply_match_replace(url, dict(base_data or {}), dict(self.session.headers))
+        engine = IntruderEngine(
+            url, method, location, params, base_data, headers, cookies_for_url(self.session.cookies, url),
+            proxy=self.session.proxies.get(urlparse(url).scheme) or None, concurrency=concurrency,
+            rate_limit=rate_limit, timeout=timeout, verify_ssl=verify_ssl
+        )
+        try:
+            return asyncio.run(engine.run(mode, payloads, max_requests, on_result))
+        except Exception as e:
+            logger.error(f"{ModernVisualEngine.format_error_card('ERROR', 'HTTP-Intruder', str(e))}")
+            return {'success': False, 'error': str(e)}
 
     def _analyze_response_for_vulns(self, url: str, response):
         """Analyze HTTP response for common vulnerabilities"""
-        vulns = []
-
-        # Check for missing security headers
-        security_headers = {
-            'X-Frame-Options': 'Clickjacking protection missing',
-            'X-Content-Type-Options': 'MIME type sniffing protection missing',
-            'X-XSS-Protection': 'XSS protection missing',
-            'Strict-Transport-Security': 'HTTPS enforcement missing',
-            'Content-Security-Policy': 'Content Security Policy missing'
-        }
-
-        for header, description in security_headers.items():
-            if header not in response.headers:
-                vulns.append({
-                    'type': 'missing_security_header',
-                    'severity': 'medium',
-                    'description': description,
-                    'url': url,
-                    'header': header
-                })
-
-        # Check for sensitive information disclosure
-        sensitive_patterns = [
-            (r'password\s*[:=]\s*["\']?([^"\'\s]+)', 'Password disclosure'),
-            (r'api[_-]?key\s*[:=]\s*["\']?([^"\'\s]+)', 'API key disclosure'),
-            (r'secret\s*[:=]\s*["\']?([^"\'\s]+)', 'Secret disclosure'),
-            (r'token\s*[:=]\s*["\']?([^"\'\s]+)', 'Token disclosure')
-        ]
-
-        for pattern, description in sensitive_patterns:
-            matches = re.findall(pattern, response.text, re.IGNORECASE)
-            if matches:
-                vulns.append({
-                    'type': 'information_disclosure',
-                    'severity': 'high',
-                    'description': description,
-                    'url': url,
-                    'matches': matches[:5]  # Limit matches
-                })
-
-        # Check for SQL injection indicators
-        sql_errors = [
-            'SQL syntax error',
-            'mysql_fetch_array',
-            'ORA-01756',
-            'Microsoft OLE DB Provider',
-            'PostgreSQL query failed'
-        ]
-
-        for error in sql_errors:
-            if error.lower() in response.text.lower():
-                vulns.append({
-                    'type': 'sql_injection_indicator',
-                    'severity': 'high',
-                    'description': f'Potential SQL injection: {error}',
-                    'url': url
-                })
-
-        self.vulnerabilities.extend(vulns)
+        self.vulnerabilities.extend(passive_scanner.scan(url, response.headers, response.content))
 
     def _get_recent_vulns(self, limit: int = 10):
         """Get recent vulnerabilities found"""
-        return self.vulnerabilities[-limit:] if self.vulnerabilities else []
+        return list(itertools.islice(reversed(self.vulnerabilities), limit))[::-1]
 
-    def spider_website(self, base_url: str, max_depth: int = 3, max_pages: int = 100) -> dict:
+    def spider_website(self, base_url: str, max_depth: int = 3, max_pages: int = 100,
+                       concurrency: int = SPIDER_CONCURRENCY, per_host: int = SPIDER_PER_HOST_CONCURRENCY,
+                       rate_limit: float = 0, on_url: Callable[[str], None] = None,
+                       on_form: Callable[[Dict[str, Any]], None] = None) -> dict:
         """Spider website to discover endpoints and forms"""
         try:
-            discovered_urls = set()
-            forms = []
-            to_visit = [(base_url, 0)]
-            visited = set()
-
-            while to_visit and len(discovered_urls) < max_pages:
-                current_url, depth = to_visit.pop(0)
-
-                if current_url in visited or depth > max_depth:
-                    continue
-
-                visited.add(current_url)
-
-                try:
-                    response = self.session.get(current_url, timeout=10)
-                    if response.status_code == 200:
-                        discovered_urls.add(current_url)
-
-                        # Parse HTML for links and forms
-                        soup = BeautifulSoup(response.text, 'html.parser')
-
-                        # Find all links
-                        for link in soup.find_all('a', href=True):
-                            href = link['href']
-                            full_url = urljoin(current_url, href)
-
-                            if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                                if full_url not in visited and depth < max_depth:
-                                    to_visit.append((full_url, depth + 1))
-
-                        # Find all forms
-                        for form in soup.find_all('form'):
-                            form_data = {
-                                'url': current_url,
-                                'action': urljoin(current_url, form.get('action', '')),
-                                'method': form.get('method', 'GET').upper(),
-                                'inputs': []
-                            }
-
-                            for input_tag in form.find_all(['input', 'textarea', 'select']):
-                                form_data['inputs'].append({
-                                    'name': input_tag.get('name', ''),
-                                    'type': input_tag.get('type', 'text'),
-                                    'value': input_tag.get('value', '')
-                                })
-
-                            forms.append(form_data)
-
-                except Exception as e:
-                    logger.warning(f"Error spidering {current_url}: {str(e)}")
-                    continue
-
-            return {
-                'success': True,
-                'discovered_urls': list(discovered_urls),
-                'forms': forms,
-                'total_pages': len(discovered_urls),
-                'vulnerabilities': self._get_recent_vulns()
-            }
+            engine = SpiderEngine(
+                dict(self.session.headers), self.session.cookies,
+                proxy=self.session.proxies.get(urlparse(base_url).scheme) or None,
+                concurrency=concurrency, per_host=per_host, rate_limit=rate_limit,
+                on_url=on_url, on_form=on_form
+            )
+            result = asyncio.run(engine.crawl(base_url, max_depth, max_pages))
+            if not result.get('success'):
+                return result
+            result['vulnerabilities'] = self._get_recent_vulns()
+            return result
 
         except Exception as e:
             logger.error(f"{ModernVisualEngine.format_error_card('ERROR', 'Spider', str(e))}")
@@ -14124,12 +17026,20 @@ class BrowserAgent:
 http_framework = HTTPTestingFramework()
 browser_agent = BrowserAgent()
 
+def _numeric_param(params: Dict[str, Any], name: str, default, integer: bool = True, minimum: float = 0):
+    """params[name] checked to be a number (an integer if integer) no smaller than minimum"""
+    value = params.get(name, default)
+    if (isinstance(value, bool) or not isinstance(value, (int, float))
+            or (integer and value != int(value)) or value < minimum):
+        raise ValueError(f"{name} must be {'an integer' if integer else 'a number'} >= {minimum}")
+    return int(value) if integer else float(value)
+
 @app.route("/api/tools/http-framework", methods=["POST"])
 def http_framework_endpoint():
     """Enhanced HTTP testing framework (Burp Suite alternative)"""
     try:
         params = request.json
-        action = params.get("action", "request")  # request, spider, proxy_history, set_rules, set_scope, repeater, intruder
+        action = params.get("action", "request")  # request, spider, proxy_history, proxy_history_entry, export_har, clear_history, passive_rules, set_rules, set_scope, repeater, intruder
         url = params.get("url", "")
         method = params.get("method", "GET")
         data = params.get("data", {})
@@ -14157,12 +17067,25 @@ def http_framework_endpoint():
             if not url:
                 return jsonify({"error": "URL parameter is required for spider action"}), 400
 
-            max_depth = params.get("max_depth", 3)
-            max_pages = params.get("max_pages", 100)
+            try:
+                max_depth = _numeric_param(params, "max_depth", 3)
+                max_pages = _numeric_param(params, "max_pages", 100, minimum=1)
+                concurrency = _numeric_param(params, "concurrency", SPIDER_CONCURRENCY, minimum=1)
+                per_host = _numeric_param(params, "per_host", SPIDER_PER_HOST_CONCURRENCY, minimum=1)
+                rate_limit = _numeric_param(params, "rate_limit", 0, integer=False)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
 
             spider_command = f"Spider {url}"
             logger.info(f"{ModernVisualEngine.format_command_execution(spider_command, 'STARTING')}")
-            result = http_framework.spider_website(url, max_depth, max_pages)
+            sink = _current_output_sink()
+            result = http_framework.spider_website(
+                url, max_depth, max_pages,
+                concurrency=concurrency, per_host=per_host, rate_limit=rate_limit,
+                # Only set with ?stream=1: URLs and forms go out as they are found
+                on_url=(lambda found: sink("url", found)) if sink else None,
+                on_form=(lambda form: sink("form", json.dumps(form))) if sink else None
+            )
 
             if result.get("success"):
                 total_pages = result.get("total_pages", 0)
@@ -14174,13 +17097,52 @@ def http_framework_endpoint():
             return jsonify(result)
 
         elif action == "proxy_history":
+            # Newest first; filter with host, path (prefix), status, method, since/until (epoch seconds)
+            filters = {k: params.get(k) for k in ("host", "path", "status", "method", "since", "until")}
+            try:
+                page = http_framework.proxy_history.query(
+                    limit=params.get("limit", 100), cursor=params.get("cursor"), **filters)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             return jsonify({
                 "success": True,
-                "history": http_framework.proxy_history[-100:],  # Last 100 requests
-                "total_requests": len(http_framework.proxy_history),
-                "vulnerabilities": http_framework.vulnerabilities,
+                "history": page["items"],
+                "next_cursor": page["next_cursor"],
+                "total_requests": http_framework.proxy_history.count(),
+                "vulnerabilities": list(http_framework.vulnerabilities),
             })
 
+        elif action == "proxy_history_entry":
+            entry = http_framework.proxy_history.get(int(params.get("id", 0)))
+            if entry is None:
+                return jsonify({"error": "History entry not found"}), 404
+            return jsonify({"success": True, "entry": entry})
+
+        elif action == "export_har":
+            filters = {k: params.get(k) for k in ("host", "path", "status", "method", "since", "until")}
+            try:
+                chunks = http_framework.proxy_history.export_har(params.get("limit", PROXY_HISTORY_MAX_EXPORT), **filters)
+            except ValueError as e:
+                return jsonify({"error": f"Invalid export filter: {str(e)}"}), 400
+            # Streamed entry by entry; the full export is never held in memory
+            return Response(chunks, mimetype="application/json",
+                            headers={"Content-Disposition": "attachment; filename=hexstrike_history.har"})
+
+        elif action == "clear_history":
+            http_framework.proxy_history.clear()
+            http_framework.vulnerabilities.clear()
+            return jsonify({"success": True})
+
+        elif action == "passive_rules":
+            try:
+                if params.get("rule_pack"):
+                    passive_scanner.load_rule_pack(params["rule_pack"])
+                if params.get("passive_rules"):
+                    passive_scanner.add_rules(params["passive_rules"])
+            except (OSError, ValueError) as e:
+                return jsonify({"error": f"Invalid passive rules: {str(e)}"}), 400
+            return jsonify({"success": True, "rules": passive_scanner.rules, "stats": passive_scanner.get_stats()})
+
         elif action == "set_rules":
             rules = params.get("rules", [])
             http_framework.set_match_replace_rules(rules)
@@ -14207,9 +17169,25 @@ def http_framework_endpoint():
             fuzz_params = params.get("params", [])
             payloads = params.get("payloads", [])
             base_data = params.get("base_data", {})
-            max_requests = params.get("max_requests", 100)
-            result = http_framework.intruder_sniper(
-                url, method, location, fuzz_params, payloads, base_data, max_requests
+            try:
+                max_requests = _numeric_param(params, "max_requests", 100, minimum=1)
+                concurrency = _numeric_param(params, "concurrency", INTRUDER_CONCURRENCY, minimum=1)
+                rate_limit = _numeric_param(params, "rate_limit", 0, integer=False)
+                timeout = _numeric_param(params, "timeout", INTRUDER_TIMEOUT, integer=False, minimum=0.1)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            sink = _current_output_sink()
+
+            def stream_result(result):
+                # Only reached with ?stream=1: every result goes out as it completes
+                sink("intruder", json.dumps(result))
+
+            result = http_framework.intruder(
+                url, method, location, fuzz_params, payloads, base_data, max_requests,
+                mode=params.get("mode", "sniper"),
+                concurrency=concurrency, rate_limit=rate_limit, timeout=timeout,
+                verify_ssl=params.get("verify_ssl", True),
+                on_result=stream_result if sink else None
             )
             return jsonify(result)
 
@@ -16790,6 +19768,16 @@ def execute_command_async():
         if not command:
             return jsonify({"error": "Command parameter is required"}), 400
 
+        # Scheduling hints may be given at the top level or inside the context
+        for key in ("priority", "resource_class", "tool"):
+            if key in params:
+                context[key] = params[key]
+
+        try:
+            ProcessPool.resolve_priority(context.get("priority"))
+        except (TypeError, ValueError):
+            return jsonify({"error": f"Invalid priority; use a number or one of {sorted(TASK_PRIORITIES)}"}), 400
+
         # Execute command asynchronously
         task_id = enhanced_process_manager.execute_command_async(command, context)
 
@@ -16815,6 +19803,15 @@ def get_async_task_result(task_id):
         if result["status"] == "not_found":
             return jsonify({"error": "Task not found"}), 404
 
+        if result["status"] == "expired":
+            return jsonify({
+                "success": False,
+                "task_id": task_id,
+                "status": "expired",
+                "reason": result.get("reason"),
+                "error": "Task result expired or was evicted from the result store"
+            }), 410
+
         logger.info(f"📋 Task result retrieved | Task ID: {task_id} | Status: {result['status']}")
         return jsonify({
             "success": True,
@@ -16885,13 +19882,20 @@ def get_resource_usage():
         current_usage = enhanced_process_manager.resource_monitor.get_current_usage()
         usage_trends = enhanced_process_manager.resource_monitor.get_usage_trends()
 
-        logger.info(f"📈 Resource usage retrieved | CPU: {current_usage['cpu_percent']:.1f}% | Memory: {current_usage['memory_percent']:.1f}%")
-        return jsonify({
+        response = {
             "success": True,
             "current_usage": current_usage,
             "usage_trends": usage_trends,
             "timestamp": datetime.now().isoformat()
-        })
+        }
+
+        # Optional sampled time series (?history=N for the last N samples)
+        history_limit = request.args.get("history", 0, type=int)
+        if history_limit > 0:
+            response["usage_history"] = resource_sampler.get_history(history_limit)
+
+        logger.info(f"📈 Resource usage retrieved | CPU: {current_usage['cpu_percent']:.1f}% | Memory: {current_usage['memory_percent']:.1f}%")
+        return jsonify(response)
 
     except Exception as e:
         logger.error(f"💥 Error getting resource usage: {str(e)}")
@@ -16985,6 +19989,34 @@ def configure_auto_scaling():
         logger.error(f"💥 Error configuring auto-scaling: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route("/api/process/concurrency-limits", methods=["POST"])
+def configure_concurrency_limits():
+    """Configure per-tool and per-resource-class concurrency limits of the process pool"""
+    try:
+        params = request.json or {}
+        tool_limits = params.get("tool_limits", {})
+        class_limits = params.get("class_limits", {})
+
+        if not isinstance(tool_limits, dict) or not isinstance(class_limits, dict):
+            return jsonify({"error": "tool_limits and class_limits must be objects"}), 400
+
+        enhanced_process_manager.process_pool.set_concurrency_limits(tool_limits, class_limits)
+        pool_stats = enhanced_process_manager.process_pool.get_pool_stats()
+
+        logger.info(f"⚙️ Concurrency limits updated | Tools: {tool_limits} | Classes: {class_limits}")
+        return jsonify({
+            "success": True,
+            "tool_limits": pool_stats["tool_limits"],
+            "class_limits": pool_stats["class_limits"],
+            "timestamp": datetime.now().isoformat()
+        })
+
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid limit value: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"💥 Error configuring concurrency limits: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route("/api/process/scale-pool", methods=["POST"])
 def manual_scale_pool():
     """Manually scale the process pool"""
@@ -17137,12 +20169,50 @@ def get_error_statistics():
         return jsonify({
             "success": True,
             "statistics": stats,
+            "circuit_breakers": circuit_breakers.get_stats(),
+            "recovery_scheduler": recovery_scheduler.get_stats(),
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
         logger.error(f"Error getting error statistics: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route("/api/error-handling/jobs/<job_id>", methods=["GET"])
+def get_recovery_job(job_id):
+    """Get status or final result of a scheduled recovery job"""
+    try:
+        job = recovery_scheduler.get_job(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        if job["status"] == "expired":
+            return jsonify({"success": False, "job_id": job_id, **job}), 410
+
+        return jsonify({
+            "success": True,
+            "job_id": job_id,
+            **job,
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Error getting recovery job {job_id}: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+@app.route("/api/error-handling/circuit-breakers/reset", methods=["POST"])
+def reset_circuit_breakers():
+    """Close circuit breakers, optionally only for one tool and/or target"""
+    try:
+        data = request.get_json(silent=True) or {}
+        cleared = circuit_breakers.reset(data.get("tool"), data.get("target"))
+        logger.info(f"🔌 Reset {cleared} circuit breakers")
+        return jsonify({
+            "success": True,
+            "cleared": cleared,
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Error resetting circuit breakers: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route("/api/error-handling/test-recovery", methods=["POST"])
 def test_error_recovery():
     """Test error recovery system with simulated failures"""
@@ -17217,6 +20287,31 @@ def get_fallback_chains():
         logger.error(f"Error getting fallback chains: {str(e)}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route("/api/error-handling/basic-checks", methods=["POST"])
+def basic_checks_endpoint():
+    """Run the degraded-mode port and directory checks for a list of targets"""
+    try:
+        params = request.get_json() or {}
+        targets = params.get("targets") or ([params["target"]] if params.get("target") else [])
+        checks = params.get("checks", ["ports", "directories"])
+
+        if not targets:
+            return jsonify({"error": "target or targets parameter required"}), 400
+        if not set(checks) <= {"ports", "directories"}:
+            return jsonify({"error": "checks must be ports and/or directories"}), 400
+
+        result = degradation_manager.run_basic_checks(
+            targets, checks,
+            ports=params.get("ports"),
+            paths=params.get("paths"),
+            deadline=params.get("deadline")
+        )
+        return jsonify({"success": True, **result, "timestamp": datetime.now().isoformat()})
+
+    except Exception as e:
+        logger.error(f"Error running basic checks: {str(e)}")
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
 @app.route("/api/error-handling/execute-with-recovery", methods=["POST"])
 def execute_with_recovery_endpoint():
     """Execute a command with intelligent error handling and recovery"""
@@ -17227,19 +20322,24 @@ def execute_with_recovery_endpoint():
         parameters = data.get("parameters", {})
         max_attempts = data.get("max_attempts", 3)
         use_cache = data.get("use_cache", True)
+        sync = data.get("sync", False)
 
         if not tool_name or not command:
             return jsonify({"error": "tool_name and command are required"}), 400
 
-        # Execute command with recovery
+        # Schedule command with recovery; only wait for it in synchronous mode
         result = execute_command_with_recovery(
             tool_name=tool_name,
             command=command,
             parameters=parameters,
             use_cache=use_cache,
-            max_attempts=max_attempts
+            max_attempts=max_attempts,
+            wait=sync
         )
 
+        if not sync:
+            return jsonify({**result, "timestamp": datetime.now().isoformat()}), 202
+
         return jsonify({
             "success": result.get("success", False),
             "result": result,
@@ -17339,13 +20439,449 @@ def get_alternative_tools():
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 # ============================================================================
-# AI AGENTS API ENDPOINTS
+# PERSISTENT API STATE (scans, vulnerabilities, agents, tool usage)
 # ============================================================================
 
-# Thread lock for agent state modifications
-_agents_lock = threading.Lock()
+# Shared state lives in hexstrike_data.db so every worker process sees the same
+# scans, vulnerabilities, agents and tool usage and nothing is lost on restart
+STATE_CACHE_TTL = 2.0  # seconds a read-through snapshot is served before re-reading the database
+STATE_FLUSH_INTERVAL = 0.5  # seconds between write-behind flushes
+STATE_FLUSH_BATCH = 500  # pending writes that trigger an early flush
+STATE_QUARANTINE_MAX = 100  # rejected documents kept per collection for inspection
+
+class PersistentStateStore:
+    """Read-through cache with write-behind batching in front of HexStrikeDatabase.
+
+    Collection reads are served from a short-lived snapshot overlaid with this
+    process's not-yet-flushed writes, so a worker always sees its own changes;
+    single documents, counts and pages are read from the database directly.
+    Writes are coalesced per document and flushed by a background thread in
+    one transaction per collection instead of one commit per update; updates
+    are applied in one transaction against the current row. Documents the
+    database rejects are quarantined instead of being retried forever.
+    Without a database the store keeps everything in memory.
+    """
+
+    COLLECTIONS = ("scans", "vulnerabilities", "agents")
+
+    def __init__(self, db=None):
+        self.db = db
+        self.state_lock = threading.RLock()
+        self.snapshots = {kind: (0.0, {}) for kind in self.COLLECTIONS}
+        self.pending = {kind: {} for kind in self.COLLECTIONS}  # id -> document, or None for a delete
+        self.tool_usage = (0.0, {})
+        self.pending_tool_usage = {}
+        self.quarantine = {kind: OrderedDict() for kind in self.COLLECTIONS}  # id -> {"document", "error", "at"}
+        self.stats = {"flushes": 0, "documents_written": 0, "flush_errors": 0, "reads_from_db": 0,
+                      "quarantined": 0}
+        self.flush_event = threading.Event()
+
+        if self.db is not None:
+            self.flush_thread = threading.Thread(target=self._flush_loop, name="hexstrike-state-writer", daemon=True)
+            self.flush_thread.start()
+            atexit.register(self.flush)
+
+    def _load(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        loader = {
+            "scans": self.db.get_scan_documents,
+            "vulnerabilities": self.db.get_vulnerability_documents,
+            "agents": self.db.get_agent_documents
+        }[kind]
+        self.stats["reads_from_db"] += 1
+        return {doc["id"]: doc for doc in loader()}
+
+    def _snapshot(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        """Current documents of a collection, including unflushed local writes"""
+        loaded_at, docs = self.snapshots[kind]
+        if self.db is not None and time.time() - loaded_at > STATE_CACHE_TTL:
+            try:
+                docs = self._load(kind)
+                with self.state_lock:
+                    self.snapshots[kind] = (time.time(), docs)
+            except Exception as e:
+                logger.error(f"💥 Could not read {kind} from database: {str(e)}")
+
+        with self.state_lock:
+            pending = self.pending[kind]
+            if not pending:
+                return docs
+            merged = dict(docs)
+            for doc_id, doc in pending.items():
+                if doc is None:
+                    merged.pop(doc_id, None)
+                else:
+                    merged[doc_id] = doc
+            return merged
+
+    def list(self, kind: str) -> List[Dict[str, Any]]:
+        return [copy.deepcopy(doc) for doc in self._snapshot(kind).values()]
+
+    def get(self, kind: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self.state_lock:
+            if doc_id in self.pending[kind]:
+                doc = self.pending[kind][doc_id]
+                return copy.deepcopy(doc) if doc is not None else None
+        if self.db is not None:
+            loader = {"scans": self.db.get_scan_document,
+                      "vulnerabilities": self.db.get_vulnerability_document,
+                      "agents": self.db.get_agent_document}[kind]
+            try:
+                self.stats["reads_from_db"] += 1
+                return loader(doc_id)
+            except Exception as e:
+                logger.error(f"💥 Could not read {kind} {doc_id} from database: {str(e)}")
+        doc = self._snapshot(kind).get(doc_id)
+        return copy.deepcopy(doc) if doc is not None else None
+
+    def page(self, kind: str, filters: Dict[str, Any], limit: Optional[str] = None,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """One page of scans or vulnerabilities in API list order: (documents, next cursor, total).
+
+        Pages come from the database's keyset indexes after this process's
+        pending writes are flushed; without limit or cursor every document is
+        returned. Raises ValueError on a bad limit or cursor.
+        """
+        if self.db is None:
+            docs = [doc for doc in self.list(kind) if all(doc.get(k) == v for k, v in filters.items() if v)]
+            page, next_cursor = _keyset_paginate(docs, *STATE_LIST_ORDER[kind], limit, cursor)
+            return page, next_cursor, len(docs)
+
+        fetch = {"scans": self.db.get_scan_documents_page,
+                 "vulnerabilities": self.db.get_vulnerability_documents_page}[kind]
+        if self.pending[kind]:
+            self.flush()
+        page_size = MAX_PAGE_SIZE if limit is None else int(limit)
+        result = fetch(limit=page_size, cursor=cursor, **filters)
+        items = result["items"]
+        if limit is None and not cursor:
+            while result["next_cursor"]:
+                result = fetch(limit=page_size, cursor=result["next_cursor"], **filters)
+                items.extend(result["items"])
+        return items, result["next_cursor"], result["total"]
+
+    def count(self, kind: str, **filters) -> int:
+        """Number of documents whose fields equal the given filters"""
+        counter = {"scans": "count_scan_documents",
+                   "vulnerabilities": "count_vulnerability_documents"}.get(kind)
+        if self.db is not None and counter:
+            if self.pending[kind]:
+                self.flush()
+            return getattr(self.db, counter)(**filters)
+        return sum(1 for doc in self._snapshot(kind).values()
+                   if all(doc.get(field) == value for field, value in filters.items()))
+
+    def put(self, kind: str, doc: Dict[str, Any]):
+        """Queue a document insert/update"""
+        with self.state_lock:
+            self.pending[kind][doc["id"]] = copy.deepcopy(doc)
+            backlog = sum(len(p) for p in self.pending.values())
+        if self.db is None:
+            self._apply_memory(kind)
+        elif backlog >= STATE_FLUSH_BATCH:
+            self.flush_event.set()
+
+    def update(self, kind: str, doc_id: str, changes) -> Optional[Dict[str, Any]]:
+        """Atomically apply changes (a dict or a callable taking the document); returns the new document"""
+        apply = changes if callable(changes) else (lambda doc: doc.update(changes))
+        if self.db is None:
+            with self.state_lock:
+                doc = self.get(kind, doc_id)
+                if doc is None:
+                    return None
+                apply(doc)
+                self.put(kind, doc)
+                return copy.deepcopy(doc)
+
+        # Apply against the current row in one transaction so updates from
+        # other workers are never overwritten with a stale snapshot
+        if doc_id in self.pending[kind]:
+            self.flush()
+        updater = {"scans": self.db.update_scan_document,
+                   "vulnerabilities": self.db.update_vulnerability_document,
+                   "agents": self.db.update_agent_document}[kind]
+        doc = updater(doc_id, apply)
+        if doc is not None:
+            with self.state_lock:
+                loaded_at, docs = self.snapshots[kind]
+                docs = dict(docs)
+                docs[doc_id] = doc
+                self.snapshots[kind] = (loaded_at, docs)
+                self.stats["documents_written"] += 1
+            doc = copy.deepcopy(doc)
+        return doc
+
+    def delete(self, kind: str, doc_id: str) -> bool:
+        """Queue a document delete; returns False if it does not exist"""
+        if self.get(kind, doc_id) is None:
+            return False
+        with self.state_lock:
+            self.pending[kind][doc_id] = None
+        if self.db is None:
+            self._apply_memory(kind)
+        return True
+
+    def _apply_memory(self, kind: str):
+        """Fold pending writes into the snapshot when running without a database"""
+        with self.state_lock:
+            _, docs = self.snapshots[kind]
+            for doc_id, doc in self.pending[kind].items():
+                if doc is None:
+                    docs.pop(doc_id, None)
+                else:
+                    docs[doc_id] = doc
+            self.pending[kind] = {}
+
+    def add_tool_usage(self, tool_id: str, count: int = 1):
+        with self.state_lock:
+            self.pending_tool_usage[tool_id] = self.pending_tool_usage.get(tool_id, 0) + count
+
+    def get_tool_usage(self) -> Dict[str, int]:
+        """Persisted usage counters plus this process's unflushed increments"""
+        loaded_at, usage = self.tool_usage
+        if self.db is not None and time.time() - loaded_at > STATE_CACHE_TTL:
+            try:
+                usage = self.db.get_tool_usage()
+                with self.state_lock:
+                    self.tool_usage = (time.time(), usage)
+            except Exception as e:
+                logger.error(f"💥 Could not read tool usage from database: {str(e)}")
+        with self.state_lock:
+            merged = dict(usage)
+            for tool_id, count in self.pending_tool_usage.items():
+                merged[tool_id] = merged.get(tool_id, 0) + count
+            return merged
+
+    def seed(self, kind: str, defaults: Dict[str, Dict[str, Any]]):
+        """Store default documents that the database does not know yet"""
+        existing = self._snapshot(kind)
+        for doc_id, doc in defaults.items():
+            if doc_id not in existing:
+                self.put(kind, doc)
+
+    def flush(self):
+        """Write all pending changes, one transaction per collection"""
+        if self.db is None:
+            return
+        with self.state_lock:
+            batches = {kind: dict(self.pending[kind]) for kind in self.COLLECTIONS}
+            usage = dict(self.pending_tool_usage)
+
+        savers = {
+            "scans": (self.db.save_scan_documents, self.db.delete_scan_documents),
+            "vulnerabilities": (self.db.save_vulnerability_documents, self.db.delete_vulnerability_documents),
+            "agents": (self.db.save_agent_documents, None)
+        }
+        for kind, batch in batches.items():
+            if not batch:
+                continue
+            save, delete = savers[kind]
+            upserts = [doc for doc in batch.values() if doc is not None]
+            deletes = [doc_id for doc_id, doc in batch.items() if doc is None]
+            rejected = set()
+            try:
+                if upserts:
+                    save(upserts)
+                if deletes and delete:
+                    delete(deletes)
+            except (sqlite3.IntegrityError, TypeError, ValueError) as e:
+                # One bad document fails the whole batch; write the rest one by one
+                self.stats["flush_errors"] += 1
+                logger.error(f"💥 Write-behind flush of {len(batch)} {kind} failed, retrying row by row: {str(e)}")
+                rejected = self._flush_rows(kind, batch, save, delete)
+            except Exception as e:
+                # Transient (e.g. database locked): keep everything pending for the next flush
+                self.stats["flush_errors"] += 1
+                logger.error(f"💥 Write-behind flush of {len(batch)} {kind} failed: {str(e)}")
+                continue
+
+            with self.state_lock:
+                _, docs = self.snapshots[kind]
+                docs = dict(docs)
+                for doc_id, doc in batch.items():
+                    # Drop from pending unless it was rewritten while we were flushing
+                    if self.pending[kind].get(doc_id, doc) is doc:
+                        self.pending[kind].pop(doc_id, None)
+                    if doc_id in rejected:
+                        continue
+                    if doc is None:
+                        docs.pop(doc_id, None)
+                    else:
+                        docs[doc_id] = doc
+                self.snapshots[kind] = (self.snapshots[kind][0], docs)
+                self.stats["documents_written"] += len(batch)
+
+        if usage:
+            try:
+                self.db.increment_tool_usage(usage)
+                with self.state_lock:
+                    loaded_at, persisted = self.tool_usage
+                    persisted = dict(persisted)
+                    for tool_id, count in usage.items():
+                        persisted[tool_id] = persisted.get(tool_id, 0) + count
+                        remaining = self.pending_tool_usage.get(tool_id, 0) - count
+                        if remaining > 0:
+                            self.pending_tool_usage[tool_id] = remaining
+                        else:
+                            self.pending_tool_usage.pop(tool_id, None)
+                    self.tool_usage = (loaded_at, persisted)
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                logger.error(f"💥 Write-behind flush of tool usage failed: {str(e)}")
+
+        if any(batches.values()) or usage:
+            self.stats["flushes"] += 1
+
+    def _flush_rows(self, kind: str, batch: Dict[str, Any], save, delete) -> Set[str]:
+        """Write a failed batch one document at a time; returns the IDs quarantined"""
+        rejected = set()
+        for doc_id, doc in batch.items():
+            try:
+                if doc is not None:
+                    save([doc])
+                elif delete:
+                    delete([doc_id])
+            except (sqlite3.IntegrityError, TypeError, ValueError) as e:
+                rejected.add(doc_id)
+                with self.state_lock:
+                    quarantine = self.quarantine[kind]
+                    quarantine[doc_id] = {"document": doc, "error": str(e), "at": time.time()}
+                    while len(quarantine) > STATE_QUARANTINE_MAX:
+                        quarantine.popitem(last=False)
+                    self.stats["quarantined"] += 1
+                logger.error(f"🚫 Quarantined {kind} document {doc_id}: {str(e)}")
+        return rejected
+
+    def get_quarantine(self) -> Dict[str, Dict[str, Any]]:
+        """Documents the database rejected, per collection"""
+        with self.state_lock:
+            return {kind: copy.deepcopy(dict(docs)) for kind, docs in self.quarantine.items()}
+
+    def _flush_loop(self):
+        while True:
+            self.flush_event.wait(STATE_FLUSH_INTERVAL)
+            self.flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"💥 State writer error: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.state_lock:
+            return {
+                "persistent": self.db is not None,
+                "pending_writes": sum(len(p) for p in self.pending.values()) + len(self.pending_tool_usage),
+                "quarantined_documents": {kind: len(docs) for kind, docs in self.quarantine.items()},
+                **self.stats
+            }
+
+def _open_state_store() -> PersistentStateStore:
+    """State store on hexstrike_data.db, or memory-only if the database cannot be opened"""
+    try:
+        return PersistentStateStore(get_database(os.environ.get("HEXSTRIKE_DB_PATH")))
+    except Exception as e:
+        logger.error(f"💥 Database unavailable, API state will not persist: {str(e)}")
+        return PersistentStateStore()
+
+# List order of paged collections without a database: (sort key, newest/highest first)
+STATE_LIST_ORDER = {
+    "scans": (lambda x: (x.get("startTime") or "", x.get("id", "")), True),
+    "vulnerabilities": (lambda x: (SEVERITY_RANKS.get(x.get("severity", "info"), 5),
+                                   x.get("discoveredAt") or "", x.get("id", "")), False)
+}
+
+# Global API state store
+state_store = _open_state_store()
+
+TOOL_OUTPUT_INDEX_ENABLED = os.environ.get("HEXSTRIKE_INDEX_TOOL_OUTPUT", "1") != "0"
+TOOL_OUTPUT_INDEX_QUEUE = 256  # command outputs waiting to be indexed
+TOOL_OUTPUT_INDEX_MAX_BYTES = int(os.environ.get("HEXSTRIKE_INDEX_MAX_MB", 64)) * 1024 * 1024  # per output; the rest is not indexed
+TOOL_OUTPUT_INDEX_READ_BYTES = 1024 * 1024  # bytes read from a spilled capture at a time
+TOOL_OUTPUT_RETENTION_DAYS = float(os.environ.get("HEXSTRIKE_INDEX_RETENTION_DAYS", 30))
+TOOL_OUTPUT_MAX_TOTAL_BYTES = int(os.environ.get("HEXSTRIKE_INDEX_TOTAL_MB", 1024)) * 1024 * 1024
+TOOL_OUTPUT_PRUNE_EVERY = 50  # outputs indexed between retention passes
+
+class ToolOutputIndexer:
+    """Feeds command stdout into the full-text search index off the request path.
+
+    The queue is bounded; when indexing falls behind, new outputs are skipped
+    and counted rather than slowing down tool execution. Output too large to
+    return inline is indexed in full from its output handle (up to
+    TOOL_OUTPUT_INDEX_MAX_BYTES), streamed from the spill file; the capture
+    is pinned from submit until it has been read. Retention by age and
+    total size runs every TOOL_OUTPUT_PRUNE_EVERY outputs.
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+        self.queue = queue.Queue(maxsize=TOOL_OUTPUT_INDEX_QUEUE)
+        self.stats = {"indexed": 0, "chunks": 0, "skipped": 0, "truncated": 0, "pruned_chunks": 0, "errors": 0}
+        if self.db is not None:
+            threading.Thread(target=self._index_loop, name="hexstrike-output-indexer", daemon=True).start()
+
+    def submit(self, command: str, result: Dict[str, Any]):
+        stdout = result.get("stdout") or ""
+        if self.db is None or not stdout.strip():
+            return
+        handle = (result.get("output_handles") or {}).get("stdout")
+        capture = output_store.pin(handle) if handle else None
+        try:
+            self.queue.put_nowait((command, stdout, capture))
+        except queue.Full:
+            self.stats["skipped"] += 1
+            if capture is not None:
+                output_store.unpin(capture)
+
+    @staticmethod
+    def _read_capture(capture: OutputCapture) -> Iterator[str]:
+        """Text of a capture, decoded piece by piece up to TOOL_OUTPUT_INDEX_MAX_BYTES"""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        end = min(capture.size, TOOL_OUTPUT_INDEX_MAX_BYTES)
+        for offset in range(0, end, TOOL_OUTPUT_INDEX_READ_BYTES):
+            yield decoder.decode(capture.read(offset, min(TOOL_OUTPUT_INDEX_READ_BYTES, end - offset)))
+        yield decoder.decode(b"", final=True)
+
+    def _index_loop(self):
+        while True:
+            command, stdout, capture = self.queue.get()
+            try:
+                tool = extract_tool_name(command)
+                if capture is not None:
+                    if capture.size > TOOL_OUTPUT_INDEX_MAX_BYTES:
+                        self.stats["truncated"] += 1
+                    pieces = self._read_capture(capture)
+                else:
+                    pieces = [stdout]
+                self.stats["chunks"] += self.db.add_tool_output_stream(tool, pieces, command=command)
+                self.stats["indexed"] += 1
+                if self.stats["indexed"] % TOOL_OUTPUT_PRUNE_EVERY == 0:
+                    self.stats["pruned_chunks"] += self.db.prune_tool_output(
+                        TOOL_OUTPUT_RETENTION_DAYS, TOOL_OUTPUT_MAX_TOTAL_BYTES)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"💥 Could not index tool output: {str(e)}")
+            finally:
+                if capture is not None:
+                    output_store.unpin(capture)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.db is not None, "queued": self.queue.qsize(), **self.stats}
+
+# Global tool output indexer
+tool_output_indexer = ToolOutputIndexer(state_store.db if TOOL_OUTPUT_INDEX_ENABLED else None)
+
+# Scheduled online backups of hexstrike_data.db, off unless an interval is set
+BACKUP_INTERVAL_HOURS = float(os.environ.get("HEXSTRIKE_BACKUP_INTERVAL_HOURS", 0))
+BACKUP_KEEP = int(os.environ.get("HEXSTRIKE_BACKUP_KEEP", 7))
+BACKUP_DIR = os.environ.get("HEXSTRIKE_BACKUP_DIR") or None
+
+if state_store.db is not None and BACKUP_INTERVAL_HOURS > 0:
+    state_store.db.start_backup_schedule(BACKUP_INTERVAL_HOURS * 3600, BACKUP_KEEP, BACKUP_DIR)
+
+# ============================================================================
+# AI AGENTS API ENDPOINTS
+# ============================================================================
 
-# Available agents configuration (use dictionary for O(1) lookup)
+# Default agents configuration; seeded into the state store, which holds their live status
 # 12+ AI Agents as documented in README and expected by frontend
 _available_agents = {
     "1": {
@@ -17446,6 +20982,12 @@ _available_agents = {
     },
 }
 
+state_store.seed("agents", _available_agents)
+
+def _list_agents() -> List[Dict[str, Any]]:
+    """Agents in their configured order"""
+    return sorted(state_store.list("agents"), key=lambda a: (not a["id"].isdigit(), int(a["id"]) if a["id"].isdigit() else a["id"]))
+
 # ============================================================================
 # AI-POWERED AGENT RESPONSE SYSTEM
 # Integrates with OpenRouter API for intelligent responses (supports multiple AI models)
@@ -17957,8 +21499,7 @@ _ai_agent_engine = AIAgentEngine()
 def list_agents():
     """List all available AI agents"""
     try:
-        with _agents_lock:
-            agents_list = list(_available_agents.values())
+        agents_list = _list_agents()
         return jsonify({
             "success": True,
             "data": agents_list,
@@ -17973,8 +21514,7 @@ def list_agents():
 def get_agent_status(agent_id: str):
     """Get status of a specific agent"""
     try:
-        with _agents_lock:
-            agent = _available_agents.get(agent_id)
+        agent = state_store.get("agents", agent_id)
         if not agent:
             return jsonify({"error": f"Agent {agent_id} not found"}), 404
         
@@ -17993,13 +21533,10 @@ def get_agent_status(agent_id: str):
 def activate_agent(agent_id: str):
     """Activate an agent"""
     try:
-        with _agents_lock:
-            agent = _available_agents.get(agent_id)
-            if not agent:
-                return jsonify({"error": f"Agent {agent_id} not found"}), 404
-            
-            agent["status"] = "active"
-            agent_name = agent["name"]
+        agent = state_store.update("agents", agent_id, {"status": "active"})
+        if not agent:
+            return jsonify({"error": f"Agent {agent_id} not found"}), 404
+        agent_name = agent["name"]
         
         logger.info(f"Agent {agent_id} ({agent_name}) activated")
         
@@ -18018,13 +21555,10 @@ def activate_agent(agent_id: str):
 def deactivate_agent(agent_id: str):
     """Deactivate an agent"""
     try:
-        with _agents_lock:
-            agent = _available_agents.get(agent_id)
-            if not agent:
-                return jsonify({"error": f"Agent {agent_id} not found"}), 404
-            
-            agent["status"] = "standby"
-            agent_name = agent["name"]
+        agent = state_store.update("agents", agent_id, {"status": "standby"})
+        if not agent:
+            return jsonify({"error": f"Agent {agent_id} not found"}), 404
+        agent_name = agent["name"]
         
         logger.info(f"Agent {agent_id} ({agent_name}) deactivated")
         
@@ -18058,8 +21592,7 @@ def send_agent_message(agent_id: str):
         if not message:
             return jsonify({"error": "Message is required"}), 400
         
-        with _agents_lock:
-            agent = _available_agents.get(agent_id)
+        agent = state_store.get("agents", agent_id)
         
         if not agent:
             return jsonify({"error": f"Agent {agent_id} not found"}), 404
@@ -18447,17 +21980,36 @@ def _get_static_models(provider_filter: str = "all") -> list:
 # They replace mock data with live backend state management.
 # ============================================================================
 
-# Thread locks for state modifications
-_tools_lock = threading.Lock()
-_scans_lock = threading.Lock()
-_vulnerabilities_lock = threading.Lock()
-
 # Valid filter values for input validation
 VALID_SCAN_STATUSES = {'queued', 'running', 'completed', 'failed', 'paused'}
 VALID_VULNERABILITY_SEVERITIES = {'critical', 'high', 'medium', 'low', 'info'}
 VALID_VULNERABILITY_STATUSES = {'new', 'confirmed', 'false_positive', 'remediated'}
 VALID_TOOL_CATEGORIES = {'network', 'web', 'binary', 'cloud', 'ctf', 'osint', 'password'}
 
+def _keyset_paginate(items: List[Dict[str, Any]], sort_key, reverse: bool, limit: Optional[str],
+                     cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Sort items and return the page after cursor plus the next cursor.
+    
+    sort_key must return a tuple that is unique per item; without limit or
+    cursor the whole sorted list is returned. Raises ValueError on bad input.
+    """
+    items = sorted(items, key=sort_key, reverse=reverse)
+    if cursor and items:
+        after = tuple(decode_cursor(cursor, len(sort_key(items[0]))))
+        try:
+            items = [item for item in items if (sort_key(item) < after if reverse else sort_key(item) > after)]
+        except TypeError:
+            raise ValueError("Invalid cursor: sort key types do not match")
+    if limit is None:
+        if not cursor:
+            return items, None
+        limit = MAX_PAGE_SIZE
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    if len(items) <= limit:
+        return items, None
+    page = items[:limit]
+    return page, encode_cursor(list(sort_key(page[-1])))
+
 # Comprehensive security tools database matching frontend's securityTools.ts (162 tools)
 _security_tools = [
     # Network Reconnaissance & Scanning Tools (25)
@@ -18631,13 +22183,11 @@ _security_tools = [
     {"id": "pwd-12", "name": "Crackmapexec", "category": "password", "version": "5.4.0", "description": "Swiss army knife for pentesting networks", "installed": True, "usageCount": 145},
 ]
 
-# Active scans storage
-_active_scans = {}
-_scan_counter = 0
+# Scans and vulnerabilities live in state_store; tool usage counts add persisted uses to the catalog baseline
+_security_tools_by_id = {t["id"]: t for t in _security_tools}
 
-# Discovered vulnerabilities storage
-_vulnerabilities = []
-_vuln_counter = 0
+def _tool_with_usage(tool: Dict[str, Any], usage: Dict[str, int]) -> Dict[str, Any]:
+    return {**tool, "usageCount": tool.get("usageCount", 0) + usage.get(tool["id"], 0)}
 
 @app.route("/api/tools/list", methods=["GET"])
 def list_tools():
@@ -18646,8 +22196,8 @@ def list_tools():
         category = request.args.get("category", None)
         installed_only = request.args.get("installed", "false").lower() == "true"
         
-        with _tools_lock:
-            filtered_tools = _security_tools.copy()
+        usage = state_store.get_tool_usage()
+        filtered_tools = [_tool_with_usage(t, usage) for t in _security_tools]
         
         if category and category != "all":
             filtered_tools = [t for t in filtered_tools if t["category"] == category]
@@ -18670,15 +22220,14 @@ def list_tools():
 def get_tool(tool_id: str):
     """Get details for a specific tool"""
     try:
-        with _tools_lock:
-            tool = next((t for t in _security_tools if t["id"] == tool_id), None)
+        tool = _security_tools_by_id.get(tool_id)
         
         if not tool:
             return jsonify({"success": False, "error": "Tool not found"}), 404
         
         return jsonify({
             "success": True,
-            "data": tool,
+            "data": _tool_with_usage(tool, state_store.get_tool_usage()),
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
@@ -18693,18 +22242,13 @@ def execute_tool(tool_id: str):
         target = data.get("target", "")
         parameters = data.get("parameters", {})
         
-        with _tools_lock:
-            tool = next((t for t in _security_tools if t["id"] == tool_id), None)
+        tool = _security_tools_by_id.get(tool_id)
         
         if not tool:
             return jsonify({"success": False, "error": "Tool not found"}), 404
         
         # Update usage count
-        with _tools_lock:
-            for t in _security_tools:
-                if t["id"] == tool_id:
-                    t["usageCount"] = t.get("usageCount", 0) + 1
-                    break
+        state_store.add_tool_usage(tool_id)
         
         execution_id = f"exec-{datetime.now().timestamp()}"
         
@@ -18734,20 +22278,20 @@ def list_scans():
                 "error": f"Invalid status filter. Must be one of: {', '.join(VALID_SCAN_STATUSES)}"
             }), 400
         
-        with _scans_lock:
-            scans_list = list(_active_scans.values())
-        
-        if status_filter:
-            scans_list = [s for s in scans_list if s.get("status") == status_filter]
-        
-        # Sort by start time (most recent first)
-        scans_list.sort(key=lambda x: x.get("startTime", ""), reverse=True)
+        # Sorted by start time (most recent first), paging with ?limit=&cursor=
+        try:
+            page, next_cursor, total = state_store.page(
+                "scans", {"status": status_filter}, request.args.get("limit"), request.args.get("cursor"))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
         
-        logger.info(f"📊 Listed {len(scans_list)} scans")
+        logger.info(f"📊 Listed {len(page)} of {total} scans")
         return jsonify({
             "success": True,
-            "data": scans_list,
-            "count": len(scans_list),
+            "data": page,
+            "count": total,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
@@ -18757,7 +22301,6 @@ def list_scans():
 @app.route("/api/scans/create", methods=["POST"])
 def create_scan():
     """Create a new security scan"""
-    global _scan_counter
     try:
         data = request.get_json() or {}
         target = data.get("target", "")
@@ -18767,8 +22310,8 @@ def create_scan():
         if not target:
             return jsonify({"success": False, "error": "Target is required"}), 400
         
-        _scan_counter += 1
-        scan_id = f"scan-{_scan_counter}-{int(datetime.now().timestamp())}"
+        # Unique across worker processes and restarts
+        scan_id = f"scan-{uuid.uuid4().hex[:8]}-{int(datetime.now().timestamp())}"
         
         new_scan = {
             "id": scan_id,
@@ -18788,8 +22331,7 @@ def create_scan():
             "toolsUsed": selected_tools if selected_tools else ["Nmap", "Nuclei", "Gobuster"],
         }
         
-        with _scans_lock:
-            _active_scans[scan_id] = new_scan
+        state_store.put("scans", new_scan)
         
         logger.info(f"🎯 Created new scan {scan_id} for target: {target}")
         return jsonify({
@@ -18806,8 +22348,7 @@ def create_scan():
 def get_scan(scan_id: str):
     """Get details for a specific scan"""
     try:
-        with _scans_lock:
-            scan = _active_scans.get(scan_id)
+        scan = state_store.get("scans", scan_id)
         
         if not scan:
             return jsonify({"success": False, "error": "Scan not found"}), 404
@@ -18825,10 +22366,8 @@ def get_scan(scan_id: str):
 def delete_scan(scan_id: str):
     """Delete a scan"""
     try:
-        with _scans_lock:
-            if scan_id not in _active_scans:
-                return jsonify({"success": False, "error": "Scan not found"}), 404
-            del _active_scans[scan_id]
+        if not state_store.delete("scans", scan_id):
+            return jsonify({"success": False, "error": "Scan not found"}), 404
         
         logger.info(f"🗑️ Deleted scan {scan_id}")
         return jsonify({
@@ -18844,8 +22383,7 @@ def delete_scan(scan_id: str):
 def get_scan_progress(scan_id: str):
     """Get progress for a specific scan"""
     try:
-        with _scans_lock:
-            scan = _active_scans.get(scan_id)
+        scan = state_store.get("scans", scan_id)
         
         if not scan:
             return jsonify({"success": False, "error": "Scan not found"}), 404
@@ -18868,8 +22406,7 @@ def get_scan_progress(scan_id: str):
 def get_scan_results(scan_id: str):
     """Get results for a completed scan"""
     try:
-        with _scans_lock:
-            scan = _active_scans.get(scan_id)
+        scan = state_store.get("scans", scan_id)
         
         if not scan:
             return jsonify({"success": False, "error": "Scan not found"}), 404
@@ -18911,24 +22448,21 @@ def list_vulnerabilities():
                 "error": f"Invalid status filter. Must be one of: {', '.join(VALID_VULNERABILITY_STATUSES)}"
             }), 400
         
-        with _vulnerabilities_lock:
-            vulns_list = _vulnerabilities.copy()
-        
-        if severity_filter:
-            vulns_list = [v for v in vulns_list if v.get("severity") == severity_filter]
-        
-        if status_filter:
-            vulns_list = [v for v in vulns_list if v.get("status") == status_filter]
-        
-        # Sort by severity (critical first) and then by discovery time
-        severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
-        vulns_list.sort(key=lambda x: (severity_order.get(x.get("severity", "info"), 5), x.get("discoveredAt", "")))
+        # Sorted by severity (critical first) and then by discovery time, paging with ?limit=&cursor=
+        try:
+            page, next_cursor, total = state_store.page(
+                "vulnerabilities", {"severity": severity_filter, "status": status_filter},
+                request.args.get("limit"), request.args.get("cursor"))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
         
-        logger.info(f"🔍 Listed {len(vulns_list)} vulnerabilities")
+        logger.info(f"🔍 Listed {len(page)} of {total} vulnerabilities")
         return jsonify({
             "success": True,
-            "data": vulns_list,
-            "count": len(vulns_list),
+            "data": page,
+            "count": total,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
@@ -18939,8 +22473,7 @@ def list_vulnerabilities():
 def get_vulnerability(vuln_id: str):
     """Get details for a specific vulnerability"""
     try:
-        with _vulnerabilities_lock:
-            vuln = next((v for v in _vulnerabilities if v["id"] == vuln_id), None)
+        vuln = state_store.get("vulnerabilities", vuln_id)
         
         if not vuln:
             return jsonify({"success": False, "error": "Vulnerability not found"}), 404
@@ -18960,16 +22493,11 @@ def update_vulnerability(vuln_id: str):
     try:
         data = request.get_json() or {}
         
-        with _vulnerabilities_lock:
-            vuln = next((v for v in _vulnerabilities if v["id"] == vuln_id), None)
-            if not vuln:
-                return jsonify({"success": False, "error": "Vulnerability not found"}), 404
-            
-            # Update allowed fields
-            allowed_fields = ["status", "remediation", "notes"]
-            for field in allowed_fields:
-                if field in data:
-                    vuln[field] = data[field]
+        # Update allowed fields
+        allowed_fields = ["status", "remediation", "notes"]
+        vuln = state_store.update("vulnerabilities", vuln_id, {field: data[field] for field in allowed_fields if field in data})
+        if not vuln:
+            return jsonify({"success": False, "error": "Vulnerability not found"}), 404
         
         logger.info(f"📝 Updated vulnerability {vuln_id}")
         return jsonify({
@@ -18986,8 +22514,7 @@ def update_vulnerability(vuln_id: str):
 def get_remediation(vuln_id: str):
     """Get remediation guidance for a vulnerability"""
     try:
-        with _vulnerabilities_lock:
-            vuln = next((v for v in _vulnerabilities if v["id"] == vuln_id), None)
+        vuln = state_store.get("vulnerabilities", vuln_id)
         
         if not vuln:
             return jsonify({"success": False, "error": "Vulnerability not found"}), 404
@@ -19040,23 +22567,102 @@ def get_remediation(vuln_id: str):
         logger.error(f"Error getting remediation for {vuln_id}: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route("/api/database/backup", methods=["POST"])
+def start_database_backup():
+    """Start an online database backup in the background"""
+    try:
+        db = state_store.db
+        if db is None:
+            return jsonify({"success": False, "error": "Database unavailable"}), 503
+
+        params = request.get_json(silent=True) or {}
+        compress = bool(params.get("compress", True))
+        keep = params.get("keep")
+        if keep is not None and (isinstance(keep, bool) or not isinstance(keep, int) or keep < 0):
+            return jsonify({"success": False, "error": "keep must be a non-negative integer"}), 400
+        try:
+            # Backups only go to BACKUP_DIR (or next to the database); path is a name inside it
+            path = db.resolve_backup_path(params.get("path"), BACKUP_DIR)
+        except (TypeError, ValueError) as e:
+            return jsonify({"success": False, "error": f"Invalid backup path: {str(e)}"}), 400
+        if db.get_backup_status().get("state") == "running":
+            return jsonify({"success": False, "error": "A backup is already running"}), 409
+
+        def run():
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                backup_path = db.backup(path, compress=compress)
+                if keep is not None:
+                    db.rotate_backups(int(keep), os.path.dirname(os.path.abspath(backup_path)))
+            except Exception as e:
+                logger.error(f"💥 Backup failed: {str(e)}")
+
+        threading.Thread(target=run, name="hexstrike-backup", daemon=True).start()
+        logger.info("🗄️  Database backup started")
+        return jsonify({"success": True, "status_url": "/api/database/backup/status"}), 202
+    except Exception as e:
+        logger.error(f"💥 Error starting backup: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/database/backup/status", methods=["GET"])
+def database_backup_status():
+    """Progress of the running backup, or the result of the last one"""
+    if state_store.db is None:
+        return jsonify({"success": False, "error": "Database unavailable"}), 503
+    return jsonify({"success": True, "data": state_store.db.get_backup_status()})
+
+@app.route("/api/search", methods=["GET"])
+def search_findings():
+    """Ranked full-text search over vulnerabilities and stored tool output"""
+    try:
+        query = request.args.get("q", "")
+        kinds = [k for k in request.args.get("kinds", "").split(",") if k] or None
+        raw = request.args.get("raw", "").lower() in ("1", "true", "yes")
+
+        if state_store.db is None:
+            return jsonify({"success": False, "error": "Search requires the database"}), 503
+
+        start = time.perf_counter()
+        try:
+            page = state_store.db.search(query, kinds=kinds, limit=request.args.get("limit", 20),
+                                         cursor=request.args.get("cursor"), raw=raw)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        return jsonify({
+            "success": True,
+            "data": page["items"],
+            "next_cursor": page["next_cursor"],
+            "has_more": page["next_cursor"] is not None,
+            "took_ms": round((time.perf_counter() - start) * 1000, 2),
+            "timestamp": datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Error searching: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route("/api/search/tool-output/<int:chunk_id>", methods=["GET"])
+def get_tool_output_chunk(chunk_id: int):
+    """Get a stored tool output chunk found by search"""
+    try:
+        chunk = state_store.db.get_tool_output(chunk_id) if state_store.db is not None else None
+        if not chunk:
+            return jsonify({"success": False, "error": "Tool output not found"}), 404
+        return jsonify({"success": True, "data": chunk, "timestamp": datetime.now().isoformat()})
+    except Exception as e:
+        logger.error(f"Error getting tool output {chunk_id}: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route("/api/dashboard/metrics", methods=["GET"])
 def get_dashboard_metrics():
     """Get dashboard metrics for the overview page"""
     try:
         # Calculate real metrics from current state
-        with _scans_lock:
-            active_scans = len([s for s in _active_scans.values() if s.get("status") == "running"])
-            total_scans = len(_active_scans)
-        
-        with _vulnerabilities_lock:
-            total_vulns = len(_vulnerabilities)
-        
-        with _agents_lock:
-            online_agents = len([a for a in _available_agents.values() if a.get("status") == "active"])
-        
-        with _tools_lock:
-            tools_used = sum(t.get("usageCount", 0) for t in _security_tools)
+        active_scans = state_store.count("scans", status="running")
+        total_scans = state_store.count("scans")
+        total_vulns = state_store.count("vulnerabilities")
+        online_agents = state_store.count("agents", status="active")
+        tools_used = sum(t.get("usageCount", 0) for t in _security_tools) + sum(state_store.get_tool_usage().values())
         
         metrics = {
             "activeScans": active_scans,
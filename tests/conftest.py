@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# hexstrike_server opens its state databases at import; keep them out of the repo
+_STATE_DIR = tempfile.mkdtemp(prefix="hexstrike-tests-")
+os.environ.setdefault("HEXSTRIKE_PERSISTENT_CACHE", "0")
+os.environ.setdefault("HEXSTRIKE_DB_PATH", os.path.join(_STATE_DIR, "state.db"))
+os.environ.setdefault("HEXSTRIKE_PROXY_HISTORY_DB", os.path.join(_STATE_DIR, "proxy_history.db"))
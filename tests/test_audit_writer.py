@@ -0,0 +1,49 @@
+"""A failing audit batch must not take its good rows down with it."""
+
+import sqlite3
+import time
+
+import pytest
+
+import hexstrike_database
+from hexstrike_database import HexStrikeDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = HexStrikeDatabase(str(tmp_path / "audit.db"))
+    yield database
+    database.close()
+
+
+def test_bad_row_is_dropped_alone(db):
+    for i in range(5):
+        db.log_action(f"before-{i}")
+    db.log_action("unbindable", details=object())
+    for i in range(5):
+        db.log_action(f"after-{i}")
+    assert db.flush_audit_log(10)
+
+    stats = db.get_audit_writer_stats()
+    assert stats["written"] == 10
+    assert stats["dropped"] == 1
+    assert len(db.get_audit_log(limit=100)) == 10
+
+
+def test_locked_batch_is_retried(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(hexstrike_database, "SQLITE_BUSY_TIMEOUT", 0.05)
+    db.log_action("warmup")
+    assert db.flush_audit_log(10)
+
+    blocker = sqlite3.connect(str(tmp_path / "audit.db"))
+    blocker.execute("BEGIN EXCLUSIVE")
+    db.log_action("while-locked")
+    time.sleep(0.2)
+    blocker.rollback()
+    blocker.close()
+    assert db.flush_audit_log(10)
+
+    stats = db.get_audit_writer_stats()
+    assert stats["write_retries"] >= 1
+    assert stats["dropped"] == 0
+    assert {row["action"] for row in db.get_audit_log(limit=10)} == {"warmup", "while-locked"}
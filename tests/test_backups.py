@@ -0,0 +1,38 @@
+"""Backup paths stay in the backup directory and backups never overlap."""
+
+import os
+
+import pytest
+
+from hexstrike_database import HexStrikeDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = HexStrikeDatabase(str(tmp_path / "backups.db"))
+    yield database
+    database.close()
+
+
+@pytest.mark.parametrize("name", ["/etc/passwd", "../outside", "nested/../../outside", "backups.db", "backups.db-wal"])
+def test_backup_path_is_confined(db, name):
+    with pytest.raises(ValueError):
+        db.resolve_backup_path(name)
+
+
+def test_backup_names_are_unique(db, tmp_path):
+    first, second = db.resolve_backup_path(), db.resolve_backup_path()
+    assert first != second
+    assert os.path.dirname(first) == os.path.realpath(str(tmp_path))
+
+
+def test_backup_lock_excludes_concurrent_backups(db):
+    assert db._lock_backups()
+    try:
+        with pytest.raises(RuntimeError):
+            db.backup()
+    finally:
+        db._unlock_backups()
+    path = db.backup(compress=True)
+    assert os.path.exists(path)
+    assert db.get_backup_status()["state"] == "completed"
@@ -0,0 +1,28 @@
+"""Payload positions generated by the intruder modes."""
+
+import pytest
+
+from hexstrike_server import IntruderEngine
+
+
+class TestIntruderAttempts:
+    def test_sniper_targets_one_param_at_a_time(self):
+        assert list(IntruderEngine.attempts("sniper", ["a", "b"], ["1", "2"])) == [
+            {"a": "1"}, {"a": "2"}, {"b": "1"}, {"b": "2"}]
+
+    def test_pitchfork_walks_payload_sets_in_step(self):
+        assert list(IntruderEngine.attempts("pitchfork", ["user", "pass"], [["u1", "u2"], ["p1", "p2", "p3"]])) == [
+            {"user": "u1", "pass": "p1"}, {"user": "u2", "pass": "p2"}]
+
+    def test_cluster_bomb_tries_every_combination(self):
+        attempts = list(IntruderEngine.attempts("cluster_bomb", ["a", "b"], [["1", "2"], ["x", "y"]]))
+        assert len(attempts) == 4
+        assert {"a": "2", "b": "x"} in attempts
+
+    def test_attempts_are_generated_lazily(self):
+        attempts = IntruderEngine.attempts("cluster_bomb", ["a", "b", "c"], [list(range(1000))] * 3)
+        assert next(attempts) == {"a": 0, "b": 0, "c": 0}
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            list(IntruderEngine.attempts("battering_ram", ["a"], ["1"]))
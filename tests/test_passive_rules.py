@@ -0,0 +1,32 @@
+"""Passive scanner rules: literal prefilters and rule-pack validation."""
+
+import pytest
+
+from hexstrike_server import PassiveScanner, _literal_prefix
+
+
+class TestLiteralPrefix:
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"password\s*[:=]", "password"),
+        (r"api(key|token)", "api"),
+        (r"mysql_fetch_array", "mysql_fetch_array"),
+        (r"a\|b", "a"),
+        (r"aws_secret|private_key", ""),
+        (r"(?i)secret", ""),
+        (r"x?y", ""),
+    ])
+    def test_anchor(self, pattern, expected):
+        assert _literal_prefix(pattern) == expected
+
+    def test_top_level_alternation_matches_every_branch(self):
+        scanner = PassiveScanner()
+        scanner.add_rules([{"id": "keys", "type": "information_disclosure", "pattern": "aws_secret|private_key"}])
+        findings = scanner.scan("http://example.com/", {}, b"-----BEGIN private_key-----")
+        assert any(finding["type"] == "information_disclosure" for finding in findings)
+
+    def test_bad_rule_pack_leaves_rules_untouched(self):
+        scanner = PassiveScanner()
+        before = list(scanner.rules)
+        with pytest.raises(ValueError):
+            scanner.add_rules([{"id": "ok", "type": "t", "literal": "fine"}, {"id": "bad", "type": "t", "literal": 5}])
+        assert scanner.rules == before
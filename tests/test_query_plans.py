@@ -0,0 +1,45 @@
+"""Every paginated list query must be served by an index, not a scan or a sort."""
+
+import pytest
+
+from hexstrike_database import HexStrikeDatabase, encode_cursor, decode_cursor
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = HexStrikeDatabase(str(tmp_path / "plans.db"))
+    yield database
+    database.close()
+
+
+def test_list_queries_use_indexes(db):
+    assert db.check_query_plans() == []
+
+
+def test_document_lists_are_covered(db):
+    plans = db.explain_list_queries()
+    for shape in ("scan_documents[all+cursor]", "scan_documents[status+cursor]",
+                  "vulnerability_documents[severity+cursor]", "vulnerability_documents[status+cursor]"):
+        assert any(detail.startswith("SEARCH") for detail in plans[shape]), plans[shape]
+
+
+def test_document_pages_follow_list_order(db):
+    db.save_scan_documents([{"id": f"scan-{i}", "target": "example.com", "status": "running",
+                             "startTime": f"2024-01-{10 + i:02d}T00:00:00"} for i in range(5)])
+    seen = []
+    cursor = None
+    while True:
+        page = db.get_scan_documents_page(limit=2, cursor=cursor)
+        seen.extend(doc["id"] for doc in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [f"scan-{i}" for i in reversed(range(5))]
+    assert page["total"] == 5
+
+
+def test_cursor_rejects_non_scalar_values():
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([[1], "a"]), 2)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", 2)
@@ -0,0 +1,46 @@
+"""Full-text search helpers of hexstrike_database: FTS query building and chunking."""
+
+import pytest
+
+from hexstrike_database import build_match_query, chunk_text
+
+
+class TestBuildMatchQuery:
+    def test_terms_are_quoted_and_anded(self):
+        assert build_match_query("sql injection") == '"sql" "injection"'
+
+    def test_punctuation_is_matched_literally(self):
+        assert build_match_query("CVE-2021-44228 api.example.com") == '"CVE-2021-44228" "api.example.com"'
+
+    def test_embedded_quotes_are_escaped(self):
+        assert build_match_query('say"hi') == '"say""hi"'
+
+    def test_trailing_star_keeps_prefix_search(self):
+        assert build_match_query("admin*") == '"admin"*'
+        assert build_match_query("*") == '"*"'
+
+    @pytest.mark.parametrize("query", ["", "   ", "\n\t"])
+    def test_empty_query_is_rejected(self, query):
+        with pytest.raises(ValueError):
+            build_match_query(query)
+
+
+class TestChunkText:
+    def test_empty_text_has_no_chunks(self):
+        assert chunk_text("") == []
+
+    def test_short_text_is_one_chunk(self):
+        assert chunk_text("one line\n", chunk_bytes=100) == ["one line\n"]
+
+    def test_breaks_at_line_ends(self):
+        text = "aaaa\nbbbb\ncccc\n"
+        assert chunk_text(text, chunk_bytes=12) == ["aaaa\nbbbb\n", "cccc\n"]
+
+    def test_long_lines_are_split_hard(self):
+        assert chunk_text("x" * 25, chunk_bytes=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_chunks_rejoin_to_the_original(self):
+        text = "".join(f"{i} " * (i % 17) + "\n" for i in range(2000))
+        chunks = chunk_text(text, chunk_bytes=256)
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 256 for chunk in chunks)
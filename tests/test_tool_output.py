@@ -0,0 +1,61 @@
+"""Stored tool output: streamed chunking, retention and cleanup with scans."""
+
+import time
+
+import pytest
+
+from hexstrike_database import HexStrikeDatabase, chunk_text
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = HexStrikeDatabase(str(tmp_path / "output.db"))
+    yield database
+    database.close()
+
+
+def stored_chunks(db, tool):
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT content FROM tool_output WHERE tool = ? ORDER BY chunk_index", (tool,))]
+
+
+def test_streamed_output_chunks_like_whole_output(db):
+    text = "".join(f"line {i} of output\n" for i in range(20000))
+    pieces = [text[i:i + 7777] for i in range(0, len(text), 7777)]
+    assert db.add_tool_output_stream("stream", pieces) == len(chunk_text(text))
+    assert stored_chunks(db, "stream") == chunk_text(text)
+
+
+def test_size_cap_prunes_oldest_output(db):
+    for i in range(10):
+        db.add_tool_output(f"tool{i}", "x" * 1000)
+    assert db.prune_tool_output(max_bytes=4500) == 6
+    assert stored_chunks(db, "tool0") == []
+    assert stored_chunks(db, "tool9") == ["x" * 1000]
+
+
+def test_scan_output_is_deleted_with_its_scan(db):
+    db.save_scan_documents([{"id": "scan-1", "target": "example.com", "status": "completed"}])
+    with db.get_connection() as conn:
+        scan_id = conn.execute("SELECT id FROM scans WHERE external_id = 'scan-1'").fetchone()[0]
+    db.add_tool_output("nmap", "80/tcp open http", scan_id=scan_id)
+    db.delete_scan_documents(["scan-1"])
+    assert stored_chunks(db, "nmap") == []
+    assert db.search("http")["items"] == []
+
+
+@pytest.mark.parametrize("command, tool", [
+    ("sudo nmap -sV example.com", "nmap"),
+    ("timeout 60 nuclei -u https://example.com", "nuclei"),
+    ("FOO=1 /usr/bin/Gobuster dir -u https://example.com", "gobuster"),
+])
+def test_indexed_output_is_filed_under_the_wrapped_tool(db, command, tool):
+    from hexstrike_server import ToolOutputIndexer
+
+    indexer = ToolOutputIndexer(db)
+    indexer.submit(command, {"stdout": "80/tcp open http"})
+    deadline = time.time() + 5
+    while indexer.stats["indexed"] + indexer.stats["errors"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert stored_chunks(db, tool) == ["80/tcp open http"]
@@ -0,0 +1,23 @@
+"""Deduplication key for stored vulnerabilities."""
+
+from hexstrike_database import vulnerability_fingerprint
+
+
+class TestVulnerabilityFingerprint:
+    FINDING = {"project_id": 1, "title": "SQL Injection", "location": "/login", "cve_id": None, "cwe_id": "CWE-89"}
+
+    def test_stable_across_case_and_whitespace(self):
+        variant = dict(self.FINDING, title="  sql injection ", location="/LOGIN")
+        assert vulnerability_fingerprint(variant) == vulnerability_fingerprint(self.FINDING)
+
+    def test_identity_fields_change_the_fingerprint(self):
+        for key, value in (("project_id", 2), ("location", "/admin"), ("cve_id", "CVE-2020-1"), ("cwe_id", "CWE-79")):
+            assert vulnerability_fingerprint(dict(self.FINDING, **{key: value})) != \
+                vulnerability_fingerprint(self.FINDING)
+
+    def test_other_fields_are_ignored(self):
+        assert vulnerability_fingerprint(dict(self.FINDING, severity="critical", description="x")) == \
+            vulnerability_fingerprint(self.FINDING)
+
+    def test_explicit_fingerprint_wins(self):
+        assert vulnerability_fingerprint(dict(self.FINDING, fingerprint="abc")) == "abc"